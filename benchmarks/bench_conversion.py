@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+End-to-end conversion benchmark
+===============================
+
+Generates a synthetic susko.ai tree at a fixed scale, runs a full
+`convert.py --full` over it in a fresh process and appends one JSON line per
+run to a results file: the git commit, the scale, the converter options and
+the per-phase metrics convert_all prints (wall/CPU seconds, items per second,
+peak RSS, bytes written). Runs of different commits at the same scale can
+then be compared with --compare.
+
+Scales:
+    smoke    200 clients,     100 articles,      20k history rows
+    1k       1,000 clients,   1,000 articles,    1M history rows
+    10k      10,000 clients,  3,500 articles,    10M history rows
+    100k     100,000 clients, 10,000 articles,   50M history rows
+
+Usage:
+    python3 benchmarks/bench_conversion.py [--scale 1k] [--runs 3] [--converter-args "--workers 4"]
+    python3 benchmarks/bench_conversion.py --compare [--scale 1k]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shlex
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import generate_tree  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_RESULTS = REPO_ROOT / "benchmarks" / "results.jsonl"
+DEFAULT_WORKDIR = Path(os.environ.get("TMPDIR", "/tmp")) / "botan-bench"
+
+SCALES = {
+    "smoke": {"clients": 200, "articles": 100, "history_rows": 20000},
+    "1k": {"clients": 1000, "articles": 1000, "history_rows": 1000000},
+    "10k": {"clients": 10000, "articles": 3500, "history_rows": 10000000},
+    "100k": {"clients": 100000, "articles": 10000, "history_rows": 50000000},
+}
+
+
+def git_revision():
+    """Return (commit, dirty) for the working tree, (None, None) outside git"""
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                         stderr=subprocess.DEVNULL, text=True).strip()
+        status = subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"],
+                                         cwd=REPO_ROOT, stderr=subprocess.DEVNULL, text=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, bool(status.strip())
+
+
+def run_conversion(tree_path, converter_args):
+    """Run convert.py --full over tree_path and return (phases, wall seconds)"""
+    command = [sys.executable, str(REPO_ROOT / "convert.py"), "--base-path", str(tree_path), "--full"]
+    command += converter_args
+
+    start = time.perf_counter()
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    wall_seconds = time.perf_counter() - start
+
+    if result.returncode != 0:
+        sys.exit(f"convert.py failed with exit code {result.returncode}:\n{result.stderr}")
+
+    phases = []
+    for line in result.stdout.splitlines():
+        if not line.startswith("{"):
+            continue
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if event.pop("event", None) == "phase":
+            phases.append(event)
+    return phases, wall_seconds
+
+
+def load_results(results_path, scale):
+    if not results_path.exists():
+        return []
+    with open(results_path, 'r', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return [record for record in records if record["scale"] == scale]
+
+
+def print_run(record):
+    print(f"{'phase':<28} {'wall s':>8} {'cpu s':>8} {'items/s':>12} {'peak MB':>9}")
+    for phase in record["phases"]:
+        rate = phase.get("items_per_second")
+        print(f"{phase['phase']:<28} {phase['wall_seconds']:>8.2f} {phase['cpu_seconds']:>8.2f} "
+              f"{rate if rate is not None else '-':>12} {phase['peak_rss_mb'] or 0:>9.1f}")
+    print(f"{'total':<28} {record['wall_seconds']:>8.2f} {'':>8} {'':>12} {record['peak_rss_mb'] or 0:>9.1f}")
+
+
+def compare(results_path, scale):
+    """Print the last two runs at a scale side by side"""
+    records = load_results(results_path, scale)
+    if len(records) < 2:
+        sys.exit(f"Need at least two runs at scale {scale} in {results_path} to compare")
+    before, after = records[-2], records[-1]
+
+    label_before = before["commit"] + ("+" if before["dirty"] else "")
+    label_after = after["commit"] + ("+" if after["dirty"] else "")
+    print(f"scale {scale}: {label_before} {' '.join(before['converter_args'])} -> "
+          f"{label_after} {' '.join(after['converter_args'])}")
+    print(f"{'phase':<28} {label_before:>10} {label_after:>10} {'change':>8}")
+
+    before_phases = {phase["phase"]: phase for phase in before["phases"]}
+    for phase in after["phases"]:
+        previous = before_phases.get(phase["phase"])
+        if previous is None:
+            print(f"{phase['phase']:<28} {'-':>10} {phase['wall_seconds']:>10.2f} {'new':>8}")
+            continue
+        change = (f"{(phase['wall_seconds'] / previous['wall_seconds'] - 1) * 100:+.0f}%"
+                  if previous["wall_seconds"] else "-")
+        print(f"{phase['phase']:<28} {previous['wall_seconds']:>10.2f} {phase['wall_seconds']:>10.2f} {change:>8}")
+    total_change = f"{(after['wall_seconds'] / before['wall_seconds'] - 1) * 100:+.0f}%"
+    print(f"{'total':<28} {before['wall_seconds']:>10.2f} {after['wall_seconds']:>10.2f} {total_change:>8}")
+    print(f"{'peak RSS MB':<28} {before['peak_rss_mb'] or 0:>10.1f} {after['peak_rss_mb'] or 0:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark a full conversion on a synthetic export")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1k")
+    parser.add_argument("--runs", type=int, default=1, help="Conversions to run and record")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--converter-args", default="",
+                        help='Extra convert.py options, e.g. "--workers 4 --history-layout interned"')
+    parser.add_argument("--workdir", type=Path, default=DEFAULT_WORKDIR,
+                        help="Parent directory of the generated trees (reused between runs)")
+    parser.add_argument("--results", type=Path, default=DEFAULT_RESULTS,
+                        help="JSON lines file the runs are appended to")
+    parser.add_argument("--compare", action="store_true",
+                        help="Compare the last two recorded runs at --scale instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(args.results, args.scale)
+        return
+
+    scale = SCALES[args.scale]
+    tree_path = args.workdir / f"{args.scale}-seed{args.seed}"
+    print(f"Preparing {args.scale} tree in {tree_path}...")
+    generation_start = time.perf_counter()
+    if generate_tree(tree_path, seed=args.seed, **scale):
+        print(f"Generated in {time.perf_counter() - generation_start:.1f}s")
+
+    converter_args = shlex.split(args.converter_args)
+    commit, dirty = git_revision()
+    args.results.parent.mkdir(parents=True, exist_ok=True)
+
+    for run in range(1, args.runs + 1):
+        print(f"\nRun {run}/{args.runs}: convert.py --full {' '.join(converter_args)}")
+        phases, wall_seconds = run_conversion(tree_path, converter_args)
+        record = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": commit,
+            "dirty": dirty,
+            "scale": args.scale,
+            **scale,
+            "seed": args.seed,
+            "converter_args": converter_args,
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "wall_seconds": round(wall_seconds, 3),
+            "peak_rss_mb": max((phase["peak_rss_mb"] or 0 for phase in phases), default=None),
+            "phases": phases,
+        }
+        with open(args.results, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        print_run(record)
+
+    print(f"\nAppended {args.runs} run(s) to {args.results}")
+
+
+if __name__ == "__main__":
+    main()
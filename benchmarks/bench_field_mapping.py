@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Field mapping micro-benchmark
+=============================
+
+Compares per-file parse time of address and article XML files between the
+previous extraction (one Element.find() per mapped field) and the compiled
+field mapping tables that read all children in a single pass.
+
+Usage:
+    python3 benchmarks/bench_field_mapping.py [--base-path .] [--files 500] [--repeat 3]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from convert import (  # noqa: E402
+    DataConverter,
+    CLIENT_FIELD_MAP,
+    PRODUCT_FIELD_MAP,
+    collect_child_values
+)
+
+
+def mapped_tags(field_map):
+    """Return every XML tag referenced by a field mapping table"""
+    tags = []
+    for spec in field_map.values():
+        if isinstance(spec, dict):
+            tags.extend(mapped_tags(spec))
+        elif spec[0] == "list":
+            tags.extend(spec[1])
+        else:
+            tags.append(spec[0])
+    return tags
+
+
+def find_child_values(element, tags):
+    """Gather tag values with one find() per field, like the old converter"""
+    values = {}
+    for tag in tags:
+        child = element.find(tag)
+        text = child.text if child is not None else None
+        values[tag] = text.strip() if text else ""
+    return values
+
+
+def best_of(repeat, func):
+    """Return the fastest wall time of func() over several rounds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def time_parse(file_paths, repeat):
+    """Per-file cost of ET.parse alone, shared by both variants"""
+    def run():
+        for file_path in file_paths:
+            ET.parse(file_path)
+    return best_of(repeat, run) / len(file_paths) * 1e6
+
+
+def time_extract(elements, extract, build, repeat):
+    """Per-file cost of turning an already parsed element into a record"""
+    def run():
+        for element in elements:
+            build(extract(element))
+    return best_of(repeat, run) / len(elements) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-file XML field extraction")
+    parser.add_argument("--base-path", default=".", help="Directory containing susko.ai/")
+    parser.add_argument("--files", type=int, default=500, help="Number of files per kind")
+    parser.add_argument("--repeat", type=int, default=3, help="Rounds per measurement (best is reported)")
+    args = parser.parse_args()
+
+    converter = DataConverter(args.base_path)
+    susko_path = converter.susko_path
+
+    cases = [
+        ("Adressen", "*.XML", "Adresse", CLIENT_FIELD_MAP, converter.build_client),
+        ("Artikel", "*.xml", "Artikel", PRODUCT_FIELD_MAP, converter.build_product),
+    ]
+
+    print("Per-file times in microseconds; extraction excludes ET.parse")
+    print(f"{'kind':<10} {'files':>6} {'parse':>9} {'find()':>9} {'single':>9} {'gain':>7} {'total gain':>11}")
+    for directory, pattern, record_tag, field_map, build in cases:
+        file_paths = sorted(glob.glob(str(susko_path / directory / pattern)))[:args.files]
+        if not file_paths:
+            print(f"{directory:<10} no files found under {susko_path / directory}")
+            continue
+
+        elements = [ET.parse(file_path).getroot().find(record_tag) for file_path in file_paths]
+        elements = [element for element in elements if element is not None]
+        tags = mapped_tags(field_map)
+
+        parse_us = time_parse(file_paths, args.repeat)
+        find_us = time_extract(elements, lambda element: find_child_values(element, tags), build, args.repeat)
+        single_us = time_extract(elements, collect_child_values, build, args.repeat)
+
+        print(f"{directory:<10} {len(file_paths):>6} {parse_us:>9.1f} {find_us:>9.1f} {single_us:>9.1f} "
+              f"{find_us / single_us:>6.2f}x {(parse_us + find_us) / (parse_us + single_us):>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+History scalar parsing benchmark
+================================
+
+Generates a synthetic AdresseHistory-Komplett.xml with millions of rows and
+times DataConverter.load_order_history with the previous scalar parsers
+(strptime per date, replace/lower per value) against the current fast
+paths (slice-based dates with a memo, lookup-table booleans).
+
+Usage:
+    python3 benchmarks/bench_history_parsing.py [--rows 2000000] [--workdir /tmp/history-bench]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from convert import DataConverter  # noqa: E402
+from synthetic import write_history_file  # noqa: E402
+
+
+class LegacyParsingConverter(DataConverter):
+    """DataConverter with the scalar parsers as they were before the fast paths"""
+
+    def parse_boolean(self, value):
+        return value.lower() in ["ja", "true", "1"]
+
+    def parse_float(self, value):
+        if not value or value.strip() == "":
+            return None
+        try:
+            return float(value.replace(",", "."))
+        except ValueError:
+            return None
+
+    def parse_date(self, value):
+        if not value or value.strip() == "":
+            return None
+        try:
+            if "." in value:
+                date_obj = datetime.strptime(value, "%d.%m.%Y")
+                return date_obj.isoformat().split("T")[0]
+            return value
+        except ValueError:
+            return value
+
+
+def time_history_load(converter_class, base_path):
+    converter = converter_class(str(base_path), incremental=False)
+    start = time.perf_counter()
+    converter.load_order_history()
+    elapsed = time.perf_counter() - start
+    rows = sum(len(orders) for orders in converter.order_history.values())
+    return elapsed, rows, converter.order_history
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scalar parsing during the history load")
+    parser.add_argument("--rows", type=int, default=2000000, help="History rows to generate")
+    parser.add_argument("--clients", type=int, default=8000)
+    parser.add_argument("--articles", type=int, default=3500)
+    parser.add_argument("--workdir", help="Directory for the synthetic tree (default: a temp dir)")
+    args = parser.parse_args()
+
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="history-bench-"))
+    history_file = workdir / "susko.ai" / "History" / "AdresseHistory-Komplett.xml"
+
+    if not history_file.exists():
+        print(f"Generating {args.rows} history rows in {history_file}...")
+        write_history_file(
+            history_file, args.rows,
+            [str(10000 + i) for i in range(args.clients)],
+            [str(1000 + i) for i in range(args.articles)]
+        )
+    print(f"History file: {history_file.stat().st_size / 1e6:.0f} MB")
+
+    legacy_seconds, legacy_rows, legacy_history = time_history_load(LegacyParsingConverter, workdir)
+    fast_seconds, fast_rows, fast_history = time_history_load(DataConverter, workdir)
+
+    if legacy_history != fast_history:
+        sys.exit("Parsed history differs between legacy and fast parsers")
+
+    print(f"{'parsers':<8} {'rows':>10} {'seconds':>9} {'rows/s':>11}")
+    print(f"{'legacy':<8} {legacy_rows:>10} {legacy_seconds:>9.2f} {legacy_rows / legacy_seconds:>11.0f}")
+    print(f"{'fast':<8} {fast_rows:>10} {fast_seconds:>9.2f} {fast_rows / fast_seconds:>11.0f}")
+    print(f"speedup: {legacy_seconds / fast_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
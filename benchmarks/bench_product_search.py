@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Product search benchmark
+========================
+
+Runs a few hundred representative queries (whole words, prefixes, infixes,
+article numbers, barcodes, product groups and umlaut spellings) against
+
+- a full scan with lowercase substring matching, as the /products routes do
+- the inverted index in products.search.json
+
+and reports latency and how many of the scan's hits the index also finds.
+
+Run a conversion first, then:
+    python3 benchmarks/bench_product_search.py [--base-path .] [--queries 300]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from convert import ProductSearchIndex, SEARCH_INDEX_FILE  # noqa: E402
+
+
+def scan_search(products, query):
+    """Mirror of the route handlers' includes() filter"""
+    term = query.lower()
+    return [
+        position for position, product in enumerate(products)
+        if term in product["short_description"].lower()
+        or term in product["long_description"].lower()
+        or term in product["article_number"].lower()
+        or term in product["barcode"].lower()
+        or term in product["product_group"]["description"].lower()
+    ]
+
+
+def build_queries(products, count, rng):
+    """Sample queries of several kinds from the catalogue itself"""
+    words = [
+        word.strip(".,()/-") for product in products
+        for word in (product["short_description"] + " " + product["long_description"]).split()
+    ]
+    words = [word for word in words if len(word) >= 4 and word.isalpha()]
+    umlaut_words = [word for word in words if any(char in word.lower() for char in "äöüß")]
+    groups = [p["product_group"]["description"] for p in products if p["product_group"]["description"]]
+    barcodes = [p["barcode"] for p in products if p["barcode"]]
+
+    generators = [
+        ("word", lambda: rng.choice(words)),
+        ("prefix", lambda: rng.choice(words)[:rng.randint(3, 5)]),
+        ("infix", lambda: (lambda w: w[1:1 + rng.randint(3, max(3, len(w) - 2))])(rng.choice(words))),
+        ("article", lambda: rng.choice(products)["article_number"]),
+        ("barcode", lambda: rng.choice(barcodes) if barcodes else rng.choice(words)),
+        ("group", lambda: rng.choice(groups).split()[-1]),
+    ]
+    if umlaut_words:
+        generators.append(("umlaut", lambda: rng.choice(umlaut_words)))
+
+    queries = []
+    for i in range(count):
+        kind, generate = generators[i % len(generators)]
+        queries.append((kind, generate()))
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the product search index against a full scan")
+    parser.add_argument("--base-path", default=".", help="Directory containing products.json")
+    parser.add_argument("--queries", type=int, default=300, help="Number of queries")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    base_path = Path(args.base_path)
+    index_path = base_path / SEARCH_INDEX_FILE
+    if not index_path.exists():
+        sys.exit(f"{index_path} missing; run convert.py first")
+
+    with open(base_path / "products.json", 'r', encoding='utf-8') as f:
+        products = json.load(f)["all_products"]
+
+    start = time.perf_counter()
+    index = ProductSearchIndex.load(str(index_path))
+    load_ms = (time.perf_counter() - start) * 1000
+
+    queries = build_queries(products, args.queries, random.Random(args.seed))
+
+    scan_results = []
+    start = time.perf_counter()
+    for _, query in queries:
+        scan_results.append(scan_search(products, query))
+    scan_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+    index_results = []
+    start = time.perf_counter()
+    for _, query in queries:
+        index_results.append(index.search_ids(query))
+    index_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+    by_kind = {}
+    for (kind, _), scanned, indexed in zip(queries, scan_results, index_results):
+        stats = by_kind.setdefault(kind, {"queries": 0, "scan_hits": 0, "found": 0, "extra": 0})
+        stats["queries"] += 1
+        stats["scan_hits"] += len(scanned)
+        stats["found"] += len(set(scanned) & set(indexed))
+        stats["extra"] += len(set(indexed) - set(scanned))
+
+    print(f"{len(products)} products, {len(queries)} queries, index load {load_ms:.1f} ms")
+    print(f"mean latency: scan {scan_ms:.3f} ms, index {index_ms:.3f} ms ({scan_ms / index_ms:.1f}x)")
+    print(f"{'kind':<8} {'queries':>8} {'scan hits':>10} {'recall':>8} {'extra hits':>11}")
+    for kind, stats in by_kind.items():
+        recall = stats["found"] / stats["scan_hits"] if stats["scan_hits"] else 1.0
+        print(f"{kind:<8} {stats['queries']:>8} {stats['scan_hits']:>10} {recall:>7.1%} {stats['extra']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Serializer benchmark
+====================
+
+Loads an existing converter output (data/*.json, products.json and
+conversion_summary.json below --base-path) and re-encodes it with every
+serializer convert.py supports, printing a matrix of encode time, decode
+time and size per output group. Encoding and decoding go through
+convert.encode_data/decode_data, the functions the converter writes with.
+
+Formats:
+    json            stdlib json, compact (the converter default)
+    json-pretty     stdlib json, indent=2 (--pretty)
+    orjson          orjson, compact; same bytes as json
+    orjson-pretty   orjson, indent=2
+    msgpack         MessagePack (.msgpack files)
+
+orjson and msgpack are skipped when they are not installed.
+
+Usage:
+    python3 benchmarks/bench_serializers.py [--base-path .] [--limit 2000] [--repeat 3]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from convert import decode_data, encode_data, serializer_available  # noqa: E402
+
+FORMATS = (
+    ("json", "json", False),
+    ("json-pretty", "json", True),
+    ("orjson", "orjson", False),
+    ("orjson-pretty", "orjson", True),
+    ("msgpack", "msgpack", False),
+)
+
+
+def load_corpus(base_path, limit=None):
+    """Return {group: [document, ...]} for the outputs found below base_path"""
+    client_paths = sorted((base_path / "data").glob("*.json"))
+    if limit:
+        client_paths = client_paths[:limit]
+
+    corpus = {"clients": []}
+    for file_path in client_paths:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            corpus["clients"].append(json.load(f))
+
+    for group, name in (("products", "products.json"), ("summary", "conversion_summary.json")):
+        file_path = base_path / name
+        if file_path.exists():
+            with open(file_path, 'r', encoding='utf-8') as f:
+                corpus[group] = [json.load(f)]
+    return {group: documents for group, documents in corpus.items() if documents}
+
+
+def best_of(repeat, function):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def measure(documents, serializer, pretty, repeat):
+    """Return (encode seconds, decode seconds, bytes) for one group and format"""
+    payloads = [encode_data(document, serializer, pretty) for document in documents]
+    encode_seconds = best_of(repeat, lambda: [encode_data(document, serializer, pretty) for document in documents])
+    decode_seconds = best_of(repeat, lambda: [decode_data(payload, serializer) for payload in payloads])
+    return encode_seconds, decode_seconds, sum(len(payload) for payload in payloads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the output serializers on an existing conversion")
+    parser.add_argument("--base-path", type=Path, default=REPO_ROOT,
+                        help="Directory holding data/, products.json and conversion_summary.json")
+    parser.add_argument("--limit", type=int, help="Only use the first N client files")
+    parser.add_argument("--repeat", type=int, default=3, help="Timings are the best of this many runs")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.base_path, args.limit)
+    if not corpus:
+        sys.exit(f"No converter output found below {args.base_path}")
+    print("Corpus: " + ", ".join(f"{len(documents)} {group}" for group, documents in corpus.items()))
+
+    print(f"\n{'group':<10} {'format':<15} {'encode ms':>10} {'decode ms':>10} {'size KB':>10} {'vs json':>8}")
+    for group, documents in corpus.items():
+        json_bytes = None
+        for label, serializer, pretty in FORMATS:
+            if not serializer_available(serializer):
+                print(f"{group:<10} {label:<15} {'not installed':>32}")
+                continue
+            encode_seconds, decode_seconds, size = measure(documents, serializer, pretty, args.repeat)
+            if json_bytes is None:
+                json_bytes = size
+            print(f"{group:<10} {label:<15} {encode_seconds * 1000:>10.1f} {decode_seconds * 1000:>10.1f} "
+                  f"{size / 1024:>10.1f} {(size / json_bytes - 1) * 100:>+7.0f}%")
+
+
+if __name__ == "__main__":
+    main()
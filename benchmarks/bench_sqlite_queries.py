@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+SQLite vs JSON query benchmark
+==============================
+
+Compares the latency of the lookups the API performs against the JSON layout
+(products.json and data/{client_number}.json, re-read on every request) with
+the same lookups as indexed queries against botan.sqlite.
+
+Run a conversion with --sqlite first, then:
+    python3 benchmarks/bench_sqlite_queries.py [--base-path .] [--queries 200]
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+
+def measure(func, args_list):
+    """Return mean latency in milliseconds of func over args_list"""
+    start = time.perf_counter()
+    for args in args_list:
+        func(*args)
+    return (time.perf_counter() - start) / len(args_list) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SQLite queries against the JSON layout")
+    parser.add_argument("--base-path", default=".", help="Directory containing the conversion output")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per scenario")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    base_path = Path(args.base_path)
+    products_path = base_path / "products.json"
+    data_path = base_path / "data"
+    database_path = base_path / "botan.sqlite"
+
+    if not products_path.exists() or not database_path.exists():
+        sys.exit("products.json or botan.sqlite missing; run convert.py --sqlite first")
+
+    with open(products_path, 'r', encoding='utf-8') as f:
+        all_products = json.load(f)["all_products"]
+    client_numbers = [path.stem for path in data_path.glob("*.json")]
+
+    rng = random.Random(args.seed)
+    article_numbers = [(rng.choice(all_products)["article_number"],) for _ in range(args.queries)]
+    categories = sorted({p["product_group"]["description"] for p in all_products if p["product_group"]["description"]})
+    category_queries = [(rng.choice(categories),) for _ in range(args.queries)]
+    words = [w for p in all_products for w in p["short_description"].split() if len(w) > 3]
+    search_terms = [(rng.choice(words).lower(),) for _ in range(args.queries)]
+    client_queries = [(rng.choice(client_numbers),) for _ in range(args.queries)]
+
+    def load_products():
+        with open(products_path, 'r', encoding='utf-8') as f:
+            return json.load(f)["all_products"]
+
+    # JSON layout, mirroring the route handlers
+    def json_product(article_number):
+        return next((p for p in load_products() if p["article_number"] == article_number), None)
+
+    def json_category(category):
+        category = category.lower()
+        return [p for p in load_products() if p["product_group"]["description"].lower() == category]
+
+    def json_search(term):
+        return [
+            p for p in load_products()
+            if term in p["short_description"].lower() or term in p["long_description"].lower()
+            or term in p["article_number"].lower() or term in p["product_group"]["description"].lower()
+        ]
+
+    def json_recent_orders(client_number):
+        with open(data_path / f"{client_number}.json", 'r', encoding='utf-8') as f:
+            return json.load(f)["order_history"][:10]
+
+    connection = sqlite3.connect(f"file:{database_path}?mode=ro", uri=True)
+
+    def sql_product(article_number):
+        return connection.execute(
+            "SELECT * FROM products WHERE article_number = ?", (article_number,)
+        ).fetchone()
+
+    def sql_category(category):
+        return connection.execute(
+            "SELECT p.* FROM products p JOIN product_groups g ON g.number = p.product_group_number "
+            "WHERE lower(g.description) = lower(?)", (category,)
+        ).fetchall()
+
+    def sql_search(term):
+        pattern = f"%{term}%"
+        return connection.execute(
+            "SELECT p.* FROM products p LEFT JOIN product_groups g ON g.number = p.product_group_number "
+            "WHERE lower(p.short_description) LIKE ? OR lower(p.long_description) LIKE ? "
+            "OR lower(p.article_number) LIKE ? OR lower(g.description) LIKE ?",
+            (pattern, pattern, pattern, pattern)
+        ).fetchall()
+
+    def sql_recent_orders(client_number):
+        return connection.execute(
+            "SELECT article_number, date, booking_quantity, quantity, unit FROM order_history "
+            "WHERE client_number = ? ORDER BY date DESC LIMIT 10", (client_number,)
+        ).fetchall()
+
+    scenarios = [
+        ("product by article number", json_product, sql_product, article_numbers),
+        ("category filter", json_category, sql_category, category_queries),
+        ("text search", json_search, sql_search, search_terms),
+        ("recent orders of client", json_recent_orders, sql_recent_orders, client_queries),
+    ]
+
+    print(f"{len(all_products)} products, {len(client_numbers)} client files, {args.queries} queries per scenario")
+    print(f"{'scenario':<28} {'json ms':>10} {'sqlite ms':>10} {'speedup':>9}")
+    for name, json_func, sql_func, queries in scenarios:
+        json_ms = measure(json_func, queries)
+        sql_ms = measure(sql_func, queries)
+        print(f"{name:<28} {json_ms:>10.3f} {sql_ms:>10.3f} {json_ms / sql_ms:>8.1f}x")
+
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
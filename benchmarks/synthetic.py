@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Synthetic susko.ai export generator
+===================================
+
+Writes XML files in the CDATA schema DataConverter reads, so the converter
+can be benchmarked without production data. generate_tree() lays out a
+complete susko.ai/ directory (Adressen, Artikel and History) at any scale.
+
+Usage:
+    python3 benchmarks/synthetic.py OUT_DIR [--clients 10000] [--articles 3500] [--history-rows 1000000]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from convert import ADDITIONAL_ADDRESS_FIELD_MAP, CLIENT_FIELD_MAP, PRODUCT_FIELD_MAP  # noqa: E402
+
+XML_HEADER = '﻿<?xml version="1.0" encoding="utf-8" ?>\n'
+UNITS = ("KI", "ST", "KG", "FL", "KT", "BT")
+WORDS = ("Apfel", "Schorle", "Kiste", "Döner", "Brot", "Käse", "Öl", "Müller", "Straße", "Hamburg",
+         "Gastro", "Frisch", "Tomate", "Gurke", "Soße", "Becher", "Karton", "Pizza", "Imbiss", "Grill")
+PRODUCT_GROUPS = ("Getränke", "Molkerei", "Fleisch", "Gemüse", "Tiefkühl", "Backwaren", "Gewürze",
+                  "Konserven", "Verpackung", "Reinigung", "Süßwaren", "Öle und Fette")
+XML_TYPES = {"text": "WideString", "bool": "Boolean", "float": "Float", "date": "Date"}
+MANIFEST_FILE = "synthetic.json"
+
+
+def cdata_field(tag, value, info="", value_type="WideString"):
+    """Render one <Tag info=".." type=".."><![CDATA[value]]></Tag> line"""
+    return f'    <{tag} info="{info}" type="{value_type}"><![CDATA[{value}]]></{tag}>\n'
+
+
+def random_german_date(rng, first_year=2019, last_year=2025):
+    """Return a DD.MM.YYYY date string"""
+    return f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{rng.randint(first_year, last_year)}"
+
+
+def field_tags(field_map):
+    """Yield (tag, kind) for every source tag of a field mapping table"""
+    for spec in field_map.values():
+        if isinstance(spec, dict):
+            yield from field_tags(spec)
+        elif spec[0] == "list":
+            for tag in spec[1]:
+                yield tag, "text"
+        else:
+            yield spec
+
+
+def random_value(rng, kind):
+    """Return a plausible raw CDATA value for a field kind"""
+    if kind == "bool":
+        return rng.choice(("Ja", "Nein", "Nein"))
+    if kind == "float":
+        return f"{rng.randint(0, 99)},{rng.randint(0, 99):02d}"
+    if kind == "date":
+        return random_german_date(rng) if rng.random() < 0.3 else ""
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+
+
+def render_fields(rng, field_map, fixed):
+    """Render every tag of a field map, taking values from fixed where given"""
+    lines = []
+    for tag, kind in field_tags(field_map):
+        value = fixed[tag] if tag in fixed else random_value(rng, kind)
+        lines.append(cdata_field(tag, value, tag, XML_TYPES[kind]))
+    return "".join(lines)
+
+
+def write_address_files(directory, client_numbers, seed=0):
+    """Write one Adresse-<number>.XML per client with one to three extra addresses"""
+    rng = random.Random(seed)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    for client_number in client_numbers:
+        anschriften = []
+        for address_number in range(rng.randint(1, 3)):
+            anschriften.append(
+                "<Anschriften>\n"
+                + render_fields(rng, ADDITIONAL_ADDRESS_FIELD_MAP, {"AnsNr": address_number})
+                + "</Anschriften>\n"
+            )
+        content = (
+            XML_HEADER
+            + "<AdressenListe>\n<AdressenAnzahl>1</AdressenAnzahl>\n<Adresse>\n"
+            + render_fields(rng, CLIENT_FIELD_MAP, {"AdrNr": client_number})
+            + "<AnschriftenListe>\n" + "".join(anschriften) + "</AnschriftenListe>\n"
+            + "</Adresse>\n</AdressenListe>\n"
+        )
+        with open(directory / f"Adresse-{client_number}.XML", 'w', encoding='utf-8') as f:
+            f.write(content)
+
+
+def write_article_files(directory, article_numbers, client_numbers, deviations=70, seed=0):
+    """Write one Artikel-<number>.xml per article.
+
+    Each file carries `deviations` client specific <ArtikelAbweichend> blocks
+    the converter ignores; the real export has dozens per article and they
+    dominate parse time, so leaving them out would flatter load_products.
+    """
+    rng = random.Random(seed)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    for article_number in article_numbers:
+        group = rng.randrange(len(PRODUCT_GROUPS))
+        fixed = {
+            "ArtNr": article_number,
+            "WgrNr": str(100 + group),
+            "WgrNrInfo": PRODUCT_GROUPS[group],
+            "Einh": rng.choice(UNITS),
+        }
+        blocks = []
+        for client_number in rng.sample(client_numbers, min(deviations, len(client_numbers))):
+            blocks.append(
+                "  <ArtikelAbweichend>\n"
+                + cdata_field("AdrNr", client_number, "Adressnummer")
+                + cdata_field("ArtNr", article_number, "Artikelnummer")
+                + cdata_field("AbwPr", random_value(rng, "float"), "Abweichender Preis", "Float")
+                + "".join(cdata_field(f"Rab{level}_{suffix}", "", f"Rab{level}", "Float")
+                          for level in range(4) for suffix in ("Pr", "Sz", "Mge"))
+                + "  </ArtikelAbweichend>\n"
+            )
+        content = (
+            XML_HEADER
+            + "<ArtikelListe>\n<ArtikelAnzahl>1</ArtikelAnzahl>\n<Artikel>\n"
+            + render_fields(rng, PRODUCT_FIELD_MAP, fixed)
+            + "  <ArtikelAbweichende>\n" + "".join(blocks) + "  </ArtikelAbweichende>\n"
+            + "</Artikel>\n</ArtikelListe>\n"
+        )
+        with open(directory / f"Artikel-{article_number}.xml", 'w', encoding='utf-8') as f:
+            f.write(content)
+
+
+def write_history_file(path, rows, client_numbers, article_numbers, seed=0):
+    """Write AdresseHistory-Komplett.xml with the given number of <History> rows.
+
+    Clients are drawn with a skewed distribution so that a few heavy clients
+    own long histories, like in the real export.
+    """
+    rng = random.Random(seed)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    client_weights = [1.0 / (rank + 1) ** 0.8 for rank in range(len(client_numbers))]
+    batch = 10000
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(XML_HEADER)
+        f.write("<HistoryListe>\n")
+        written = 0
+        while written < rows:
+            count = min(batch, rows - written)
+            clients = rng.choices(client_numbers, weights=client_weights, k=count)
+            chunk = []
+            for client_number in clients:
+                chunk.append(
+                    "<History>\n"
+                    + cdata_field("AdrNr", client_number, "Adressnummer")
+                    + cdata_field("ArtNr", rng.choice(article_numbers), "Artikelnummer")
+                    + cdata_field("Dat", random_german_date(rng), "Datum", "Date")
+                    + cdata_field("BuchMge", f"{rng.randint(1, 40)},{rng.randint(0, 9)}", "Buchungsmenge", "Float")
+                    + cdata_field("Mge", str(rng.randint(1, 40)), "Menge", "Float")
+                    + cdata_field("Einh", rng.choice(UNITS), "Einheit")
+                    + "</History>\n"
+                )
+            f.write("".join(chunk))
+            written += count
+        f.write("</HistoryListe>\n")
+
+    return path
+
+
+def generate_tree(base_path, clients, articles, history_rows, seed=0, deviations=70):
+    """Write a complete susko.ai/ tree under base_path.
+
+    Client numbers start at 10000 and article numbers at 1000 like in the
+    real export. The parameters are recorded in synthetic.json; a tree that
+    was already generated with the same parameters is left alone, so large
+    scales only pay the generation cost once. Returns whether it wrote files.
+    """
+    base_path = Path(base_path)
+    params = {"clients": clients, "articles": articles, "history_rows": history_rows,
+              "seed": seed, "deviations": deviations}
+    manifest_path = base_path / MANIFEST_FILE
+    if manifest_path.exists():
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            if json.load(f) == params:
+                return False
+
+    susko_path = base_path / "susko.ai"
+    if susko_path.exists():
+        shutil.rmtree(susko_path)
+    client_numbers = [str(10000 + i) for i in range(clients)]
+    article_numbers = [str(1000 + i) for i in range(articles)]
+
+    write_address_files(susko_path / "Adressen", client_numbers, seed)
+    write_article_files(susko_path / "Artikel", article_numbers, client_numbers, deviations, seed)
+    write_history_file(susko_path / "History" / "AdresseHistory-Komplett.xml",
+                       history_rows, client_numbers, article_numbers, seed)
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(params, f)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic susko.ai export")
+    parser.add_argument("out_dir", help="Directory receiving susko.ai/")
+    parser.add_argument("--clients", type=int, default=10000)
+    parser.add_argument("--articles", type=int, default=3500)
+    parser.add_argument("--history-rows", type=int, default=1000000)
+    parser.add_argument("--deviations", type=int, default=70,
+                        help="Ignored <ArtikelAbweichend> blocks per article file")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generated = generate_tree(args.out_dir, args.clients, args.articles, args.history_rows,
+                              args.seed, args.deviations)
+    print(f"{'Generated' if generated else 'Up to date'}: {Path(args.out_dir) / 'susko.ai'}")
+
+
+if __name__ == "__main__":
+    main()
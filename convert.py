@@ -11,34 +11,653 @@ This script converts XML data from three sources into normalized JSON format:
 Output:
 - data/{client_number}.json - Individual client files with profile and order history
 - products.json - Master product catalog
+- clients.pack - Optional single-file client store with an offset index (--packed)
+- products.search.json - Inverted token/trigram index over products.json
+- article_clients.json - Article number -> client numbers who ordered it
+- botan.sqlite - Optional normalized SQLite database (--sqlite)
+- conversion_manifest.json - Source signatures and per-client fingerprints used
+  to regenerate only the client files affected by a change
+
+With --daemon the converter stays resident after the first run and applies
+changed source files (named on stdin or a Unix socket, or found by polling
+with --watch) without reloading everything else.
+
+With --history-partitions N the order history is spilled to N temporary
+files partitioned by client, and client files are produced one partition at
+a time, so memory no longer grows with the size of the history export.
 """
 
 import xml.etree.ElementTree as ET
+import argparse
+import array
+import fnmatch
+import hashlib
 import json
 import os
+import pickle
+import sys
 import glob
+import mmap
+import shutil
+import sqlite3
+import cProfile
+import pstats
+import queue
+import signal
+import socketserver
+import tracemalloc
+import struct
+import tempfile
+import unicodedata
+import threading
+import time
 import re
-from datetime import datetime
+import zlib
+from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Iterable, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import numpy as np
+except ImportError:  # optional, speeds up aggregate_orders
+    np = None
+
+try:
+    import orjson
+except ImportError:  # optional, --serializer orjson
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional, --serializer msgpack
+    msgpack = None
+
+
+# Bump whenever the layout of the client files changes so that the next
+# incremental run rebuilds every client file
+MANIFEST_VERSION = 3
+
+# Source folders below susko.ai/ and the files the converter reads from them
+SOURCE_PATTERNS = (("Adressen", "*.XML"), ("Artikel", "*.xml"), ("History", "*.xml"))
+
+# Resumable conversion (see DataConverter.open_checkpoint)
+CHECKPOINT_DIR = ".conversion_checkpoint"
+CHECKPOINT_VERSION = 1
+CHECKPOINT_BATCH = 500
+CHECKPOINT_STAGES = {
+    "clients": ("clients", "client_sources"),
+    "products": ("products", "product_sources"),
+    "order_history": ("order_history",)
+}
+GENERATIONS_DIR = "data.generations"
+
+# Parsed source records reused while a file's content hash is unchanged
+# (see DataConverter.cached_parse_files). Bump the version when a parse_*
+# method changes its output without a field map change.
+PARSE_CACHE_DIR = ".conversion_cache"
+PARSE_CACHE_VERSION = 1
+
+# Serializers of the client files, products and summary (see encode_data).
+# orjson writes the same JSON as the stdlib encoder, msgpack binary files.
+SERIALIZERS = ("json", "orjson", "msgpack")
+SERIALIZER_EXTENSIONS = {"json": ".json", "orjson": ".json", "msgpack": ".msgpack"}
+SERIALIZER_ENV = "BOTAN_SERIALIZER"
+
+# Partitioned order history (see DataConverter.spill_order_history)
+SPILL_BATCH_ROWS = 2000
+MAX_HISTORY_PARTITIONS = 256
+HASH_BLOCK_SIZE = 1 << 20
+
+# Converter daemon (see ConversionDaemon)
+DAEMON_DEBOUNCE_SECONDS = 0.5
+
+# Layouts of order_history in the client files (see DataConverter.layout_order_history)
+HISTORY_LAYOUTS = ("embedded", "interned", "columnar")
+HISTORY_COLUMNS = ("article_number", "date", "booking_quantity", "quantity", "unit")
+
+# Scalar parsing fast paths
+BOOLEAN_VALUES = {"Ja": True, "Nein": False, "ja": True, "nein": False, "": False,
+                  "true": True, "false": False, "True": True, "False": False, "1": True, "0": False}
+TRUE_VALUES = frozenset(("ja", "true", "1"))
+DATE_CACHE_SIZE = 65536
+
+# Precomputed AI context (see DataConverter.build_ai_context)
+AI_TOP_ARTICLES = 10
+AI_RECOMMENDATIONS = 10
+AI_CANDIDATE_GROUPS = 5
+AI_GROUP_NEIGHBOURS = 20
+
+# Packed client store (see DataConverter.create_packed_store)
+PACKED_STORE_FILE = "clients.pack"
+PACK_MAGIC = b"BOTANPK1"
+PACK_VERSION = 1
+PACK_FOOTER_SIZE = 12 + len(PACK_MAGIC)
+HOT_RECENT_ORDERS = 10
+
+# Time-bucketed order aggregates (see aggregate_orders)
+AGGREGATE_WINDOWS = (30, 90, 365)
+AGGREGATE_WEEKS = 13
+AGGREGATE_MONTHS = 12
+
+# Reverse index from article to ordering clients (see DataConverter.build_article_index)
+ARTICLE_INDEX_FILE = "article_clients.json"
+
+# Per-article order rollups, kept out of products.json (see create_product_aggregates_file)
+PRODUCT_AGGREGATES_FILE = "product_aggregates.json"
+
+# Product search index (see DataConverter.build_search_index)
+SEARCH_INDEX_FILE = "products.search.json"
+SEARCH_NGRAM_SIZE = 3
+SEARCH_FIELDS = ("short_description", "long_description", "article_number", "barcode", "product_group")
+
+# Fold German umlauts and sharp s before stripping remaining accents
+GERMAN_FOLDING = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss", "ẞ": "ss"})
+SEARCH_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_search_text(text: str) -> str:
+    """Lowercase, fold umlauts/ß (Größe -> groesse) and drop other accents"""
+    folded = text.lower().translate(GERMAN_FOLDING)
+    decomposed = unicodedata.normalize("NFKD", folded)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def search_tokens(text: str) -> List[str]:
+    """Split normalized text into alphanumeric search tokens"""
+    return SEARCH_TOKEN_PATTERN.findall(normalize_search_text(text))
+
+
+def token_ngrams(token: str, size: int = SEARCH_NGRAM_SIZE) -> List[str]:
+    """Return the distinct character n-grams of a token"""
+    return list(dict.fromkeys(token[i:i + size] for i in range(len(token) - size + 1)))
+
+
+# Field mapping tables: JSON key -> (XML tag, value kind). Nested dicts map to
+# nested JSON objects and ("list", tags) collects the non-empty values of
+# several tags. The tables are compiled once per converter into builders that
+# read from a tag -> text dict gathered in a single pass over an element.
+CLIENT_FIELD_MAP = {
+    "client_number": ("AdrNr", "text"),
+    "search_term": ("SuchBeg", "text"),
+    "status": ("Status", "text"),
+    "tax_number": ("SteuNr", "text"),
+    "vat_id": ("UStId", "text"),
+    "is_blocked": ("GspKz", "bool"),
+    "price_group": ("ArtPrGrp", "text"),
+    "billing_address": {
+        "salutation": ("Re_Na1", "text"),
+        "name": ("Re_Na2", "text"),
+        "name3": ("Re_Na3", "text"),
+        "street": ("Re_Str", "text"),
+        "city": ("Re_Ort", "text"),
+        "postal_code": ("Re_Plz", "text"),
+        "country": ("Re_Land", "text"),
+        "phone": ("Re_Tel", "text"),
+        "fax": ("Re_Fax", "text"),
+        "email": ("Re_Email1", "text")
+    },
+    "delivery_address": {
+        "salutation": ("Li_Na1", "text"),
+        "name": ("Li_Na2", "text"),
+        "name3": ("Li_Na3", "text"),
+        "street": ("Li_Str", "text"),
+        "city": ("Li_Ort", "text"),
+        "postal_code": ("Li_Plz", "text"),
+        "country": ("Li_Land", "text"),
+        "phone": ("Li_Tel", "text"),
+        "fax": ("Li_Fax", "text"),
+        "email": ("Li_Email1", "text")
+    },
+    "delivery_schedule": {
+        "monday": ("Sel12", "text"),
+        "tuesday": ("Sel13", "text"),
+        "wednesday": ("Sel14", "text"),
+        "thursday": ("Sel15", "text"),
+        "friday": ("Sel16", "text"),
+        "saturday": ("Sel17", "text")
+    },
+    "settings": {
+        "webshop_enabled": ("Sel70", "bool"),
+        "ds_addresses": ("Sel29", "bool"),
+        "no_pickup_app": ("Sel91", "bool"),
+        "minimum_order_value": ("Sel94", "float"),
+        "articles_not_in_history": ("Sel18", "text")
+    }
+}
+
+ADDITIONAL_ADDRESS_FIELD_MAP = {
+    "address_number": ("AnsNr", "text"),
+    "salutation": ("Na1", "text"),
+    "name": ("Na2", "text"),
+    "name3": ("Na3", "text"),
+    "street": ("Str", "text"),
+    "city": ("Ort", "text"),
+    "postal_code": ("Plz", "text"),
+    "country": ("Land", "text"),
+    "phone": ("Tel", "text"),
+    "fax": ("Fax", "text"),
+    "email": ("Email1", "text"),
+    "is_default_billing": ("StdReKz", "bool"),
+    "is_default_delivery": ("StdLiKz", "bool")
+}
+
+PRODUCT_FIELD_MAP = {
+    "article_number": ("ArtNr", "text"),
+    "barcode": ("BarCd", "text"),
+    "short_description": ("KuBez1", "text"),
+    "long_description": ("KuBez6", "text"),
+    "weight": ("Gew", "float"),
+    "unit": ("Einh", "text"),
+    "price_quantity": ("PreisMge", "float"),
+    "tax_key": ("StSchl", "text"),
+    "product_group": {
+        "number": ("WgrNr", "text"),
+        "description": ("WgrNrInfo", "text")
+    },
+    "pricing": {
+        "vk0_net_price": ("Vk0_PreisNt", "float"),
+        "vk0_special_price": ("Vk0_SPr", "float"),
+        "vk0_special_from": ("Vk0_SVonDat", "date"),
+        "vk0_special_to": ("Vk0_SBisDat", "date"),
+        "vk4_net_price": ("Vk4_PreisNt", "float"),
+        "vk5_net_price": ("Vk5_PreisNt", "float")
+    },
+    "delivery_time_days": ("Lief_LiefZt", "float"),
+    "attributes": {
+        "has_weight": ("Sel2", "bool"),
+        "is_order_article": ("Sel3", "bool"),
+        "pre_order_only": ("Sel4", "bool"),
+        "is_blocked": ("GspKz", "bool"),
+        "webshop_enabled": ("WShopKz", "bool"),
+        "frozen": ("Sel27", "bool")
+    },
+    "restaurant_categories": {
+        "doener_imbiss": ("Sel81", "bool"),
+        "wurst_imbiss": ("Sel82", "bool"),
+        "cafe": ("Sel83", "bool"),
+        "italiener": ("Sel84", "bool"),
+        "grieche": ("Sel85", "bool"),
+        "asiatische_kueche": ("Sel86", "bool"),
+        "international": ("Sel87", "bool"),
+        "orient": ("Sel88", "bool"),
+        "balkan": ("Sel89", "bool"),
+        "supermaerkte": ("Sel90", "bool"),
+        "baeckerei": ("Sel91", "bool"),
+        "kiosk": ("Sel92", "bool"),
+        "pizza_lieferdienst": ("Sel93", "bool"),
+        "burger_manufaktur": ("Sel94", "bool"),
+        "bars_und_clubs": ("Sel95", "bool")
+    },
+    "images": ("list", ("BildDatei1", "BildDatei2", "BildDatei3", "BildDatei4", "BildDatei5")),
+    "packaging": {
+        "unit_factor": ("EinhFakt", "text"),
+        "quantity_factor": ("MgeFakt", "text")
+    }
+}
+
+
+# SQLite output backend (see DataConverter.create_sqlite_database)
+SQLITE_DATABASE_FILE = "botan.sqlite"
+SQLITE_COLUMN_TYPES = {"text": "TEXT", "bool": "INTEGER", "float": "REAL", "date": "TEXT"}
+
+# Client fields stored in the addresses table rather than as client columns
+SQLITE_ADDRESS_KINDS = {"billing_address": "billing", "delivery_address": "delivery"}
+SQLITE_ADDRESS_COLUMNS = [key for key in ADDITIONAL_ADDRESS_FIELD_MAP if key != "address_number"]
+
+
+def flatten_field_map(field_map: Dict[str, Any], prefix: str = "") -> List[Tuple[str, Tuple[str, ...], str]]:
+    """Flatten a field mapping table into (column name, key path, kind) triples"""
+    columns = []
+    for key, spec in field_map.items():
+        if isinstance(spec, dict):
+            for column, path, kind in flatten_field_map(spec, f"{prefix}{key}_"):
+                columns.append((column, (key,) + path, kind))
+        else:
+            kind = "list" if spec[0] == "list" else spec[1]
+            columns.append((f"{prefix}{key}", (key,), kind))
+    return columns
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, None where unsupported"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    if sys.platform == "darwin":
+        return round(peak / (1024 * 1024), 1)
+    return round(peak / 1024, 1)
+
+
+def serializer_available(serializer: str) -> bool:
+    """Whether the package behind a serializer is installed"""
+    return {"orjson": orjson, "msgpack": msgpack}.get(serializer, json) is not None
+
+
+def encode_data(data: Any, serializer: str = "json", pretty: bool = False) -> bytes:
+    """Serialize data with one of SERIALIZERS; pretty only applies to JSON"""
+    if serializer == "msgpack":
+        return msgpack.packb(data, use_bin_type=True)
+    if serializer == "orjson":
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode_data(payload: bytes, serializer: str = "json") -> Any:
+    """Inverse of encode_data"""
+    if serializer == "msgpack":
+        return msgpack.unpackb(payload, raw=False)
+    if serializer == "orjson":
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def collect_child_values(element) -> Dict[str, str]:
+    """Map each child tag to its stripped text in one pass over the children.
+
+    Only the first occurrence of a tag is kept, matching Element.find().
+    """
+    values = {}
+    for child in element:
+        tag = child.tag
+        if tag not in values:
+            text = child.text
+            values[tag] = text.strip() if text else ""
+    return values
+
+
+def aggregate_orders_numpy(keys, key_count: int, days, months, quantities, as_of: int, as_of_month: int) -> Dict[str, Any]:
+    """Group order rows by key with NumPy sorts and bincounts.
+
+    keys, days (date ordinals), months (year * 12 + month - 1) and quantities
+    are equally long columns. Returns per-key columns, see aggregate_orders.
+    Weighted bincounts of an empty selection come back as integers, so the
+    quantity columns are cast to float to match aggregate_orders_python.
+    """
+    keys = np.frombuffer(keys, dtype=np.int32).astype(np.intp)
+    days = np.frombuffer(days, dtype=np.int32)
+    months = np.frombuffer(months, dtype=np.int32)
+    quantities = np.frombuffer(quantities, dtype=np.float64)
+    
+    result = {
+        "orders": np.bincount(keys, minlength=key_count).tolist(),
+        "quantity": np.bincount(keys, weights=quantities, minlength=key_count).astype(np.float64).tolist()
+    }
+    
+    # Sorting by (key, day) puts each key's rows in one run, oldest first
+    order = np.lexsort((days, keys))
+    sorted_keys = keys[order]
+    sorted_days = days[order]
+    first_rows = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    last_rows = np.r_[first_rows[1:], len(sorted_keys)] - 1
+    first = np.full(key_count, -1, dtype=np.int64)
+    last = np.full(key_count, -1, dtype=np.int64)
+    first[sorted_keys[first_rows]] = sorted_days[first_rows]
+    last[sorted_keys[last_rows]] = sorted_days[last_rows]
+    result["first"] = first.tolist()
+    result["last"] = last.tolist()
+    
+    new_day = np.r_[True, (sorted_keys[1:] != sorted_keys[:-1]) | (sorted_days[1:] != sorted_days[:-1])]
+    result["order_days"] = np.bincount(sorted_keys[new_day], minlength=key_count).tolist()
+    
+    past = days <= as_of
+    for window in AGGREGATE_WINDOWS:
+        in_window = past & (days > as_of - window)
+        result[f"orders_{window}d"] = np.bincount(keys[in_window], minlength=key_count).tolist()
+        result[f"quantity_{window}d"] = np.bincount(
+            keys[in_window], weights=quantities[in_window], minlength=key_count).astype(np.float64).tolist()
+    
+    # Ordinal 1 is a Monday, so (day - 1) % 7 is the weekday
+    weeks = ((as_of - (as_of - 1) % 7) - (days - (days - 1) % 7)) // 7
+    for name, buckets, count in (("weekly", weeks, AGGREGATE_WEEKS), ("monthly", as_of_month - months, AGGREGATE_MONTHS)):
+        in_range = past & (buckets < count)
+        result[name] = np.bincount(
+            keys[in_range] * count + buckets[in_range], weights=quantities[in_range], minlength=key_count * count
+        ).astype(np.float64).tolist()
+    
+    return result
+
+
+def aggregate_orders_python(keys, key_count: int, days, months, quantities, as_of: int, as_of_month: int) -> Dict[str, Any]:
+    """Pure Python equivalent of aggregate_orders_numpy, used without NumPy"""
+    orders = [0] * key_count
+    quantity = [0.0] * key_count
+    first = [-1] * key_count
+    last = [-1] * key_count
+    order_days = [set() for _ in range(key_count)]
+    window_orders = {window: [0] * key_count for window in AGGREGATE_WINDOWS}
+    window_quantity = {window: [0.0] * key_count for window in AGGREGATE_WINDOWS}
+    weekly = [0.0] * (key_count * AGGREGATE_WEEKS)
+    monthly = [0.0] * (key_count * AGGREGATE_MONTHS)
+    as_of_monday = as_of - (as_of - 1) % 7
+    
+    for key, day, month, value in zip(keys, days, months, quantities):
+        orders[key] += 1
+        quantity[key] += value
+        if first[key] < 0 or day < first[key]:
+            first[key] = day
+        if day > last[key]:
+            last[key] = day
+        order_days[key].add(day)
+        
+        if day > as_of:
+            continue
+        for window in AGGREGATE_WINDOWS:
+            if day > as_of - window:
+                window_orders[window][key] += 1
+                window_quantity[window][key] += value
+        week = (as_of_monday - (day - (day - 1) % 7)) // 7
+        if week < AGGREGATE_WEEKS:
+            weekly[key * AGGREGATE_WEEKS + week] += value
+        month_offset = as_of_month - month
+        if month_offset < AGGREGATE_MONTHS:
+            monthly[key * AGGREGATE_MONTHS + month_offset] += value
+    
+    result = {
+        "orders": orders,
+        "quantity": quantity,
+        "first": first,
+        "last": last,
+        "order_days": [len(day_set) for day_set in order_days],
+        "weekly": weekly,
+        "monthly": monthly
+    }
+    for window in AGGREGATE_WINDOWS:
+        result[f"orders_{window}d"] = window_orders[window]
+        result[f"quantity_{window}d"] = window_quantity[window]
+    return result
+
+
+def aggregate_orders(keys, key_count: int, days, months, quantities, as_of: date) -> List[Optional[Dict[str, Any]]]:
+    """Roll up order rows per key relative to the as_of date.
+
+    Returns one dict per key (None for keys without dated orders) with
+    totals, first/last order, ordering cadence, trailing AGGREGATE_WINDOWS
+    day windows and the quantities of the last AGGREGATE_WEEKS ISO weeks and
+    AGGREGATE_MONTHS calendar months (newest first, empty buckets omitted).
+    Uses NumPy when it is installed.
+    """
+    if not len(days):
+        return [None] * key_count
+    
+    as_of_day = as_of.toordinal()
+    as_of_month = as_of.year * 12 + as_of.month - 1
+    aggregate = aggregate_orders_numpy if np is not None else aggregate_orders_python
+    columns = aggregate(keys, key_count, days, months, quantities, as_of_day, as_of_month)
+    
+    as_of_monday = as_of_day - (as_of_day - 1) % 7
+    week_labels = []
+    for week in range(AGGREGATE_WEEKS):
+        iso_year, iso_week, _ = date.fromordinal(as_of_monday - 7 * week).isocalendar()
+        week_labels.append(f"{iso_year}-W{iso_week:02d}")
+    month_labels = [
+        f"{(as_of_month - month) // 12}-{(as_of_month - month) % 12 + 1:02d}"
+        for month in range(AGGREGATE_MONTHS)
+    ]
+    
+    aggregates = []
+    for key in range(key_count):
+        if not columns["orders"][key]:
+            aggregates.append(None)
+            continue
+        
+        first, last, order_days = columns["first"][key], columns["last"][key], columns["order_days"][key]
+        interval = round((last - first) / (order_days - 1), 1) if order_days > 1 else None
+        weekly = columns["weekly"][key * AGGREGATE_WEEKS:(key + 1) * AGGREGATE_WEEKS]
+        monthly = columns["monthly"][key * AGGREGATE_MONTHS:(key + 1) * AGGREGATE_MONTHS]
+        
+        aggregates.append({
+            "orders": columns["orders"][key],
+            "quantity": round(columns["quantity"][key], 3),
+            "first_order_date": date.fromordinal(first).isoformat(),
+            "last_order_date": date.fromordinal(last).isoformat(),
+            "order_days": order_days,
+            "average_interval_days": interval,
+            "next_order_expected": date.fromordinal(last + round(interval)).isoformat() if interval else None,
+            "trailing": {
+                f"{window}d": {
+                    "orders": columns[f"orders_{window}d"][key],
+                    "quantity": round(columns[f"quantity_{window}d"][key], 3)
+                }
+                for window in AGGREGATE_WINDOWS
+            },
+            "weekly_quantity": {
+                label: round(value, 3) for label, value in zip(week_labels, weekly) if value
+            },
+            "monthly_quantity": {
+                label: round(value, 3) for label, value in zip(month_labels, monthly) if value
+            }
+        })
+    
+    return aggregates
 
 
 class DataConverter:
     """Main class for converting XML data to normalized JSON format"""
     
-    def __init__(self, base_path: str = "."):
-        """Initialize the converter with base path"""
+    def __init__(self, base_path: str = ".", incremental: bool = True, workers: int = 1,
+                 pretty: bool = False, write_threads: int = 4, packed: bool = False,
+                 sqlite: bool = False, legacy_products: bool = False, measure_products: bool = False,
+                 history_layout: str = "embedded", as_of: Optional[date] = None,
+                 resumable: bool = False, history_partitions: int = 0, serializer: str = "json"):
+        """Initialize the converter with base path
+
+        as_of is the reference date of the trailing order windows; it
+        defaults to today. resumable enables checkpoints and generation
+        swaps of data/ (see open_checkpoint and publish_generation).
+        history_partitions > 0 spills the order history to that many
+        client-partitioned files instead of holding it in memory (see
+        spill_order_history). serializer picks the encoding of the client
+        files and products file, one of SERIALIZERS; the summary stays JSON.
+        measure_products compares the products file with the legacy shape
+        once per process (see measure_products_savings).
+        """
         self.base_path = Path(base_path)
         self.susko_path = self.base_path / "susko.ai"
         self.data_path = self.base_path / "data"
+        self.output_data_path = self.data_path
+        self.generations_path = self.base_path / GENERATIONS_DIR
+        self.checkpoint_path = self.base_path / CHECKPOINT_DIR
+        self.manifest_path = self.base_path / "conversion_manifest.json"
+        self.incremental = incremental
+        self.workers = max(1, workers)
+        self.pretty = pretty
+        self.write_threads = max(1, write_threads)
+        self.packed = packed
+        self.sqlite = sqlite
+        self.legacy_products = legacy_products
+        self.measure_products = measure_products
+        if history_layout not in HISTORY_LAYOUTS:
+            raise ValueError(f"Unknown history layout: {history_layout}")
+        self.history_layout = history_layout
+        self.resumable = resumable
+        if not 0 <= history_partitions <= MAX_HISTORY_PARTITIONS:
+            raise ValueError(f"history_partitions must be between 0 and {MAX_HISTORY_PARTITIONS}")
+        self.history_partitions = history_partitions
+        if serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown serializer: {serializer}")
+        if not serializer_available(serializer):
+            raise ValueError(f"The {serializer} serializer needs the {serializer} package")
+        self.serializer = serializer
+        self.output_extension = SERIALIZER_EXTENSIONS[serializer]
+        if history_partitions and (resumable or packed or sqlite):
+            raise ValueError("history_partitions cannot be combined with resumable, packed or sqlite output")
+        self.as_of_pinned = as_of is not None
+        self.as_of = as_of or date.today()
+        
+        # mkstemp creates 0600 files; give outputs the usual umask-based mode
+        umask = os.umask(0)
+        os.umask(umask)
+        self.file_mode = 0o666 & ~umask
         
         # Ensure data directory exists
         self.data_path.mkdir(exist_ok=True)
         
+        # Compiled field mapping tables
+        self.build_client = self.compile_field_map(CLIENT_FIELD_MAP)
+        self.build_additional_address = self.compile_field_map(ADDITIONAL_ADDRESS_FIELD_MAP)
+        self.build_product = self.compile_field_map(PRODUCT_FIELD_MAP)
+        
         # Data containers
         self.clients = {}
         self.products = {}
         self.order_history = {}
+        self.recommendation_model = None
+        self.client_articles = {}
+        self.article_clients = {}
+        self.client_aggregates = {}
+        self.article_aggregates = {}
+        self.date_cache = {}
+        self.spill_path = None
+        self.history_rows = 0
+        
+        # Incremental conversion state
+        self.client_sources = {}
+        self.product_sources = {}
+        self.previous_manifest = {}
+        self.source_signatures = {}
+        self.changed_sources = set()
+        self.client_fingerprints = {}
+        self.client_recommendations = {}
+        self.files_written = 0
+        self.files_skipped = 0
+        self.fingerprints_reused = 0
+        
+        # Resumable conversion state
+        self.checkpoint_state = {"completed": [], "generation": None}
+        self.resumed_clients = set()
+        self.resumed_stages = []
+        
+        # Output statistics, updated from the writer threads
+        self.output_lock = threading.Lock()
+        self.output_stats = {"files": 0, "bytes": 0}
+        self.output_summary = {}
+        self.products_file_savings = {}
+        self.products_file_sizes = {}
+        self.parse_cache_path = self.base_path / PARSE_CACHE_DIR
+        self.parse_cache_hits = {}
+        
+        # Packed store records of the clients written this run (see create_packed_store)
+        self.pack_spool = None
+        self.pack_records = {}
+        
+        # Per-phase instrumentation (see phase())
+        self.phase_metrics = []
+        self.total_seconds = 0.0
+        self.thread_timings = {"enrich_seconds": 0.0, "serialize_write_seconds": 0.0}
     
     def extract_cdata_value(self, element) -> str:
         """Extract CDATA value from XML element, handling empty values"""
@@ -51,25 +670,56 @@ class DataConverter:
     
     def parse_boolean(self, value: str) -> bool:
         """Parse German boolean values to Python boolean"""
-        return value.lower() in ["ja", "true", "1"]
+        result = BOOLEAN_VALUES.get(value)
+        if result is None:
+            result = value.lower() in TRUE_VALUES
+        return result
     
     def parse_float(self, value: str) -> Optional[float]:
         """Parse float value, handling German decimal format and empty values"""
-        if not value or value.strip() == "":
+        if not value:
             return None
         try:
-            # Replace German decimal separator
-            normalized_value = value.replace(",", ".")
-            return float(normalized_value)
+            # Replace German decimal separator; float() rejects blank strings
+            if "," in value:
+                return float(value.replace(",", "."))
+            return float(value)
         except ValueError:
             return None
     
     def parse_date(self, value: str) -> Optional[str]:
-        """Parse date value and convert to ISO format"""
+        """Parse date value and convert to ISO format
+
+        Results are memoized: exports contain few distinct dates but
+        millions of history rows.
+        """
+        result = self.date_cache.get(value)
+        if result is not None or value in self.date_cache:
+            return result
+        
+        result = self.convert_date(value)
+        if len(self.date_cache) >= DATE_CACHE_SIZE:
+            self.date_cache.clear()
+        self.date_cache[value] = result
+        return result
+    
+    def convert_date(self, value: str) -> Optional[str]:
+        """Convert a German DD.MM.YYYY date to YYYY-MM-DD, uncached"""
         if not value or value.strip() == "":
             return None
+        
+        # Fast path for the canonical DD.MM.YYYY shape
+        if len(value) == 10 and value[2] == "." and value[5] == ".":
+            day, month, year = value[:2], value[3:5], value[6:]
+            if day.isdigit() and month.isdigit() and year.isdigit():
+                try:
+                    date(int(year), int(month), int(day))
+                except ValueError:
+                    return value
+                return f"{year}-{month}-{day}"
+        
         try:
-            # Handle German date format DD.MM.YYYY
+            # Handle other German date spellings such as D.M.YYYY
             if "." in value:
                 date_obj = datetime.strptime(value, "%d.%m.%Y")
                 return date_obj.isoformat().split("T")[0]
@@ -77,336 +727,1525 @@ class DataConverter:
         except ValueError:
             return value
     
-    def load_clients(self):
-        """Load all client data from address XML files"""
-        print("Loading client data...")
-        address_files = glob.glob(str(self.susko_path / "Adressen" / "*.XML"))
+    def file_signature(self, file_path: str, previous: Optional[Dict] = None) -> Dict[str, Any]:
+        """Return mtime, size and content hash of a source file.
+
+        The content is only re-hashed when mtime or size differ from the
+        previous signature, so unchanged files cost a single stat call.
+        """
+        stat = os.stat(file_path)
+        if previous and previous.get("mtime_ns") == stat.st_mtime_ns and previous.get("size") == stat.st_size:
+            return previous
+        
+        # Hash in blocks so the history export is never read into memory whole
+        digest = hashlib.sha1()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        
+        return {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha1": digest.hexdigest()
+        }
+    
+    def output_options(self) -> Dict[str, Any]:
+        """Options that change the content of the client files"""
+        options = {
+            "pretty": self.pretty,
+            "history_layout": self.history_layout
+        }
+        # Only recorded for non-JSON files so existing manifests stay valid
+        if self.output_extension != ".json":
+            options["format"] = self.output_extension[1:]
+        return options
+    
+    def load_manifest(self):
+        """Load the manifest written by the previous conversion run"""
+        self.previous_manifest = {}
+        if not self.incremental or not self.manifest_path.exists():
+            return
+        
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable manifest {self.manifest_path}: {e}")
+            return
+        
+        if manifest.get("manifest_version") != MANIFEST_VERSION:
+            print("Manifest version changed, rebuilding all client files")
+            return
+        
+        if manifest.get("output_options") != self.output_options():
+            print("Output options changed, rebuilding all client files")
+            return
+        
+        self.previous_manifest = manifest
+    
+    def scan_sources(self):
+        """Collect signatures of all source XML files and detect changes"""
+        previous_sources = self.previous_manifest.get("sources", {})
+        source_files = [
+            file_path
+            for folder, pattern in SOURCE_PATTERNS
+            for file_path in glob.glob(str(self.susko_path / folder / pattern))
+        ]
+        
+        for file_path in source_files:
+            relative_path = os.path.relpath(file_path, self.susko_path)
+            previous = previous_sources.get(relative_path)
+            try:
+                signature = self.file_signature(file_path, previous)
+            except OSError as e:
+                print(f"Error reading {file_path}: {e}")
+                continue
+            
+            self.source_signatures[relative_path] = signature
+            if previous is None or previous.get("sha1") != signature["sha1"]:
+                self.changed_sources.add(relative_path)
+        
+        print(f"Scanned {len(self.source_signatures)} source files, {len(self.changed_sources)} changed")
+    
+    def hash_data(self, data: Any) -> str:
+        """Return a stable content hash of JSON-serializable data"""
+        encoded = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+    
+    def client_fingerprint(self, client_number: str, known: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Fingerprint the inputs a client file is built from.
+
+        Covers the client's address XML, its slice of the order history, the
+        product data of every article it references and its precomputed
+        recommendations, which also depend on other clients' history.
+        Components passed in known are taken as they are instead of hashed.
+        """
+        known = known or {}
+        source_path = self.client_sources.get(client_number)
+        source_signature = {}
+        if source_path:
+            relative_path = os.path.relpath(source_path, self.susko_path)
+            source_signature = self.source_signatures.get(relative_path, {})
+        
+        orders = self.order_history.get(client_number, [])
+        
+        articles = known.get("articles")
+        if articles is None:
+            article_numbers = sorted(set(order["article_number"] for order in orders))
+            articles = self.hash_data([self.article_info(number) for number in article_numbers])
+        
+        return {
+            "source": source_signature.get("sha1") or self.hash_data(self.clients[client_number]),
+            "history": known.get("history") or self.hash_data(orders),
+            "articles": articles,
+            "aggregates": self.hash_data(self.client_aggregates.get(client_number)),
+            "recommendations": self.hash_data(self.recommend_articles(client_number))
+        }
+    
+    def stale_article_clients(self) -> Optional[set]:
+        """Clients that ordered an article whose source file changed since the manifest.
+
+        Returns None when the history changed, or when an article file cannot
+        be mapped to its article number; every fingerprint is then hashed in
+        full. Otherwise the history and articles components of all other
+        clients can be taken from the previous manifest.
+        """
+        previous_sources = self.previous_manifest.get("sources")
+        article_sources = self.previous_manifest.get("article_sources")
+        if previous_sources is None or article_sources is None:
+            return None
+        
+        def history_hashes(sources):
+            return {path: signature["sha1"] for path, signature in sources.items()
+                    if Path(path).parts[0] == "History"}
+        
+        if history_hashes(previous_sources) != history_hashes(self.source_signatures):
+            return None
+        
+        current_sources = {
+            os.path.relpath(file_path, self.susko_path): article_number
+            for article_number, file_path in self.product_sources.items()
+        }
+        changed_paths = set(path for path in self.changed_sources if Path(path).parts[0] == "Artikel")
+        changed_paths.update(path for path in previous_sources
+                             if Path(path).parts[0] == "Artikel" and path not in self.source_signatures)
+        
+        stale_clients = set()
+        for path in changed_paths:
+            article_numbers = set(number for number in (article_sources.get(path), current_sources.get(path)) if number)
+            if not article_numbers:
+                return None
+            for article_number in article_numbers:
+                stale_clients.update(self.article_clients.get(article_number, ()))
+        
+        return stale_clients
+    
+    def find_changed_clients(self, client_numbers: Optional[Iterable[str]] = None) -> List[str]:
+        """Return the client numbers whose files need to be regenerated
+
+        When client_numbers is given only those clients are fingerprinted.
+        """
+        previous_clients = self.previous_manifest.get("clients", {})
+        stale_clients = self.stale_article_clients()
+        changed_clients = []
+        
+        if client_numbers is None:
+            client_numbers = self.clients
+        
+        for client_number in client_numbers:
+            # With an unchanged history only clients that ordered a changed
+            # article need their history and articles components rehashed
+            known = None
+            previous = previous_clients.get(client_number)
+            if previous and stale_clients is not None:
+                known = {"history": previous["history"]}
+                if client_number not in stale_clients:
+                    known["articles"] = previous["articles"]
+                self.fingerprints_reused += 1
+            
+            fingerprint = self.client_fingerprint(client_number, known)
+            self.client_fingerprints[client_number] = fingerprint
+            
+            client_file_path = self.data_path / self.client_file_name(client_number)
+            if previous_clients.get(client_number) != fingerprint or not client_file_path.exists():
+                changed_clients.append(client_number)
+        
+        return changed_clients
+    
+    def save_manifest(self, written_clients: Iterable[str]):
+        """Persist source signatures and fingerprints of up-to-date client files"""
+        previous_clients = self.previous_manifest.get("clients", {})
+        written_clients = set(written_clients)
+        
+        clients = {}
+        for client_number, fingerprint in self.client_fingerprints.items():
+            if client_number in written_clients:
+                clients[client_number] = fingerprint
+            elif previous_clients.get(client_number) == fingerprint:
+                clients[client_number] = fingerprint
+        
+        manifest = {
+            "manifest_version": MANIFEST_VERSION,
+            "generated_at": datetime.now().isoformat(),
+            "output_options": self.output_options(),
+            "sources": self.source_signatures,
+            "article_sources": {
+                os.path.relpath(file_path, self.susko_path): article_number
+                for article_number, file_path in self.product_sources.items()
+            },
+            "clients": clients
+        }
+        
+        self.write_json_file(self.manifest_path, manifest, pretty=False)
+    
+    def parse_files(self, parser_name: str, file_paths: List[str]) -> Iterable[Tuple[str, Any]]:
+        """Apply one of the parse_*_file methods to every path, in order.
+
+        With more than one worker the paths are split into chunks that are
+        parsed in a process pool. Results are yielded in input order so the
+        merged dicts, and therefore the output files, match the serial run.
+        """
+        if self.workers <= 1 or len(file_paths) < 2:
+            parse = getattr(self, parser_name)
+            for file_path in file_paths:
+                yield file_path, parse(file_path)
+            return
+        
+        # A few chunks per worker keeps the pool busy without paying
+        # pickling overhead for every single file
+        chunk_size = max(1, -(-len(file_paths) // (self.workers * 4)))
+        chunks = [file_paths[i:i + chunk_size] for i in range(0, len(file_paths), chunk_size)]
+        
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 initializer=_init_parse_worker,
+                                 initargs=(str(self.base_path),)) as executor:
+            results = executor.map(_parse_file_chunk, [parser_name] * len(chunks), chunks)
+            for chunk, chunk_results in zip(chunks, results):
+                yield from zip(chunk, chunk_results)
+    
+    def parse_cache_key(self) -> str:
+        """Hash of what parsed records depend on besides the source files"""
+        return self.hash_data([PARSE_CACHE_VERSION, CLIENT_FIELD_MAP, ADDITIONAL_ADDRESS_FIELD_MAP,
+                               PRODUCT_FIELD_MAP])
+    
+    def read_parse_cache(self, name: str) -> Optional[Dict[str, Any]]:
+        """Load .conversion_cache/<name>.pickle; None when missing, outdated or unreadable.
+
+        Full (non-incremental) runs parse everything and only refresh the cache.
+        """
+        cache_file = self.parse_cache_path / f"{name}.pickle"
+        if not self.incremental or not cache_file.exists():
+            return None
+        try:
+            with open(cache_file, 'rb') as f:
+                cache = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            print(f"Ignoring unreadable parse cache {cache_file}: {e}")
+            return None
+        if cache.get("key") != self.parse_cache_key():
+            return None
+        return cache
+    
+    def write_parse_cache(self, name: str, cache: Dict[str, Any]):
+        cache["key"] = self.parse_cache_key()
+        self.parse_cache_path.mkdir(exist_ok=True)
+        self.write_checkpoint_file(f"{name}.pickle",
+                                   lambda f: pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL),
+                                   directory=self.parse_cache_path)
+    
+    def source_sha1(self, file_path: str) -> Optional[str]:
+        """Content hash scan_sources recorded for a source file, if any"""
+        signature = self.source_signatures.get(os.path.relpath(file_path, self.susko_path))
+        return signature["sha1"] if signature else None
+    
+    def cached_parse_files(self, name: str, parser_name: str, file_paths: List[str]) -> Iterable[Tuple[str, Any]]:
+        """parse_files that reuses the records of files whose content hash is unchanged.
+
+        Records are cached per source file in .conversion_cache/<name>.pickle
+        and yielded in file_paths order, like parse_files, so the loaded
+        dicts match a run that parsed everything. The cache is rewritten only
+        when a file was parsed or has disappeared.
+        """
+        cache = self.read_parse_cache(name)
+        cached_files = cache["files"] if cache else {}
+        
+        reused = {}
+        for file_path in file_paths:
+            sha1 = self.source_sha1(file_path)
+            entry = cached_files.get(os.path.relpath(file_path, self.susko_path))
+            if sha1 and entry and entry[0] == sha1:
+                reused[file_path] = entry[1]
+        parsed = dict(self.parse_files(parser_name, [path for path in file_paths if path not in reused]))
+        self.parse_cache_hits[name] = len(reused)
+        
+        files = {}
+        for file_path in file_paths:
+            record = reused[file_path] if file_path in reused else parsed[file_path]
+            sha1 = self.source_sha1(file_path)
+            if sha1:
+                files[os.path.relpath(file_path, self.susko_path)] = (sha1, record)
+            yield file_path, record
+        
+        if files and (parsed or len(files) != len(cached_files)):
+            self.write_parse_cache(name, {"files": files})
+    
+    def history_sources(self) -> Dict[str, str]:
+        return {path: signature["sha1"] for path, signature in self.source_signatures.items()
+                if Path(path).parts[0] == "History"}
+    
+    def restore_history_cache(self) -> bool:
+        """Reuse the sorted order history of the previous run when the export is unchanged"""
+        cache = self.read_parse_cache("order_history")
+        if cache is None or not cache["sources"] or cache["sources"] != self.history_sources():
+            return False
+        self.order_history = cache["order_history"]
+        return True
+    
+    def save_history_cache(self):
+        sources = self.history_sources()
+        if sources:
+            self.write_parse_cache("order_history", {"sources": sources, "order_history": self.order_history})
+    
+    def compile_field_map(self, field_map: Dict[str, Any]):
+        """Compile a field mapping table into a builder for tag -> text dicts"""
+        converters = {
+            "text": None,
+            "bool": self.parse_boolean,
+            "float": self.parse_float,
+            "date": self.parse_date
+        }
+        
+        fields = []
+        for key, spec in field_map.items():
+            if isinstance(spec, dict):
+                fields.append((key, self.compile_field_map(spec)))
+                continue
+            
+            tag, kind = spec
+            if tag == "list":
+                tags = kind
+                fields.append((key, lambda values, tags=tags: [
+                    value for value in (values.get(t, "") for t in tags) if value
+                ]))
+            elif converters[kind] is None:
+                fields.append((key, lambda values, tag=tag: values.get(tag, "")))
+            else:
+                convert = converters[kind]
+                fields.append((key, lambda values, tag=tag, convert=convert: convert(values.get(tag, ""))))
+        
+        def build(values: Dict[str, str]) -> Dict[str, Any]:
+            return {key: field(values) for key, field in fields}
+        
+        return build
+    
+    def parse_client_file(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Parse a single address XML file into a client record"""
+        try:
+            tree = ET.parse(file_path)
+            root = tree.getroot()
+            
+            address_elem = root.find("Adresse")
+            if address_elem is None:
+                return None
+            
+            values = collect_child_values(address_elem)
+            if not values.get("AdrNr"):
+                return None
+            
+            client_data = self.build_client(values)
+            
+            # Extract additional addresses if present
+            client_data["additional_addresses"] = []
+            anschriften_liste = address_elem.find("AnschriftenListe")
+            if anschriften_liste is not None:
+                for anschrift in anschriften_liste.findall("Anschriften"):
+                    client_data["additional_addresses"].append(
+                        self.build_additional_address(collect_child_values(anschrift))
+                    )
+            
+            return client_data
+            
+        except ET.ParseError as e:
+            print(f"Error parsing {file_path}: {e}")
+        except Exception as e:
+            print(f"Unexpected error processing {file_path}: {e}")
+        
+        return None
+    
+    def load_clients(self):
+        """Load all client data from address XML files"""
+        print("Loading client data...")
+        address_files = glob.glob(str(self.susko_path / "Adressen" / "*.XML"))
+        
+        for file_path, client_data in self.cached_parse_files("clients", "parse_client_file", address_files):
+            if client_data is None:
+                continue
+            client_number = client_data["client_number"]
+            self.clients[client_number] = client_data
+            self.client_sources[client_number] = file_path
+        
+        print(f"Loaded {len(self.clients)} clients")
+    
+    def parse_product_file(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Parse a single article XML file into a product record"""
+        try:
+            tree = ET.parse(file_path)
+            root = tree.getroot()
+            
+            article_elem = root.find("Artikel")
+            if article_elem is None:
+                return None
+            
+            values = collect_child_values(article_elem)
+            if not values.get("ArtNr"):
+                return None
+            
+            return self.build_product(values)
+            
+        except ET.ParseError as e:
+            print(f"Error parsing {file_path}: {e}")
+        except Exception as e:
+            print(f"Unexpected error processing {file_path}: {e}")
+        
+        return None
+    
+    def load_products(self):
+        """Load all product data from article XML files"""
+        print("Loading product data...")
+        article_files = glob.glob(str(self.susko_path / "Artikel" / "*.xml"))
+        
+        for file_path, product_data in self.cached_parse_files("products", "parse_product_file", article_files):
+            if product_data is None:
+                continue
+            self.products[product_data["article_number"]] = product_data
+            self.product_sources[product_data["article_number"]] = file_path
+        
+        print(f"Loaded {len(self.products)} products")
+    
+    def iter_history_records(self, history_file: Path):
+        """Stream <History> rows from the history export as tag -> text dicts.
+
+        Uses iterparse and clears every row once it has been read, so only the
+        current row is held in memory regardless of the size of the export.
+        """
+        context = ET.iterparse(str(history_file), events=("start", "end"))
+        _, root = next(context)
+
+        for event, elem in context:
+            if event != "end" or elem.tag != "History":
+                continue
+
+            yield collect_child_values(elem)
+
+            # Drop the processed row from the partially built tree
+            elem.clear()
+            root.clear()
+
+    def iter_orders(self, history_file: Path) -> Iterable[Tuple[str, Dict[str, Any]]]:
+        """Yield (client_number, order) for every usable row of the history export"""
+        # Local bindings keep attribute lookups out of the per-row loop
+        parse_date = self.parse_date
+        parse_float = self.parse_float
+        intern = sys.intern
+        
+        for record in self.iter_history_records(history_file):
+            # Extract order information
+            client_number = record.get("AdrNr")
+            article_number = record.get("ArtNr")
+            
+            if not client_number or not article_number:
+                continue
+            
+            yield client_number, {
+                "article_number": intern(article_number),
+                "date": parse_date(record.get("Dat", "")),
+                "booking_quantity": parse_float(record.get("BuchMge", "")),
+                "quantity": parse_float(record.get("Mge", "")),
+                "unit": intern(record.get("Einh", ""))
+            }
+    
+    def load_order_history(self, sort: bool = True):
+        """Load order history and organize by client
+
+        Pass sort=False to defer sort_order_history, e.g. to time it separately.
+        """
+        print("Loading order history...")
+        history_file = self.susko_path / "History" / "AdresseHistory-Komplett.xml"
+        
+        if not history_file.exists():
+            print(f"History file not found: {history_file}")
+            return
+        
+        order_history = self.order_history
+        intern = sys.intern
+        
+        try:
+            for client_number, order_data in self.iter_orders(history_file):
+                # Group rows per client as they stream in
+                client_orders = order_history.get(client_number)
+                if client_orders is None:
+                    client_orders = order_history[intern(client_number)] = []
+                
+                client_orders.append(order_data)
+                
+        except ET.ParseError as e:
+            print(f"Error parsing history file: {e}")
+        except Exception as e:
+            print(f"Unexpected error processing history file: {e}")
+        
+        if sort:
+            self.sort_order_history()
+        
+        print(f"Loaded order history for {len(self.order_history)} clients")
+    
+    def sort_order_history(self):
+        """Sort order history by date for each client, most recent first"""
+        for client_number in self.order_history:
+            self.order_history[client_number].sort(
+                key=lambda x: x["date"] or "1900-01-01", 
+                reverse=True
+            )
+    
+    def history_partition(self, key: str) -> int:
+        """Return the spill partition of a client or article number"""
+        return zlib.crc32(key.encode("utf-8")) % self.history_partitions
+    
+    def spill_order_history(self, spill_path: Path) -> int:
+        """Stream the history export into partitioned spill files.
+
+        Every row goes to clients-<n>.pickle for its client's partition and,
+        reduced to (article, date, quantity), to articles-<n>.pickle for its
+        article's partition, as pickled batches of tuples. Only the set of
+        articles each client ordered is kept in memory (client_articles).
+        Returns the number of rows spilled.
+        """
+        print(f"Spilling order history to {self.history_partitions} partitions...")
+        self.spill_path = spill_path
+        history_file = self.susko_path / "History" / "AdresseHistory-Komplett.xml"
+        
+        if not history_file.exists():
+            print(f"History file not found: {history_file}")
+            return 0
+        
+        partitions = range(self.history_partitions)
+        client_batches = [[] for _ in partitions]
+        article_batches = [[] for _ in partitions]
+        client_articles = self.client_articles
+        history_partition = self.history_partition
+        intern = sys.intern
+        rows = 0
+        
+        def spill(files, batches, partition):
+            pickle.dump(batches[partition], files[partition], pickle.HIGHEST_PROTOCOL)
+            batches[partition] = []
+        
+        # Failed spill writes (OSError) propagate and abort the conversion
+        with ExitStack() as stack:
+            client_files = [stack.enter_context(open(spill_path / f"clients-{n}.pickle", "wb")) for n in partitions]
+            article_files = [stack.enter_context(open(spill_path / f"articles-{n}.pickle", "wb")) for n in partitions]
+            
+            try:
+                for client_number, order in self.iter_orders(history_file):
+                    article_number = order["article_number"]
+                    articles = client_articles.get(client_number)
+                    if articles is None:
+                        articles = client_articles[intern(client_number)] = set()
+                    articles.add(article_number)
+                    
+                    partition = history_partition(client_number)
+                    batch = client_batches[partition]
+                    batch.append((client_number, article_number, order["date"], order["booking_quantity"],
+                                  order["quantity"], order["unit"]))
+                    if len(batch) >= SPILL_BATCH_ROWS:
+                        spill(client_files, client_batches, partition)
+                    
+                    partition = history_partition(article_number)
+                    batch = article_batches[partition]
+                    batch.append((article_number, order["date"], order["quantity"]))
+                    if len(batch) >= SPILL_BATCH_ROWS:
+                        spill(article_files, article_batches, partition)
+                    rows += 1
+            
+            except ET.ParseError as e:
+                # Like load_order_history, keep the rows read before the error
+                print(f"Error parsing history file: {e}")
+            
+            for partition in partitions:
+                if client_batches[partition]:
+                    spill(client_files, client_batches, partition)
+                if article_batches[partition]:
+                    spill(article_files, article_batches, partition)
+        
+        print(f"Spilled {rows} order rows for {len(client_articles)} clients")
+        return rows
+    
+    def read_spill_file(self, file_path: Path) -> Iterable[tuple]:
+        """Yield the rows of a spill file, batch by batch"""
+        if not file_path.exists():
+            return
+        with open(file_path, "rb") as f:
+            while True:
+                try:
+                    batch = pickle.load(f)
+                except EOFError:
+                    return
+                yield from batch
+    
+    def load_history_partition(self, partition: int):
+        """Replace order_history with the sorted orders of one client partition"""
+        intern = sys.intern
+        order_history = {}
+        
+        for client_number, article_number, order_date, booking_quantity, quantity, unit in \
+                self.read_spill_file(self.spill_path / f"clients-{partition}.pickle"):
+            client_orders = order_history.get(client_number)
+            if client_orders is None:
+                client_orders = order_history[intern(client_number)] = []
+            client_orders.append({
+                "article_number": intern(article_number),
+                "date": order_date,
+                "booking_quantity": booking_quantity,
+                "quantity": quantity,
+                "unit": intern(unit)
+            })
+        
+        self.order_history = order_history
+        self.sort_order_history()
+    
+    def build_article_index(self):
+        """Map every article number to the set of clients that ever ordered it
+
+        The per-client article sets come from order_history, or were
+        collected by spill_order_history when the history is partitioned.
+        """
+        if not self.history_partitions:
+            self.client_articles = {
+                client_number: set(order["article_number"] for order in orders)
+                for client_number, orders in self.order_history.items()
+            }
+        
+        article_clients = defaultdict(set)
+        for client_number, articles in self.client_articles.items():
+            for article_number in articles:
+                article_clients[article_number].add(client_number)
+        self.article_clients = dict(article_clients)
+    
+    def aggregate_rows(self, rows: Iterable[Tuple[Tuple[str, ...], Optional[str], Optional[float]]],
+                       dimensions: int) -> Tuple[List[Dict[str, Dict[str, Any]]], int]:
+        """Roll (keys, date, quantity) rows up per key with aggregate_orders.
+
+        Each row carries one key per dimension, e.g. (client, article). One
+        pass copies the rows into array-backed columns (key per dimension,
+        day ordinal, month, quantity). Rows without a valid date are left
+        out. Returns the aggregates of each dimension and the rows counted.
+        """
+        key_maps = [{} for _ in range(dimensions)]
+        key_columns = [array.array("i") for _ in range(dimensions)]
+        days = array.array("i")
+        months = array.array("i")
+        quantities = array.array("d")
+        date_keys = {}
+        
+        for keys, order_date, quantity in rows:
+            if order_date not in date_keys:
+                try:
+                    parsed = date.fromisoformat(order_date)
+                    date_keys[order_date] = (parsed.toordinal(), parsed.year * 12 + parsed.month - 1)
+                except (TypeError, ValueError):
+                    date_keys[order_date] = None
+            date_key = date_keys[order_date]
+            if date_key is None:
+                continue
+            
+            for key, key_map, key_column in zip(keys, key_maps, key_columns):
+                index = key_map.get(key)
+                if index is None:
+                    index = key_map[key] = len(key_map)
+                key_column.append(index)
+            days.append(date_key[0])
+            months.append(date_key[1])
+            quantities.append(quantity or 0.0)
+        
+        aggregates = []
+        for key_map, key_column in zip(key_maps, key_columns):
+            key_aggregates = aggregate_orders(key_column, len(key_map), days, months, quantities, self.as_of)
+            aggregates.append({key: aggregate for key, aggregate in zip(key_map, key_aggregates) if aggregate})
+        return aggregates, len(days)
+    
+    def build_order_aggregates(self):
+        """Roll the order history up per client and per article.
+
+        With a partitioned history only the article aggregates are built
+        here, one article partition at a time; client aggregates follow
+        each client partition in process_history_partitions.
+        """
+        if self.history_partitions:
+            self.article_aggregates = {}
+            rows = 0
+            for partition in range(self.history_partitions):
+                (article_aggregates,), partition_rows = self.aggregate_rows(
+                    (((article_number,), order_date, quantity) for article_number, order_date, quantity in
+                     self.read_spill_file(self.spill_path / f"articles-{partition}.pickle")), 1)
+                self.article_aggregates.update(article_aggregates)
+                rows += partition_rows
+            return rows
+        
+        (self.client_aggregates, self.article_aggregates), rows = self.aggregate_rows(
+            (((client_number, order["article_number"]), order["date"], order["quantity"])
+             for client_number, orders in self.order_history.items() for order in orders), 2)
+        return rows
+    
+    def create_article_index_file(self):
+        """Write article_clients.json so the API can look up who buys a product"""
+        index = {
+            "metadata": {
+                "generated_at": datetime.now().isoformat(),
+                "total_articles": len(self.article_clients),
+                "total_clients": len(self.client_articles),
+                "data_source": "BotanBot XML Export"
+            },
+            "articles": {
+                article_number: sorted(self.article_clients[article_number])
+                for article_number in sorted(self.article_clients)
+            }
+        }
+        self.write_json_file(self.base_path / ARTICLE_INDEX_FILE, index, pretty=False)
+        print(f"Created {ARTICLE_INDEX_FILE} with {len(self.article_clients)} articles")
+    
+    def create_product_aggregates_file(self):
+        """Write product_aggregates.json: order_aggregates per article number.
+
+        Kept apart from products.json so the product catalogue stays small
+        and only this file changes when the trailing windows roll over.
+        """
+        aggregates = {
+            "metadata": {
+                "generated_at": datetime.now().isoformat(),
+                "total_articles": len(self.article_aggregates),
+                "aggregates_as_of": self.as_of.isoformat(),
+                "data_source": "BotanBot XML Export"
+            },
+            "articles": {
+                article_number: self.article_aggregates[article_number]
+                for article_number in sorted(self.article_aggregates)
+            }
+        }
+        written = self.write_json_file(self.base_path / PRODUCT_AGGREGATES_FILE, aggregates, pretty=False)
+        self.products_file_sizes["aggregates_bytes"] = written
+        print(f"Created {PRODUCT_AGGREGATES_FILE} with {len(self.article_aggregates)} articles")
+    
+    def article_info(self, article_number: str) -> Optional[Dict[str, Any]]:
+        """Return the product fields embedded into a client's order rows"""
+        article_info = self.products.get(article_number)
+        if not article_info:
+            return None
+        return {
+            "short_description": article_info["short_description"],
+            "long_description": article_info["long_description"],
+            "product_group": article_info["product_group"]["description"],
+            "unit": article_info["unit"]
+        }
+    
+    def write_json_file(self, file_path: Path, data: Any, pretty: Optional[bool] = None) -> int:
+        """Serialize data and atomically replace file_path with it.
+
+        The JSON is written to a temporary file in the same directory and
+        renamed over the target, so readers never see a half-written file.
+        Returns the number of bytes written.
+        """
+        return self.write_bytes_file(file_path, self.encode_json(data, pretty))
+    
+    def encode_json(self, data: Any, pretty: Optional[bool] = None) -> bytes:
+        """Serialize data to UTF-8 JSON, compact unless pretty output is requested"""
+        if pretty is None:
+            pretty = self.pretty
+        return encode_data(data, "json", pretty)
+    
+    def encode_output(self, data: Any, pretty: Optional[bool] = None) -> bytes:
+        """Serialize a client file or the products file with the chosen serializer"""
+        if pretty is None:
+            pretty = self.pretty
+        return encode_data(data, self.serializer, pretty)
+    
+    def remove_superseded_outputs(self):
+        """Delete the client and products files of another serializer's extension.
+
+        Switching between json and msgpack would otherwise leave the previous
+        files behind, and readers of that format would serve stale data.
+        """
+        removed = 0
+        for extension in set(SERIALIZER_EXTENSIONS.values()) - {self.output_extension}:
+            file_paths = [self.base_path / f"products{extension}"]
+            file_paths += [self.data_path / f"{client_number}{extension}" for client_number in self.clients]
+            for file_path in file_paths:
+                if file_path.exists():
+                    file_path.unlink()
+                    removed += 1
+        if removed:
+            print(f"Removed {removed} files written by a previous serializer")
+    
+    def client_file_name(self, client_number: str) -> str:
+        """File name of a client below data/, e.g. 10001.json or 10001.msgpack"""
+        return f"{client_number}{self.output_extension}"
+    
+    def write_bytes_file(self, file_path: Path, payload: bytes) -> int:
+        """Atomically replace file_path with payload via a temp file and rename"""
+        fd, temp_path = tempfile.mkstemp(dir=str(file_path.parent), prefix=f".{file_path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.chmod(temp_path, self.file_mode)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        
+        with self.output_lock:
+            self.output_stats["files"] += 1
+            self.output_stats["bytes"] += len(payload)
+        
+        return len(payload)
+    
+    def build_recommendation_model(self):
+        """Derive product group co-occurrence and article popularity from the history.
+
+        For every product group the model keeps the AI_GROUP_NEIGHBOURS groups
+        most often bought by the same clients, as P(group | neighbour), and
+        the group's orderable articles ranked by how many clients bought them.
+        """
+        print("Building recommendation model...")
+        article_clients = Counter()
+        group_clients = Counter()
+        co_occurrence = defaultdict(Counter)
+        
+        for articles in self.client_articles.values():
+            article_clients.update(articles)
+            
+            groups = set()
+            for article_number in articles:
+                product = self.products.get(article_number)
+                if product and product["product_group"]["number"]:
+                    groups.add(product["product_group"]["number"])
+            
+            group_clients.update(groups)
+            for group in groups:
+                co_occurrence[group].update(groups)
+        
+        # Counters filled from sets tie in hash order; rank ties by group number
+        # so recommendations (and the fingerprints hashing them) are reproducible
+        neighbours = {}
+        for group, counts in co_occurrence.items():
+            ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+            neighbours[group] = [
+                (other, count / group_clients[group])
+                for other, count in ranked[:AI_GROUP_NEIGHBOURS]
+            ]
+        
+        group_articles = defaultdict(list)
+        for article_number, product in self.products.items():
+            group = product["product_group"]["number"]
+            if group and not product["attributes"]["is_blocked"] and article_clients[article_number]:
+                group_articles[group].append(article_number)
+        for group, articles in group_articles.items():
+            articles.sort(key=lambda number: (-article_clients[number], number))
+        
+        popular_articles = sorted(
+            (number for articles in group_articles.values() for number in articles),
+            key=lambda number: (-article_clients[number], number)
+        )
+        
+        self.recommendation_model = {
+            "article_clients": article_clients,
+            "group_clients": group_clients,
+            "neighbours": neighbours,
+            "group_articles": group_articles,
+            "popular_articles": popular_articles[:AI_RECOMMENDATIONS],
+            "total_clients": max(len(self.client_articles), 1)
+        }
+    
+    def recommend_articles(self, client_number: str) -> List[Dict[str, Any]]:
+        """Rank articles the client has never ordered by group co-occurrence.
+
+        A group scores the sum of P(group | g) over the client's groups g,
+        weighted by the client's share of orders in g; an article scores its
+        group's score times the share of that group's buyers who ordered it.
+        Clients without history get the most popular articles.
+        """
+        cached = self.client_recommendations.get(client_number)
+        if cached is not None:
+            return cached
+        
+        if self.recommendation_model is None:
+            self.build_recommendation_model()
+        model = self.recommendation_model
+        
+        orders = self.order_history.get(client_number, [])
+        ordered_articles = set()
+        group_orders = Counter()
+        for order in orders:
+            ordered_articles.add(order["article_number"])
+            product = self.products.get(order["article_number"])
+            if product and product["product_group"]["number"]:
+                group_orders[product["product_group"]["number"]] += 1
+        
+        scored = []
+        if group_orders:
+            total = sum(group_orders.values())
+            group_scores = Counter()
+            for group, count in group_orders.items():
+                weight = count / total
+                for other, probability in model["neighbours"].get(group, []):
+                    group_scores[other] += weight * probability
+            
+            ranked_groups = sorted(group_scores.items(), key=lambda item: (-item[1], item[0]))
+            for group, group_score in ranked_groups[:AI_CANDIDATE_GROUPS]:
+                buyers = model["group_clients"][group]
+                taken = 0
+                for article_number in model["group_articles"].get(group, []):
+                    if article_number in ordered_articles:
+                        continue
+                    score = group_score * model["article_clients"][article_number] / buyers
+                    scored.append((round(score, 4), article_number))
+                    taken += 1
+                    if taken >= AI_RECOMMENDATIONS:
+                        break
+        else:
+            for article_number in model["popular_articles"]:
+                score = model["article_clients"][article_number] / model["total_clients"]
+                scored.append((round(score, 4), article_number))
+        
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        recommendations = []
+        for score, article_number in scored[:AI_RECOMMENDATIONS]:
+            product = self.products[article_number]
+            recommendations.append({
+                "article_number": article_number,
+                "short_description": product["short_description"],
+                "product_group": product["product_group"]["description"],
+                "score": score
+            })
+        
+        self.client_recommendations[client_number] = recommendations
+        return recommendations
+    
+    def build_ai_context(self, client_number: str, orders: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Precompute the compact per-client projection used on voice calls.
+
+        Holds order frequency, total quantity and last order date per
+        article, the most frequently ordered articles and the ranked
+        recommendation candidates, so the API can answer without scanning
+        the order history or products.json.
+        """
+        article_frequency = {}
+        # Orders are sorted newest first, so the first row per article is the latest
+        for order in orders:
+            entry = article_frequency.get(order["article_number"])
+            if entry is None:
+                article_frequency[order["article_number"]] = {
+                    "orders": 1,
+                    "quantity": order["quantity"] or 0,
+                    "last_ordered": order["date"]
+                }
+            else:
+                entry["orders"] += 1
+                entry["quantity"] += order["quantity"] or 0
+        
+        for entry in article_frequency.values():
+            entry["quantity"] = round(entry["quantity"], 3)
+        
+        top_articles = []
+        ranked = sorted(article_frequency.items(), key=lambda item: (-item[1]["orders"], item[0]))
+        for article_number, entry in ranked[:AI_TOP_ARTICLES]:
+            article_info = self.article_info(article_number) or {}
+            top_articles.append({
+                "article_number": article_number,
+                "short_description": article_info.get("short_description", ""),
+                "product_group": article_info.get("product_group", ""),
+                "orders": entry["orders"],
+                "last_ordered": entry["last_ordered"]
+            })
+        
+        return {
+            "article_frequency": article_frequency,
+            "top_articles": top_articles,
+            "recommendations": self.recommend_articles(client_number)
+        }
+    
+    def enrich_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Copy order rows and embed the product information of each article"""
+        enriched_orders = []
+        for order in orders:
+            enriched_order = order.copy()
+            article_info = self.article_info(order["article_number"])
+            if article_info:
+                enriched_order["article_info"] = article_info
+            enriched_orders.append(enriched_order)
+        return enriched_orders
+    
+    def layout_order_history(self, orders: List[Dict[str, Any]]) -> Tuple[Any, Optional[Dict[str, Any]]]:
+        """Shape a client's order rows according to history_layout.
+
+        embedded: rows carry a copy of article_info (original layout)
+        interned: rows carry only article_number; product information is
+                  stored once per article in the returned articles dict
+        columnar: like interned, but the rows become one array per column
+
+        Returns (order_history, articles); articles is None when embedded.
+        """
+        if self.history_layout == "embedded":
+            return self.enrich_orders(orders), None
+        
+        articles = {}
+        for order in orders:
+            article_number = order["article_number"]
+            if article_number not in articles:
+                article_info = self.article_info(article_number)
+                if article_info:
+                    articles[article_number] = article_info
+        
+        if self.history_layout == "columnar":
+            return {column: [order[column] for order in orders] for column in HISTORY_COLUMNS}, articles
+        return orders, articles
+    
+    def build_client_file_data(self, client_number: str) -> Dict[str, Any]:
+        """Assemble the client file contents: profile, statistics and order history"""
+        client_data = self.clients[client_number]
+        
+        # Get order history for this client
+        orders = self.order_history.get(client_number, [])
+        
+        # Calculate order statistics
+        total_orders = len(orders)
+        unique_articles = len(set(order["article_number"] for order in orders))
+        recent_orders = [order for order in orders if order["date"] and order["date"] >= "2025-01-01"]
+        
+        # Create comprehensive client file
+        client_file_data = {
+            "metadata": {
+                "generated_at": datetime.now().isoformat(),
+                "client_number": client_number,
+                "data_source": "BotanBot XML Export",
+                "history_layout": self.history_layout
+            },
+            "client_profile": client_data,
+            "order_statistics": {
+                "total_orders": total_orders,
+                "unique_articles_ordered": unique_articles,
+                "recent_orders_count": len(recent_orders),
+                "last_order_date": orders[0]["date"] if orders else None
+            },
+            "order_aggregates": self.client_aggregates.get(client_number),
+            "ai_context": self.build_ai_context(client_number, orders)
+        }
+        
+        # Enrich order history with product information
+        order_history, articles = self.layout_order_history(orders)
+        if articles is not None:
+            client_file_data["articles"] = articles
+        client_file_data["order_history"] = order_history
+        
+        return client_file_data
+    
+    def write_client_file(self, client_number: str) -> int:
+        """Build and write data/{client_number}.json, returning bytes written"""
+        client_file_path = self.output_data_path / self.client_file_name(client_number)
+        
+        started = time.perf_counter()
+        client_file_data = self.build_client_file_data(client_number)
+        built = time.perf_counter()
+        payload = self.encode_output(client_file_data)
+        written = self.write_bytes_file(client_file_path, payload)
+        if self.packed:
+            self.spool_pack_record(client_number, client_file_data, payload)
+        finished = time.perf_counter()
+        
+        with self.output_lock:
+            self.thread_timings["enrich_seconds"] += built - started
+            self.thread_timings["serialize_write_seconds"] += finished - built
+        
+        return written
+    
+    def spool_pack_record(self, client_number: str, client_file_data: Dict[str, Any], payload: bytes):
+        """Keep the packed store records of a client file that was just written.
+
+        The full record goes to a temporary spool file, the hot record stays
+        in memory; create_packed_store then packs them without rebuilding.
+        """
+        if self.serializer != "json" or self.pretty:
+            payload = self.encode_json(client_file_data, pretty=False)
+        hot_payload = self.encode_json(self.build_hot_record(client_file_data), pretty=False)
+        
+        with self.output_lock:
+            if self.pack_spool is None:
+                self.pack_spool = tempfile.TemporaryFile(dir=str(self.base_path))
+            offset = self.pack_spool.seek(0, os.SEEK_END)
+            self.pack_spool.write(payload)
+            self.pack_records[client_number] = (offset, len(payload), hot_payload)
+    
+    def create_client_files(self, client_numbers: Optional[Iterable[str]] = None,
+                            on_written: Optional[Callable[[List[str]], None]] = None) -> List[str]:
+        """Create individual JSON files for each client
+
+        When client_numbers is given only those clients are regenerated.
+        Files are built and written on a thread pool. Returns the client
+        numbers whose files were written; on_written, if given, receives
+        them in batches of CHECKPOINT_BATCH as they complete.
+        """
+        print("Creating client JSON files...")
+        
+        if client_numbers is None:
+            client_numbers = list(self.clients)
+        
+        written_clients = []
+        with ThreadPoolExecutor(max_workers=self.write_threads) as executor:
+            futures = [
+                (client_number, executor.submit(self.write_client_file, client_number))
+                for client_number in client_numbers
+            ]
+            batch = []
+            for client_number, future in futures:
+                try:
+                    future.result()
+                    written_clients.append(client_number)
+                    batch.append(client_number)
+                except Exception as e:
+                    print(f"Error creating file for client {client_number}: {e}")
+                if on_written and len(batch) >= CHECKPOINT_BATCH:
+                    on_written(batch)
+                    batch = []
+            if on_written and batch:
+                on_written(batch)
+        
+        print(f"Created {len(written_clients)} client JSON files")
+        return written_clients
+
+    def process_history_partitions(self) -> Tuple[List[str], int]:
+        """Fingerprint and write the client files one history partition at a time.
+
+        Each partition's orders are loaded from the spill files, sorted per
+        client and rolled up, then the partition's clients are fingerprinted
+        and the changed ones written before the next partition replaces it.
+        Returns the written client numbers and the number of changed clients.
+        """
+        partition_clients = defaultdict(list)
+        for client_number in self.clients:
+            partition_clients[self.history_partition(client_number)].append(client_number)
+
+        written_clients = []
+        changed_count = 0
+        for partition in range(self.history_partitions):
+            self.load_history_partition(partition)
+            (self.client_aggregates,), _ = self.aggregate_rows(
+                (((client_number,), order["date"], order["quantity"])
+                 for client_number, orders in self.order_history.items() for order in orders), 1)
+
+            changed_clients = self.find_changed_clients(partition_clients[partition])
+            changed_count += len(changed_clients)
+            written_clients += self.create_client_files(changed_clients)
+
+        self.order_history = {}
+        self.client_aggregates = {}
+        return written_clients, changed_count
+
+    def build_hot_record(self, client_file_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce a client file to what a voice-call lookup needs.
+
+        Recent orders always embed article_info, whatever the history layout.
+        """
+        client_number = client_file_data["metadata"]["client_number"]
+        recent_orders = self.order_history.get(client_number, [])[:HOT_RECENT_ORDERS]
+        return {
+            "client_profile": client_file_data["client_profile"],
+            "order_statistics": client_file_data["order_statistics"],
+            "order_aggregates": client_file_data["order_aggregates"],
+            "ai_context": {
+                "top_articles": client_file_data["ai_context"]["top_articles"],
+                "recommendations": client_file_data["ai_context"]["recommendations"]
+            },
+            "recent_orders": self.enrich_orders(recent_orders)
+        }
+    
+    def create_packed_store(self):
+        """Create clients.pack, a single file holding every client record.
+
+        Layout (all integers big-endian):
+            PACK_MAGIC
+            hot section:  one record per client (profile, stats, recent orders)
+            full section: one record per client (complete client file)
+            index:        JSON {client_number: [hot_off, hot_len, full_off, full_len]}
+                          plus the fingerprint digest every record was built from
+            footer:       uint64 index offset, uint32 index length, PACK_MAGIC
+
+        Every record is a uint32 length followed by the JSON payload; index
+        offsets point at the payload, so a lookup is a single slice read.
+
+        Records of the clients written in this run come from the write phase
+        (see spool_pack_record); the others are copied from the previous
+        pack when their fingerprint is unchanged, and only built otherwise.
+        Returns how many records came from each of those sources.
+        """
+        print("Creating packed client store...")
+        pack_path = self.base_path / PACKED_STORE_FILE
         
-        for file_path in address_files:
+        previous_store = None
+        if pack_path.exists():
             try:
-                tree = ET.parse(file_path)
-                root = tree.getroot()
-                
-                address_elem = root.find("Adresse")
-                if address_elem is None:
-                    continue
-                
-                # Extract client number
-                adr_nr_elem = address_elem.find("AdrNr")
-                if adr_nr_elem is None:
-                    continue
-                
-                client_number = self.extract_cdata_value(adr_nr_elem)
-                if not client_number:
-                    continue
-                
-                # Extract client information
-                client_data = {
-                    "client_number": client_number,
-                    "search_term": self.extract_cdata_value(address_elem.find("SuchBeg")),
-                    "status": self.extract_cdata_value(address_elem.find("Status")),
-                    "tax_number": self.extract_cdata_value(address_elem.find("SteuNr")),
-                    "vat_id": self.extract_cdata_value(address_elem.find("UStId")),
-                    "is_blocked": self.parse_boolean(self.extract_cdata_value(address_elem.find("GspKz"))),
-                    "price_group": self.extract_cdata_value(address_elem.find("ArtPrGrp")),
-                    "billing_address": {
-                        "salutation": self.extract_cdata_value(address_elem.find("Re_Na1")),
-                        "name": self.extract_cdata_value(address_elem.find("Re_Na2")),
-                        "name3": self.extract_cdata_value(address_elem.find("Re_Na3")),
-                        "street": self.extract_cdata_value(address_elem.find("Re_Str")),
-                        "city": self.extract_cdata_value(address_elem.find("Re_Ort")),
-                        "postal_code": self.extract_cdata_value(address_elem.find("Re_Plz")),
-                        "country": self.extract_cdata_value(address_elem.find("Re_Land")),
-                        "phone": self.extract_cdata_value(address_elem.find("Re_Tel")),
-                        "fax": self.extract_cdata_value(address_elem.find("Re_Fax")),
-                        "email": self.extract_cdata_value(address_elem.find("Re_Email1"))
-                    },
-                    "delivery_address": {
-                        "salutation": self.extract_cdata_value(address_elem.find("Li_Na1")),
-                        "name": self.extract_cdata_value(address_elem.find("Li_Na2")),
-                        "name3": self.extract_cdata_value(address_elem.find("Li_Na3")),
-                        "street": self.extract_cdata_value(address_elem.find("Li_Str")),
-                        "city": self.extract_cdata_value(address_elem.find("Li_Ort")),
-                        "postal_code": self.extract_cdata_value(address_elem.find("Li_Plz")),
-                        "country": self.extract_cdata_value(address_elem.find("Li_Land")),
-                        "phone": self.extract_cdata_value(address_elem.find("Li_Tel")),
-                        "fax": self.extract_cdata_value(address_elem.find("Li_Fax")),
-                        "email": self.extract_cdata_value(address_elem.find("Li_Email1"))
-                    },
-                    "delivery_schedule": {
-                        "monday": self.extract_cdata_value(address_elem.find("Sel12")),
-                        "tuesday": self.extract_cdata_value(address_elem.find("Sel13")),
-                        "wednesday": self.extract_cdata_value(address_elem.find("Sel14")),
-                        "thursday": self.extract_cdata_value(address_elem.find("Sel15")),
-                        "friday": self.extract_cdata_value(address_elem.find("Sel16")),
-                        "saturday": self.extract_cdata_value(address_elem.find("Sel17"))
-                    },
-                    "settings": {
-                        "webshop_enabled": self.parse_boolean(self.extract_cdata_value(address_elem.find("Sel70"))),
-                        "ds_addresses": self.parse_boolean(self.extract_cdata_value(address_elem.find("Sel29"))),
-                        "no_pickup_app": self.parse_boolean(self.extract_cdata_value(address_elem.find("Sel91"))),
-                        "minimum_order_value": self.parse_float(self.extract_cdata_value(address_elem.find("Sel94"))),
-                        "articles_not_in_history": self.extract_cdata_value(address_elem.find("Sel18"))
-                    },
-                    "additional_addresses": []
-                }
+                previous_store = PackedClientStore(str(pack_path))
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable {PACKED_STORE_FILE}: {e}")
+        previous_fingerprints = previous_store.index.get("fingerprints", {}) if previous_store else {}
+        
+        hot_records = []
+        full_offsets = {}
+        fingerprints = {}
+        counts = {"spooled": 0, "carried": 0, "built": 0}
+        try:
+            with tempfile.TemporaryFile(dir=str(self.base_path)) as full_section:
+                for client_number in self.clients:
+                    fingerprint = self.hash_data([self.output_options(), self.client_fingerprints.get(client_number)])
+                    record = self.pack_records.get(client_number)
+                    if record is not None:
+                        offset, length, hot_payload = record
+                        self.pack_spool.seek(offset)
+                        payload = self.pack_spool.read(length)
+                        counts["spooled"] += 1
+                    elif (previous_store is not None and client_number in previous_store
+                          and previous_fingerprints.get(client_number) == fingerprint):
+                        hot_payload, payload = previous_store.get_raw(client_number)
+                        counts["carried"] += 1
+                    else:
+                        try:
+                            client_file_data = self.build_client_file_data(client_number)
+                        except Exception as e:
+                            print(f"Error packing client {client_number}: {e}")
+                            continue
+                        payload = self.encode_json(client_file_data, pretty=False)
+                        hot_payload = self.encode_json(self.build_hot_record(client_file_data), pretty=False)
+                        counts["built"] += 1
+                    
+                    full_section.write(struct.pack(">I", len(payload)))
+                    full_offsets[client_number] = (full_section.tell(), len(payload))
+                    full_section.write(payload)
+                    hot_records.append((client_number, hot_payload))
+                    fingerprints[client_number] = fingerprint
                 
-                # Extract additional addresses if present
-                anschriften_liste = address_elem.find("AnschriftenListe")
-                if anschriften_liste is not None:
-                    for anschrift in anschriften_liste.findall("Anschriften"):
-                        addr_data = {
-                            "address_number": self.extract_cdata_value(anschrift.find("AnsNr")),
-                            "salutation": self.extract_cdata_value(anschrift.find("Na1")),
-                            "name": self.extract_cdata_value(anschrift.find("Na2")),
-                            "name3": self.extract_cdata_value(anschrift.find("Na3")),
-                            "street": self.extract_cdata_value(anschrift.find("Str")),
-                            "city": self.extract_cdata_value(anschrift.find("Ort")),
-                            "postal_code": self.extract_cdata_value(anschrift.find("Plz")),
-                            "country": self.extract_cdata_value(anschrift.find("Land")),
-                            "phone": self.extract_cdata_value(anschrift.find("Tel")),
-                            "fax": self.extract_cdata_value(anschrift.find("Fax")),
-                            "email": self.extract_cdata_value(anschrift.find("Email1")),
-                            "is_default_billing": self.parse_boolean(self.extract_cdata_value(anschrift.find("StdReKz"))),
-                            "is_default_delivery": self.parse_boolean(self.extract_cdata_value(anschrift.find("StdLiKz")))
+                fd, temp_path = tempfile.mkstemp(dir=str(self.base_path), prefix=f".{pack_path.name}.", suffix=".tmp")
+                try:
+                    with os.fdopen(fd, 'wb') as pack:
+                        pack.write(PACK_MAGIC)
+                        
+                        hot_offsets = {}
+                        hot_start = pack.tell()
+                        for client_number, payload in hot_records:
+                            pack.write(struct.pack(">I", len(payload)))
+                            hot_offsets[client_number] = (pack.tell(), len(payload))
+                            pack.write(payload)
+                        hot_end = pack.tell()
+                        
+                        full_section.seek(0)
+                        shutil.copyfileobj(full_section, pack)
+                        
+                        index = {
+                            "version": PACK_VERSION,
+                            "generated_at": datetime.now().isoformat(),
+                            "hot_section": [hot_start, hot_end - hot_start],
+                            "full_section": [hot_end, pack.tell() - hot_end],
+                            "clients": {
+                                client_number: [
+                                    hot_offsets[client_number][0], hot_offsets[client_number][1],
+                                    hot_end + full_offsets[client_number][0], full_offsets[client_number][1]
+                                ]
+                                for client_number in hot_offsets
+                            },
+                            "fingerprints": fingerprints
                         }
-                        client_data["additional_addresses"].append(addr_data)
-                
-                self.clients[client_number] = client_data
-                
-            except ET.ParseError as e:
-                print(f"Error parsing {file_path}: {e}")
-            except Exception as e:
-                print(f"Unexpected error processing {file_path}: {e}")
+                        index_payload = self.encode_json(index, pretty=False)
+                        index_offset = pack.tell()
+                        pack.write(index_payload)
+                        pack.write(struct.pack(">QI", index_offset, len(index_payload)) + PACK_MAGIC)
+                        pack_size = pack.tell()
+                    
+                    os.chmod(temp_path, self.file_mode)
+                    os.replace(temp_path, pack_path)
+                except BaseException:
+                    if os.path.exists(temp_path):
+                        os.unlink(temp_path)
+                    raise
+        finally:
+            if previous_store is not None:
+                previous_store.close()
+            if self.pack_spool is not None:
+                self.pack_spool.close()
+            self.pack_spool = None
+            self.pack_records = {}
         
-        print(f"Loaded {len(self.clients)} clients")
+        with self.output_lock:
+            self.output_stats["files"] += 1
+            self.output_stats["bytes"] += pack_size
+        
+        print(f"Created {PACKED_STORE_FILE} with {len(hot_records)} clients ({pack_size} bytes; "
+              f"{counts['spooled']} from this run, {counts['carried']} carried over, {counts['built']} built)")
+        return counts
     
-    def load_products(self):
-        """Load all product data from article XML files"""
-        print("Loading product data...")
-        article_files = glob.glob(str(self.susko_path / "Artikel" / "*.xml"))
+    def create_sqlite_database(self):
+        """Create a normalized SQLite database of clients, products and order history.
+
+        Tables: clients, addresses, products, product_groups and
+        order_history, indexed on client_number, article_number and date.
+        Client and product columns are derived from the field mapping tables.
+        All rows are bulk-loaded with executemany in one transaction into a
+        temporary database that atomically replaces the previous one.
+        """
+        print("Creating SQLite database...")
+        database_path = self.base_path / SQLITE_DATABASE_FILE
         
-        for file_path in article_files:
-            try:
-                tree = ET.parse(file_path)
-                root = tree.getroot()
-                
-                article_elem = root.find("Artikel")
-                if article_elem is None:
-                    continue
-                
-                # Extract article number
-                art_nr_elem = article_elem.find("ArtNr")
-                if art_nr_elem is None:
-                    continue
-                
-                article_number = self.extract_cdata_value(art_nr_elem)
-                if not article_number:
-                    continue
-                
-                # Extract product information
-                product_data = {
-                    "article_number": article_number,
-                    "barcode": self.extract_cdata_value(article_elem.find("BarCd")),
-                    "short_description": self.extract_cdata_value(article_elem.find("KuBez1")),
-                    "long_description": self.extract_cdata_value(article_elem.find("KuBez6")),
-                    "weight": self.parse_float(self.extract_cdata_value(article_elem.find("Gew"))),
-                    "unit": self.extract_cdata_value(article_elem.find("Einh")),
-                    "price_quantity": self.parse_float(self.extract_cdata_value(article_elem.find("PreisMge"))),
-                    "tax_key": self.extract_cdata_value(article_elem.find("StSchl")),
-                    "product_group": {
-                        "number": self.extract_cdata_value(article_elem.find("WgrNr")),
-                        "description": self.extract_cdata_value(article_elem.find("WgrNrInfo"))
-                    },
-                    "pricing": {
-                        "vk0_net_price": self.parse_float(self.extract_cdata_value(article_elem.find("Vk0_PreisNt"))),
-                        "vk0_special_price": self.parse_float(self.extract_cdata_value(article_elem.find("Vk0_SPr"))),
-                        "vk0_special_from": self.parse_date(self.extract_cdata_value(article_elem.find("Vk0_SVonDat"))),
-                        "vk0_special_to": self.parse_date(self.extract_cdata_value(article_elem.find("Vk0_SBisDat"))),
-                        "vk4_net_price": self.parse_float(self.extract_cdata_value(article_elem.find("Vk4_PreisNt"))),
-                        "vk5_net_price": self.parse_float(self.extract_cdata_value(article_elem.find("Vk5_PreisNt")))
-                    },
-                    "delivery_time_days": self.parse_float(self.extract_cdata_value(article_elem.find("Lief_LiefZt"))),
-                    "attributes": {
-                        "has_weight": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel2"))),
-                        "is_order_article": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel3"))),
-                        "pre_order_only": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel4"))),
-                        "is_blocked": self.parse_boolean(self.extract_cdata_value(article_elem.find("GspKz"))),
-                        "webshop_enabled": self.parse_boolean(self.extract_cdata_value(article_elem.find("WShopKz"))),
-                        "frozen": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel27")))
-                    },
-                    "restaurant_categories": {
-                        "doener_imbiss": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel81"))),
-                        "wurst_imbiss": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel82"))),
-                        "cafe": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel83"))),
-                        "italiener": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel84"))),
-                        "grieche": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel85"))),
-                        "asiatische_kueche": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel86"))),
-                        "international": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel87"))),
-                        "orient": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel88"))),
-                        "balkan": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel89"))),
-                        "supermaerkte": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel90"))),
-                        "baeckerei": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel91"))),
-                        "kiosk": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel92"))),
-                        "pizza_lieferdienst": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel93"))),
-                        "burger_manufaktur": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel94"))),
-                        "bars_und_clubs": self.parse_boolean(self.extract_cdata_value(article_elem.find("Sel95")))
-                    },
-                    "images": [
-                        self.extract_cdata_value(article_elem.find("BildDatei1")),
-                        self.extract_cdata_value(article_elem.find("BildDatei2")),
-                        self.extract_cdata_value(article_elem.find("BildDatei3")),
-                        self.extract_cdata_value(article_elem.find("BildDatei4")),
-                        self.extract_cdata_value(article_elem.find("BildDatei5"))
-                    ],
-                    "packaging": {
-                        "unit_factor": self.extract_cdata_value(article_elem.find("EinhFakt")),
-                        "quantity_factor": self.extract_cdata_value(article_elem.find("MgeFakt"))
-                    }
-                }
-                
-                # Remove empty images
-                product_data["images"] = [img for img in product_data["images"] if img]
-                
-                self.products[article_number] = product_data
-                
-            except ET.ParseError as e:
-                print(f"Error parsing {file_path}: {e}")
-            except Exception as e:
-                print(f"Unexpected error processing {file_path}: {e}")
+        client_columns = [
+            column for column in flatten_field_map(CLIENT_FIELD_MAP)
+            if column[1][0] not in SQLITE_ADDRESS_KINDS
+        ]
+        product_columns = [
+            column for column in flatten_field_map(PRODUCT_FIELD_MAP)
+            if column[0] != "product_group_description"
+        ]
         
-        print(f"Loaded {len(self.products)} products")
-    
-    def load_order_history(self):
-        """Load order history and organize by client"""
-        print("Loading order history...")
-        history_file = self.susko_path / "History" / "AdresseHistory-Komplett.xml"
+        def column_definitions(columns, primary_key):
+            definitions = []
+            for name, _, kind in columns:
+                definition = f"{name} {SQLITE_COLUMN_TYPES.get(kind, 'TEXT')}"
+                if name == primary_key:
+                    definition += " PRIMARY KEY"
+                definitions.append(definition)
+            return ", ".join(definitions)
         
-        if not history_file.exists():
-            print(f"History file not found: {history_file}")
-            return
+        def column_value(record, path, kind):
+            value = record
+            for key in path:
+                value = value[key]
+            if kind == "list":
+                return json.dumps(value, ensure_ascii=False)
+            if kind == "bool":
+                return int(value)
+            return value
+        
+        def rows(records, columns):
+            for record in records:
+                yield tuple(column_value(record, path, kind) for _, path, kind in columns)
+        
+        def address_rows():
+            for client_number, client_data in self.clients.items():
+                for key, kind in SQLITE_ADDRESS_KINDS.items():
+                    address = client_data[key]
+                    yield (client_number, kind, None) + tuple(
+                        address.get(column) for column in SQLITE_ADDRESS_COLUMNS
+                    )
+                for address in client_data["additional_addresses"]:
+                    yield (client_number, "additional", address["address_number"]) + tuple(
+                        int(address[column]) if isinstance(address[column], bool) else address[column]
+                        for column in SQLITE_ADDRESS_COLUMNS
+                    )
+        
+        def order_rows():
+            for client_number, orders in self.order_history.items():
+                for order in orders:
+                    yield (client_number, order["article_number"], order["date"],
+                           order["booking_quantity"], order["quantity"], order["unit"])
+        
+        product_groups = {}
+        for product_data in self.products.values():
+            group = product_data["product_group"]
+            if group["number"] and group["number"] not in product_groups:
+                product_groups[group["number"]] = group["description"]
         
+        fd, temp_path = tempfile.mkstemp(dir=str(self.base_path), prefix=f".{database_path.name}.", suffix=".tmp")
+        os.close(fd)
         try:
-            tree = ET.parse(history_file)
-            root = tree.getroot()
-            
-            for history_elem in root.findall("History"):
-                # Extract order information
-                adr_nr_elem = history_elem.find("AdrNr")
-                art_nr_elem = history_elem.find("ArtNr")
-                
-                if adr_nr_elem is None or art_nr_elem is None:
-                    continue
-                
-                client_number = self.extract_cdata_value(adr_nr_elem)
-                article_number = self.extract_cdata_value(art_nr_elem)
-                
-                if not client_number or not article_number:
-                    continue
-                
-                order_data = {
-                    "article_number": article_number,
-                    "date": self.parse_date(self.extract_cdata_value(history_elem.find("Dat"))),
-                    "booking_quantity": self.parse_float(self.extract_cdata_value(history_elem.find("BuchMge"))),
-                    "quantity": self.parse_float(self.extract_cdata_value(history_elem.find("Mge"))),
-                    "unit": self.extract_cdata_value(history_elem.find("Einh"))
-                }
-                
-                # Initialize client history if not exists
-                if client_number not in self.order_history:
-                    self.order_history[client_number] = []
+            connection = sqlite3.connect(temp_path)
+            try:
+                connection.execute("PRAGMA journal_mode = OFF")
+                connection.execute("PRAGMA synchronous = OFF")
                 
-                self.order_history[client_number].append(order_data)
+                with connection:
+                    connection.execute(
+                        f"CREATE TABLE clients ({column_definitions(client_columns, 'client_number')})"
+                    )
+                    connection.execute(
+                        "CREATE TABLE addresses (client_number TEXT NOT NULL, kind TEXT NOT NULL, "
+                        "address_number TEXT, "
+                        + ", ".join(
+                            f"{column} {SQLITE_COLUMN_TYPES[ADDITIONAL_ADDRESS_FIELD_MAP[column][1]]}"
+                            for column in SQLITE_ADDRESS_COLUMNS
+                        ) + ")"
+                    )
+                    connection.execute("CREATE TABLE product_groups (number TEXT PRIMARY KEY, description TEXT)")
+                    connection.execute(
+                        f"CREATE TABLE products ({column_definitions(product_columns, 'article_number')})"
+                    )
+                    connection.execute(
+                        "CREATE TABLE order_history (client_number TEXT NOT NULL, article_number TEXT NOT NULL, "
+                        "date TEXT, booking_quantity REAL, quantity REAL, unit TEXT)"
+                    )
+                    
+                    def insert(table, column_names, values):
+                        placeholders = ", ".join("?" for _ in column_names)
+                        connection.executemany(
+                            f"INSERT INTO {table} ({', '.join(column_names)}) VALUES ({placeholders})", values
+                        )
+                    
+                    insert("clients", [name for name, _, _ in client_columns],
+                           rows(self.clients.values(), client_columns))
+                    insert("addresses", ["client_number", "kind", "address_number"] + SQLITE_ADDRESS_COLUMNS,
+                           address_rows())
+                    insert("product_groups", ["number", "description"], product_groups.items())
+                    insert("products", [name for name, _, _ in product_columns],
+                           rows(self.products.values(), product_columns))
+                    insert("order_history",
+                           ["client_number", "article_number", "date", "booking_quantity", "quantity", "unit"],
+                           order_rows())
+                    
+                    # Indexes are built after the bulk load, which is much cheaper
+                    # than maintaining them row by row
+                    connection.execute("CREATE INDEX idx_addresses_client ON addresses (client_number)")
+                    connection.execute("CREATE INDEX idx_products_group ON products (product_group_number)")
+                    connection.execute("CREATE INDEX idx_order_history_client_date ON order_history (client_number, date DESC)")
+                    connection.execute("CREATE INDEX idx_order_history_article ON order_history (article_number)")
+                    connection.execute("CREATE INDEX idx_order_history_date ON order_history (date)")
                 
-        except ET.ParseError as e:
-            print(f"Error parsing history file: {e}")
-        except Exception as e:
-            print(f"Unexpected error processing history file: {e}")
+                connection.execute("ANALYZE")
+            finally:
+                connection.close()
+            
+            os.chmod(temp_path, self.file_mode)
+            os.replace(temp_path, database_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
         
-        # Sort order history by date for each client
-        for client_number in self.order_history:
-            self.order_history[client_number].sort(
-                key=lambda x: x["date"] or "1900-01-01", 
-                reverse=True
-            )
+        database_size = database_path.stat().st_size
+        with self.output_lock:
+            self.output_stats["files"] += 1
+            self.output_stats["bytes"] += database_size
         
-        print(f"Loaded order history for {len(self.order_history)} clients")
+        print(f"Created {SQLITE_DATABASE_FILE} ({database_size} bytes)")
     
-    def create_client_files(self):
-        """Create individual JSON files for each client"""
-        print("Creating client JSON files...")
+    def build_search_index(self, products: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build an inverted index over the searchable product fields.
+
+        Each product is a document id (its position in all_products). Every
+        token of short/long description, article number, barcode and product
+        group (normalized with normalize_search_text) maps to a posting list
+        of document ids; identifiers are also indexed as a whole. A trigram
+        index over the vocabulary resolves substring queries to the tokens
+        containing them without scanning the products.
+        """
+        token_postings = defaultdict(list)
         
-        created_files = 0
-        for client_number, client_data in self.clients.items():
-            try:
-                # Get order history for this client
-                orders = self.order_history.get(client_number, [])
-                
-                # Enrich order history with product information
-                enriched_orders = []
-                for order in orders:
-                    enriched_order = order.copy()
-                    article_info = self.products.get(order["article_number"])
-                    if article_info:
-                        enriched_order["article_info"] = {
-                            "short_description": article_info["short_description"],
-                            "long_description": article_info["long_description"],
-                            "product_group": article_info["product_group"]["description"],
-                            "unit": article_info["unit"]
-                        }
-                    enriched_orders.append(enriched_order)
-                
-                # Calculate order statistics
-                total_orders = len(enriched_orders)
-                unique_articles = len(set(order["article_number"] for order in enriched_orders))
-                recent_orders = [order for order in enriched_orders if order["date"] and order["date"] >= "2025-01-01"]
-                
-                # Create comprehensive client file
-                client_file_data = {
-                    "metadata": {
-                        "generated_at": datetime.now().isoformat(),
-                        "client_number": client_number,
-                        "data_source": "BotanBot XML Export"
-                    },
-                    "client_profile": client_data,
-                    "order_statistics": {
-                        "total_orders": total_orders,
-                        "unique_articles_ordered": unique_articles,
-                        "recent_orders_count": len(recent_orders),
-                        "last_order_date": enriched_orders[0]["date"] if enriched_orders else None
-                    },
-                    "order_history": enriched_orders
-                }
-                
-                # Write client file
-                client_file_path = self.data_path / f"{client_number}.json"
-                with open(client_file_path, 'w', encoding='utf-8') as f:
-                    json.dump(client_file_data, f, ensure_ascii=False, indent=2)
-                
-                created_files += 1
-                
-            except Exception as e:
-                print(f"Error creating file for client {client_number}: {e}")
+        for document_id, product in enumerate(products):
+            values = [
+                product["short_description"],
+                product["long_description"],
+                product["article_number"],
+                product["barcode"],
+                product["product_group"]["description"]
+            ]
+            tokens = set()
+            for value in values:
+                tokens.update(search_tokens(value))
+            # Identifiers such as "15.05.35" are also searchable as a whole
+            for value in (product["article_number"], product["barcode"], product["product_group"]["number"]):
+                if value:
+                    tokens.add(normalize_search_text(value))
+            for token in tokens:
+                token_postings[token].append(document_id)
+        
+        vocabulary = sorted(token_postings)
+        ngrams = defaultdict(list)
+        for token_id, token in enumerate(vocabulary):
+            for gram in token_ngrams(token):
+                ngrams[gram].append(token_id)
         
-        print(f"Created {created_files} client JSON files")
+        return {
+            "metadata": {
+                "generated_at": datetime.now().isoformat(),
+                "version": 1,
+                "fields": list(SEARCH_FIELDS),
+                "normalization": "lowercase, umlauts and sharp s folded, accents removed",
+                "ngram_size": SEARCH_NGRAM_SIZE,
+                "documents": len(products),
+                "tokens": len(vocabulary)
+            },
+            "documents": [product["article_number"] for product in products],
+            "vocabulary": vocabulary,
+            "postings": [token_postings[token] for token in vocabulary],
+            "ngrams": dict(ngrams)
+        }
     
     def create_products_file(self):
-        """Create master products JSON file"""
+        """Create master products JSON file
+
+        By default every product is stored once in all_products and the
+        categories list article numbers. With legacy_products the previous
+        shape, which repeats each product in its category, is written.
+        """
         print("Creating products JSON file...")
         
         try:
             # Organize products by category for better AI readability
             categorized_products = {}
             uncategorized_products = []
+            all_products = []
             
             for article_number, product_data in self.products.items():
+                all_products.append(product_data)
+                entry = product_data if self.legacy_products else article_number
                 product_group = product_data["product_group"]["description"]
                 if product_group:
                     if product_group not in categorized_products:
                         categorized_products[product_group] = []
-                    categorized_products[product_group].append(product_data)
+                    categorized_products[product_group].append(entry)
                 else:
-                    uncategorized_products.append(product_data)
+                    uncategorized_products.append(entry)
             
             # Create comprehensive products file
             products_file_data = {
@@ -414,23 +2253,67 @@ class DataConverter:
                     "generated_at": datetime.now().isoformat(),
                     "total_products": len(self.products),
                     "categories_count": len(categorized_products),
-                    "data_source": "BotanBot XML Export"
+                    "data_source": "BotanBot XML Export",
+                    "format": "legacy" if self.legacy_products else "deduplicated"
                 },
                 "product_categories": categorized_products,
                 "uncategorized_products": uncategorized_products,
-                "all_products": list(self.products.values())
+                "all_products": all_products
             }
             
             # Write products file
-            products_file_path = self.base_path / "products.json"
-            with open(products_file_path, 'w', encoding='utf-8') as f:
-                json.dump(products_file_data, f, ensure_ascii=False, indent=2)
+            products_file_path = self.base_path / f"products{self.output_extension}"
+            payload = self.encode_output(products_file_data)
+            self.write_bytes_file(products_file_path, payload)
+            self.products_file_sizes["bytes"] = len(payload)
+            
+            print(f"Created {products_file_path.name} with {len(self.products)} products")
+            
+            # Re-encoding and parsing both shapes costs about half a second on
+            # the full export, so it is opt-in and not repeated for daemon deltas
+            if self.measure_products and not self.legacy_products and not self.products_file_savings:
+                self.products_file_savings = self.measure_products_savings(products_file_data, payload)
+            
+            # Search index next to products.json, document ids index all_products
+            search_index = self.build_search_index(products_file_data["all_products"])
+            self.write_json_file(self.base_path / SEARCH_INDEX_FILE, search_index, pretty=False)
             
-            print(f"Created products.json with {len(self.products)} products")
+            print(f"Created {SEARCH_INDEX_FILE} with {search_index['metadata']['tokens']} tokens")
             
         except Exception as e:
             print(f"Error creating products file: {e}")
     
+    def measure_products_savings(self, products_file_data: Dict[str, Any], payload: bytes) -> Dict[str, Any]:
+        """Compare size and parse time of the deduplicated products file with the legacy shape"""
+        by_number = {product["article_number"]: product for product in products_file_data["all_products"]}
+        legacy_data = dict(products_file_data)
+        legacy_data["product_categories"] = {
+            category: [by_number[number] for number in numbers]
+            for category, numbers in products_file_data["product_categories"].items()
+        }
+        legacy_data["uncategorized_products"] = [
+            by_number[number] for number in products_file_data["uncategorized_products"]
+        ]
+        legacy_payload = self.encode_output(legacy_data)
+        
+        def load_seconds(data: bytes) -> float:
+            started = time.perf_counter()
+            decode_data(data, self.serializer)
+            return time.perf_counter() - started
+        
+        # Best of three keeps one-off allocator noise out of the comparison
+        load_time = min(load_seconds(payload) for _ in range(3))
+        legacy_load_time = min(load_seconds(legacy_payload) for _ in range(3))
+        
+        return {
+            "bytes": len(payload),
+            "legacy_bytes": len(legacy_payload),
+            "bytes_saved": len(legacy_payload) - len(payload),
+            "load_seconds": round(load_time, 4),
+            "legacy_load_seconds": round(legacy_load_time, 4),
+            "load_seconds_saved": round(legacy_load_time - load_time, 4)
+        }
+    
     def generate_summary_report(self):
         """Generate a summary report of the conversion"""
         report = {
@@ -438,10 +2321,31 @@ class DataConverter:
                 "timestamp": datetime.now().isoformat(),
                 "total_clients": len(self.clients),
                 "total_products": len(self.products),
-                "total_clients_with_history": len(self.order_history),
+                "total_clients_with_history": len(self.client_articles),
                 "files_created": {
                     "client_files": len(self.clients),
-                    "products_file": 1
+                    "products_file": 1,
+                    "article_index_file": 1,
+                    "product_aggregates_file": 1
+                },
+                "output": self.output_summary,
+                "products_file": {
+                    "format": "legacy" if self.legacy_products else "deduplicated",
+                    **self.products_file_savings,
+                    **self.products_file_sizes,
+                    "aggregates_file": PRODUCT_AGGREGATES_FILE
+                },
+                "aggregates_as_of": self.as_of.isoformat(),
+                "total_seconds": round(self.total_seconds, 3),
+                "phases": self.phase_metrics,
+                "incremental": {
+                    "enabled": self.incremental,
+                    "changed_source_files": len(self.changed_sources),
+                    "client_files_written": self.files_written,
+                    "client_files_unchanged": self.files_skipped,
+                    "fingerprints_reused": self.fingerprints_reused,
+                    "resumed_snapshots": self.resumed_stages,
+                    "resumed_client_files": len(self.resumed_clients)
                 }
             },
             "data_quality_notes": [
@@ -450,31 +2354,367 @@ class DataConverter:
                 "Boolean values normalized to true/false",
                 "Empty CDATA values converted to empty strings or null",
                 "Order history sorted by date (most recent first)",
-                "Products categorized by product groups for better organization"
+                "Products stored once in all_products; categories list article numbers"
+                if not self.legacy_products else
+                "Products categorized by product groups for better organization",
+                "Per-client ai_context holds article frequencies, top articles and recommendations",
+                f"order_aggregates (client files and {PRODUCT_AGGREGATES_FILE}) use trailing windows "
+                "and buckets ending at aggregates_as_of"
             ]
         }
         
-        # Write summary report
-        summary_file_path = self.base_path / "conversion_summary.json"
-        with open(summary_file_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
+        # Write summary report; always JSON, the Node service parses it after every run
+        self.write_json_file(self.base_path / "conversion_summary.json", report, pretty=True)
         
         print("Generated conversion summary report")
         return report
     
+    def checkpoint_key(self) -> str:
+        """Hash of everything a checkpoint is only valid for: sources and output options"""
+        return self.hash_data({
+            "checkpoint_version": CHECKPOINT_VERSION,
+            "manifest_version": MANIFEST_VERSION,
+            "sources": {path: signature["sha1"] for path, signature in self.source_signatures.items()},
+            "output_options": self.output_options(),
+            "as_of": self.as_of.isoformat()
+        })
+    
+    def published_generation(self) -> Optional[str]:
+        """Name of the generation data/ currently points at, None for a plain directory"""
+        if not self.data_path.is_symlink():
+            return None
+        return Path(os.readlink(self.data_path)).name
+    
+    def open_checkpoint(self):
+        """Resume the checkpoint of an interrupted run, or start a new one.
+
+        A checkpoint is reused only when the sources and output options are
+        unchanged. If its generation was already published the snapshots are
+        kept but a new generation is staged.
+        """
+        key = self.checkpoint_key()
+        state_path = self.checkpoint_path / "state.json"
+        state = None
+        if state_path.exists():
+            try:
+                with open(state_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable checkpoint {state_path}: {e}")
+        
+        if state is None or state.get("key") != key:
+            if self.checkpoint_path.exists():
+                print("Discarding checkpoint of a run with other sources or options")
+                shutil.rmtree(self.checkpoint_path)
+            stale_generation = state and state.get("generation")
+            if stale_generation and stale_generation != self.published_generation():
+                shutil.rmtree(self.generations_path / stale_generation, ignore_errors=True)
+            state = {"key": key, "completed": [], "generation": None}
+        
+        if state["generation"] is None or state["generation"] == self.published_generation():
+            # Microseconds keep two runs of one process within a second apart
+            state["generation"] = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{os.getpid()}"
+            written_log = self.checkpoint_path / "written_clients.txt"
+            if written_log.exists():
+                written_log.unlink()
+        
+        written_log = self.checkpoint_path / "written_clients.txt"
+        if written_log.exists():
+            with open(written_log, 'r', encoding='utf-8') as f:
+                self.resumed_clients = set(line.strip() for line in f if line.strip())
+        
+        self.checkpoint_path.mkdir(exist_ok=True)
+        self.checkpoint_state = state
+        self.save_checkpoint_state()
+        if state["completed"] or self.resumed_clients:
+            print(f"Resuming checkpoint: {', '.join(state['completed']) or 'no'} snapshots, "
+                  f"{len(self.resumed_clients)} client files already written")
+    
+    def write_checkpoint_file(self, name: str, write, directory: Optional[Path] = None):
+        """Atomically create a checkpoint file; write(f) fills the open binary file"""
+        directory = directory or self.checkpoint_path
+        fd, temp_path = tempfile.mkstemp(dir=str(directory), prefix=f".{name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, directory / name)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+    
+    def save_checkpoint_state(self):
+        payload = json.dumps(self.checkpoint_state).encode("utf-8")
+        self.write_checkpoint_file("state.json", lambda f: f.write(payload))
+    
+    def save_checkpoint(self, stage: str):
+        """Pickle the attributes a load stage produced and mark it completed"""
+        if not self.resumable:
+            return
+        snapshot = {name: getattr(self, name) for name in CHECKPOINT_STAGES[stage]}
+        self.write_checkpoint_file(f"{stage}.pickle",
+                                   lambda f: pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL))
+        self.checkpoint_state["completed"].append(stage)
+        self.save_checkpoint_state()
+    
+    def restore_checkpoint(self, stage: str) -> bool:
+        """Load a completed stage's snapshot; False when it has to be computed"""
+        if not self.resumable or stage not in self.checkpoint_state["completed"]:
+            return False
+        try:
+            with open(self.checkpoint_path / f"{stage}.pickle", 'rb') as f:
+                snapshot = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            print(f"Ignoring unreadable {stage} snapshot: {e}")
+            self.checkpoint_state["completed"].remove(stage)
+            return False
+        
+        for name, value in snapshot.items():
+            setattr(self, name, value)
+        self.resumed_stages.append(stage)
+        print(f"Restored {stage} from checkpoint")
+        return True
+    
+    def record_written_clients(self, client_numbers: List[str]):
+        """Append a batch of written client files to the checkpoint, durably"""
+        with open(self.checkpoint_path / "written_clients.txt", 'a', encoding='utf-8') as f:
+            f.write("".join(f"{client_number}\n" for client_number in client_numbers))
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def stage_generation(self, unchanged_clients: Iterable[str]) -> int:
+        """Create the generation directory client files are written to.
+
+        Files of unchanged clients are hard-linked from the published data/
+        (copied where links are unsupported); files are always replaced by
+        rename, never modified in place, so generations can share them.
+        Returns the number of files carried over.
+        """
+        self.output_data_path = self.generations_path / self.checkpoint_state["generation"]
+        self.output_data_path.mkdir(parents=True, exist_ok=True)
+        
+        # Temp files of writes cut short by the interrupted run
+        for temp_path in self.output_data_path.glob(".*.tmp"):
+            temp_path.unlink()
+        
+        carried = 0
+        for client_number in unchanged_clients:
+            source = self.data_path / self.client_file_name(client_number)
+            target = self.output_data_path / self.client_file_name(client_number)
+            if target.exists():
+                continue
+            try:
+                os.link(source, target)
+            except OSError:
+                shutil.copy2(source, target)
+            carried += 1
+        return carried
+    
+    def publish_generation(self):
+        """Point data/ at the staged generation with one atomic rename.
+
+        The first run over a plain data/ directory moves it into
+        data.generations/ before linking, the only moment data/ is briefly
+        missing. The replaced generation is kept for readers that already
+        resolved it; older ones are removed.
+        """
+        generation = self.output_data_path.name
+        target = os.path.relpath(self.output_data_path, self.base_path)
+        
+        previous = self.published_generation()
+        if self.data_path.is_symlink() or not self.data_path.exists():
+            link_path = self.base_path / f".{self.data_path.name}.{generation}.link"
+            if os.path.lexists(link_path):
+                os.unlink(link_path)
+            os.symlink(target, link_path, target_is_directory=True)
+            os.replace(link_path, self.data_path)
+        else:
+            previous = f"{generation}-previous"
+            os.rename(self.data_path, self.generations_path / previous)
+            os.symlink(target, self.data_path, target_is_directory=True)
+        
+        self.output_data_path = self.data_path
+        print(f"Published generation {generation}")
+        
+        for path in self.generations_path.iterdir():
+            if path.is_dir() and path.name not in (generation, previous):
+                shutil.rmtree(path)
+    
+    def clear_checkpoint(self):
+        if self.checkpoint_path.exists():
+            shutil.rmtree(self.checkpoint_path)
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Measure one conversion phase.
+
+        Yields a dict the caller can fill with "items" and "unit" (e.g. rows
+        or files) to get a throughput figure. Records wall and CPU time
+        (including finished worker processes), peak RSS so far and bytes
+        written, keeps them for conversion_summary.json and prints them as a
+        JSON line on stdout. A phase that raises is still recorded, with
+        "failed": true, before the exception propagates.
+        """
+        metrics = {"phase": name}
+        bytes_before = self.output_stats["bytes"]
+        cpu_before = time.process_time() + sum(os.times()[2:4])
+        wall_before = time.perf_counter()
+        failed = True
+        
+        try:
+            yield metrics
+            failed = False
+        finally:
+            wall_seconds = time.perf_counter() - wall_before
+            metrics["wall_seconds"] = round(wall_seconds, 3)
+            metrics["cpu_seconds"] = round(time.process_time() + sum(os.times()[2:4]) - cpu_before, 3)
+            metrics["peak_rss_mb"] = peak_rss_mb()
+            metrics["bytes_written"] = self.output_stats["bytes"] - bytes_before
+            if "items" in metrics:
+                metrics["items_per_second"] = round(metrics["items"] / wall_seconds, 1) if wall_seconds > 0 else None
+            if failed:
+                metrics["failed"] = True
+            
+            self.phase_metrics.append(metrics)
+            print(json.dumps({"event": "phase", **metrics}, ensure_ascii=False), flush=True)
+    
     def convert_all(self):
         """Execute the complete conversion process"""
         print("Starting data conversion process...")
         print("=" * 50)
         
-        # Load all data
-        self.load_clients()
-        self.load_products()
-        self.load_order_history()
+        conversion_started = time.perf_counter()
+        
+        # Detect which sources changed since the previous run
+        with self.phase("scan_sources") as metrics:
+            self.load_manifest()
+            self.scan_sources()
+            if self.resumable:
+                self.open_checkpoint()
+            metrics.update(items=len(self.source_signatures), unit="files")
         
-        # Create output files
-        self.create_client_files()
-        self.create_products_file()
+        # Load all data, or restore it from the checkpoint of an interrupted run
+        with self.phase("load_clients") as metrics:
+            if self.restore_checkpoint("clients"):
+                metrics["resumed"] = True
+            else:
+                self.load_clients()
+                self.save_checkpoint("clients")
+                metrics["cached"] = self.parse_cache_hits.get("clients", 0)
+            metrics.update(items=len(self.clients), unit="files")
+        with self.phase("load_products") as metrics:
+            if self.restore_checkpoint("products"):
+                metrics["resumed"] = True
+            else:
+                self.load_products()
+                self.save_checkpoint("products")
+                metrics["cached"] = self.parse_cache_hits.get("products", 0)
+            metrics.update(items=len(self.products), unit="files")
+        spill_directory = None
+        if self.history_partitions:
+            # Partitioned history: spill it now, sort and enrich it per partition below
+            spill_directory = tempfile.TemporaryDirectory(prefix=".history-spill-", dir=str(self.base_path))
+            with self.phase("spill_order_history") as metrics:
+                rows = self.spill_order_history(Path(spill_directory.name))
+                metrics.update(items=rows, unit="rows", partitions=self.history_partitions)
+        else:
+            with self.phase("load_order_history") as metrics:
+                history_resumed = self.restore_checkpoint("order_history")
+                history_cached = not history_resumed and self.restore_history_cache()
+                if history_resumed:
+                    metrics["resumed"] = True
+                elif history_cached:
+                    metrics["cached"] = True
+                else:
+                    self.load_order_history(sort=False)
+                metrics.update(items=sum(len(orders) for orders in self.order_history.values()), unit="rows")
+            with self.phase("sort_order_history") as metrics:
+                if not history_resumed:
+                    if not history_cached:
+                        self.sort_order_history()
+                        self.save_history_cache()
+                    self.save_checkpoint("order_history")
+                metrics.update(items=len(self.order_history), unit="clients")
+        with self.phase("build_article_index") as metrics:
+            self.build_article_index()
+            metrics.update(items=len(self.article_clients), unit="articles")
+        with self.phase("aggregate_orders") as metrics:
+            metrics.update(items=self.build_order_aggregates(), unit="rows")
+        with self.phase("build_recommendation_model"):
+            self.build_recommendation_model()
+        
+        write_started = time.perf_counter()
+        if spill_directory is not None:
+            # Create output files partition by partition, skipping unchanged clients
+            with self.phase("write_client_files") as metrics:
+                try:
+                    written_clients, changed_count = self.process_history_partitions()
+                finally:
+                    spill_directory.cleanup()
+                metrics.update(items=len(written_clients), unit="files", partitions=self.history_partitions)
+                # Summed over the writer threads, so they can exceed the wall time
+                metrics.update({key: round(value, 3) for key, value in self.thread_timings.items()})
+            self.files_skipped = len(self.clients) - changed_count
+            print(f"{changed_count} client files needed regeneration, {self.files_skipped} unchanged")
+        else:
+            # Create output files, skipping clients whose inputs are unchanged
+            with self.phase("fingerprint_clients") as metrics:
+                changed_clients = self.find_changed_clients()
+                metrics.update(items=len(self.clients), unit="clients")
+            self.files_skipped = len(self.clients) - len(changed_clients)
+            print(f"{len(changed_clients)} client files need regeneration, {self.files_skipped} unchanged")
+            
+            resumed_clients = []
+            on_written = None
+            if self.resumable:
+                with self.phase("stage_generation") as metrics:
+                    changed = set(changed_clients)
+                    carried = self.stage_generation(number for number in self.clients if number not in changed)
+                    metrics.update(items=carried, unit="files")
+                resumed_clients = [number for number in changed_clients if number in self.resumed_clients]
+                changed_clients = [number for number in changed_clients if number not in self.resumed_clients]
+                on_written = self.record_written_clients
+            with self.phase("write_client_files") as metrics:
+                written_clients = resumed_clients + self.create_client_files(changed_clients, on_written)
+                metrics.update(items=len(written_clients) - len(resumed_clients), unit="files")
+                if resumed_clients:
+                    metrics["resumed"] = len(resumed_clients)
+                # Summed over the writer threads, so they can exceed the wall time
+                metrics.update({key: round(value, 3) for key, value in self.thread_timings.items()})
+        self.files_written = len(written_clients)
+        with self.phase("write_products"):
+            self.create_products_file()
+        with self.phase("write_article_index"):
+            self.create_article_index_file()
+        with self.phase("write_product_aggregates"):
+            self.create_product_aggregates_file()
+        if self.packed:
+            with self.phase("write_packed_store") as metrics:
+                metrics.update(self.create_packed_store())
+                metrics.update(items=len(self.clients), unit="clients")
+        if self.sqlite:
+            with self.phase("write_sqlite") as metrics:
+                self.create_sqlite_database()
+                metrics.update(items=sum(len(orders) for orders in self.order_history.values()), unit="rows")
+        self.output_summary = {
+            "format": "pretty" if self.pretty else "compact",
+            "serializer": self.serializer,
+            "files_written": self.output_stats["files"],
+            "bytes_written": self.output_stats["bytes"],
+            "write_seconds": round(time.perf_counter() - write_started, 3)
+        }
+        if self.resumable:
+            with self.phase("publish_generation"):
+                self.publish_generation()
+        self.remove_superseded_outputs()
+        with self.phase("save_manifest"):
+            self.save_manifest(written_clients)
+        if self.resumable:
+            self.clear_checkpoint()
+        
+        self.total_seconds = time.perf_counter() - conversion_started
         
         # Generate summary
         summary = self.generate_summary_report()
@@ -482,21 +2722,672 @@ class DataConverter:
         print("=" * 50)
         print("Conversion completed successfully!")
         print(f"• {summary['conversion_summary']['total_clients']} client files created in 'data/' directory")
-        print(f"• 1 products file created as 'products.json'")
+        print(f"• 1 products file created as 'products{self.output_extension}'")
         print(f"• {summary['conversion_summary']['total_clients_with_history']} clients have order history")
         print("• Summary report saved as 'conversion_summary.json'")
         
         return summary
+    
+    def source_relative_path(self, path: str) -> Optional[str]:
+        """Map a changed path to its key in source_signatures, e.g. "Artikel/Artikel-1000.xml".
+
+        Accepts absolute paths, paths relative to the working directory and
+        paths relative to susko.ai/. Returns None for anything that is not a
+        source file the converter reads.
+        """
+        candidate = Path(path)
+        if not candidate.is_absolute() and candidate.parts and candidate.parts[0] in dict(SOURCE_PATTERNS):
+            candidate = self.susko_path / candidate
+        
+        relative_path = os.path.relpath(os.path.abspath(candidate), os.path.abspath(self.susko_path))
+        parts = Path(relative_path).parts
+        if len(parts) != 2:
+            return None
+        
+        folder, name = parts
+        pattern = dict(SOURCE_PATTERNS).get(folder)
+        if pattern is None or not fnmatch.fnmatchcase(name, pattern):
+            return None
+        return relative_path
+    
+    def reload_client_source(self, file_path: str) -> List[str]:
+        """Re-read one address file, returning the client numbers it affected"""
+        affected = [number for number, source in self.client_sources.items() if source == file_path]
+        client_data = self.parse_client_file(file_path) if os.path.exists(file_path) else None
+        current_number = client_data["client_number"] if client_data is not None else None
+        
+        for client_number in affected:
+            if client_number != current_number:
+                del self.clients[client_number]
+                del self.client_sources[client_number]
+        
+        # Assigning an existing key keeps its position, so outputs keep their order
+        if client_data is not None:
+            self.clients[current_number] = client_data
+            self.client_sources[current_number] = file_path
+            if current_number not in affected:
+                affected.append(current_number)
+        
+        return affected
+    
+    def reload_product_source(self, file_path: str) -> List[str]:
+        """Re-read one article file, returning the article numbers it affected"""
+        affected = [number for number, source in self.product_sources.items() if source == file_path]
+        product_data = self.parse_product_file(file_path) if os.path.exists(file_path) else None
+        current_number = product_data["article_number"] if product_data is not None else None
+        
+        for article_number in affected:
+            if article_number != current_number:
+                del self.products[article_number]
+                del self.product_sources[article_number]
+        
+        # Assigning an existing key keeps its position, so outputs keep their order
+        if product_data is not None:
+            self.products[current_number] = product_data
+            self.product_sources[current_number] = file_path
+            if current_number not in affected:
+                affected.append(current_number)
+        
+        return affected
+    
+    def apply_source_changes(self, paths: Iterable[str]) -> Dict[str, Any]:
+        """Apply changed, added or deleted source files to the loaded data.
+
+        Requires a completed convert_all(). Address and article files are
+        re-parsed individually; any change below History/ reloads the order
+        history. Only client files whose content can differ are rewritten:
+        the clients whose fingerprint differs from the one recorded for their
+        file. When the aggregates or the recommendation model are rebuilt every
+        client is fingerprinted again. products.json, product_aggregates.json,
+        the optional packed store and SQLite database and the manifest are
+        refreshed as needed.
+        Returns the delta metrics, which are also printed as a JSON line.
+        """
+        started = time.perf_counter()
+        bytes_before = self.output_stats["bytes"]
+        changed_clients = set()
+        changed_articles = set()
+        history_changed = False
+        applied_paths = []
+        previous_products = dict(self.products)
+        
+        for path in paths:
+            relative_path = self.source_relative_path(path)
+            if relative_path is None:
+                print(f"Ignoring {path}: not a susko.ai source file")
+                continue
+            
+            file_path = str(self.susko_path / relative_path)
+            previous = self.source_signatures.get(relative_path)
+            if os.path.exists(file_path):
+                try:
+                    signature = self.file_signature(file_path, previous)
+                except OSError as e:
+                    print(f"Error reading {file_path}: {e}")
+                    continue
+                self.source_signatures[relative_path] = signature
+                if previous is not None and previous.get("sha1") == signature["sha1"]:
+                    continue
+            elif self.source_signatures.pop(relative_path, None) is None:
+                continue
+            
+            applied_paths.append(relative_path)
+            folder = Path(relative_path).parts[0]
+            if folder == "Adressen":
+                changed_clients.update(self.reload_client_source(file_path))
+            elif folder == "Artikel":
+                changed_articles.update(self.reload_product_source(file_path))
+            else:
+                history_changed = True
+        
+        if history_changed:
+            previous_history = self.order_history
+            self.order_history = {}
+            self.load_order_history()
+            self.build_article_index()
+            changed_clients.update(
+                client_number for client_number in set(previous_history) | set(self.order_history)
+                if previous_history.get(client_number) != self.order_history.get(client_number)
+            )
+        
+        # Trailing windows move with the date, so a resident daemon re-rolls
+        # them on the first batch of a new day
+        rebuild_aggregates = history_changed
+        if not self.as_of_pinned and self.as_of != date.today():
+            self.as_of = date.today()
+            rebuild_aggregates = True
+        aggregates_changed = False
+        if rebuild_aggregates:
+            previous_article_aggregates = self.hash_data(self.article_aggregates)
+            self.build_order_aggregates()
+            aggregates_changed = previous_article_aggregates != self.hash_data(self.article_aggregates)
+        
+        # Only clients that ordered a changed article embed its article_info
+        for article_number in changed_articles:
+            changed_clients.update(self.article_clients.get(article_number, ()))
+        
+        def model_input(product):
+            if product is None:
+                return None
+            return product["product_group"]["number"], product["attributes"]["is_blocked"]
+        
+        model_changed = history_changed or any(
+            model_input(previous_products.get(number)) != model_input(self.products.get(number))
+            for number in changed_articles
+        )
+        if model_changed:
+            # Recommendations depend on every client's history and on the
+            # product groups, so every client is fingerprinted again below
+            self.client_recommendations = {}
+            self.build_recommendation_model()
+        elif changed_articles:
+            # Same ranking; only recommendations showing a changed article differ
+            for client_number, recommendations in list(self.client_recommendations.items()):
+                if any(entry["article_number"] in changed_articles for entry in recommendations):
+                    del self.client_recommendations[client_number]
+                    changed_clients.add(client_number)
+        
+        # History-only client numbers never had a file; deleted address files did
+        removed_clients = sorted(number for number in self.client_fingerprints if number not in self.clients)
+        for client_number in removed_clients:
+            self.client_fingerprints.pop(client_number, None)
+            self.client_recommendations.pop(client_number, None)
+            client_file_path = self.data_path / self.client_file_name(client_number)
+            if client_file_path.exists():
+                client_file_path.unlink()
+        
+        # Rebuilt aggregates or recommendations can move any client, so all of
+        # them are fingerprinted and compared like find_changed_clients does.
+        # Clients outside changed_clients kept their orders and article_info.
+        if rebuild_aggregates or model_changed:
+            fingerprint_clients = self.clients
+        else:
+            fingerprint_clients = [number for number in changed_clients if number in self.clients]
+        rewrite_clients = []
+        for client_number in fingerprint_clients:
+            previous = self.client_fingerprints.get(client_number)
+            known = None
+            if previous and client_number not in changed_clients:
+                known = {"history": previous["history"], "articles": previous["articles"]}
+            fingerprint = self.client_fingerprint(client_number, known)
+            self.client_fingerprints[client_number] = fingerprint
+            client_file_path = self.data_path / self.client_file_name(client_number)
+            if fingerprint != previous or not client_file_path.exists():
+                rewrite_clients.append(client_number)
+        rewrite_clients.sort()
+        written_clients = self.create_client_files(rewrite_clients) if rewrite_clients else []
+        for client_number in set(rewrite_clients) - set(written_clients):
+            del self.client_fingerprints[client_number]
+        
+        if changed_articles:
+            self.create_products_file()
+        if aggregates_changed:
+            self.create_product_aggregates_file()
+        if history_changed:
+            self.create_article_index_file()
+        if applied_paths or rewrite_clients or removed_clients:
+            if self.packed:
+                self.create_packed_store()
+            if self.sqlite:
+                self.create_sqlite_database()
+            # Every fingerprint still held matches the file on disk
+            self.save_manifest(self.client_fingerprints)
+        
+        metrics = {
+            "paths": applied_paths,
+            "clients_written": len(written_clients),
+            "clients_removed": len(removed_clients),
+            "products_changed": len(changed_articles),
+            "history_reloaded": history_changed,
+            "wall_seconds": round(time.perf_counter() - started, 3),
+            "bytes_written": self.output_stats["bytes"] - bytes_before
+        }
+        print(json.dumps({"event": "delta", **metrics}, ensure_ascii=False), flush=True)
+        return metrics
+
+
+class ConversionDaemon:
+    """Keep a converted dataset in memory and apply source changes as they arrive.
+
+    Runs convert_all() once, then waits for changed paths from any of:
+        stdin       one path per line (absolute, or relative to susko.ai/)
+        socket      a Unix socket; each connection sends paths, one per line,
+                    and receives the delta metrics as a JSON line once applied
+        watch       polling of the susko.ai/ tree every watch_interval seconds
+
+    Paths arriving within DAEMON_DEBOUNCE_SECONDS of each other are applied as
+    one batch. The daemon stops on SIGINT/SIGTERM, or at the end of stdin when
+    it has no other source of changes.
+    """
+    
+    def __init__(self, converter: DataConverter, watch_interval: Optional[float] = None,
+                 socket_path: Optional[str] = None, read_stdin: bool = True):
+        self.converter = converter
+        self.watch_interval = watch_interval
+        self.socket_path = socket_path
+        self.read_stdin = read_stdin
+        self.changes = queue.Queue()
+        self.stopped = threading.Event()
+        self.server = None
+    
+    def submit(self, paths: List[str], reply: Optional[Dict[str, Any]] = None):
+        """Queue changed paths; reply, if given, receives the metrics and a done event"""
+        self.changes.put((paths, reply))
+    
+    def stop(self, *_):
+        """Signal handler: finish the current batch, then return from run()"""
+        self.stopped.set()
+        self.changes.put(None)
+    
+    def read_stdin_paths(self):
+        for line in sys.stdin:
+            path = line.strip()
+            if path:
+                self.submit([path])
+        if self.watch_interval is None and self.socket_path is None:
+            self.stop()
+    
+    def source_stats(self) -> Dict[str, Tuple[int, int]]:
+        stats = {}
+        for folder, pattern in SOURCE_PATTERNS:
+            for file_path in glob.glob(str(self.converter.susko_path / folder / pattern)):
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                stats[file_path] = (stat.st_mtime_ns, stat.st_size)
+        return stats
+    
+    def watch_sources(self):
+        """Poll the source tree and queue files that were added, changed or removed"""
+        known = self.source_stats()
+        while not self.stopped.wait(self.watch_interval):
+            current = self.source_stats()
+            changed = [path for path, stat in current.items() if known.get(path) != stat]
+            changed += [path for path in known if path not in current]
+            known = current
+            if changed:
+                self.submit(changed)
+    
+    def serve_socket(self):
+        daemon = self
+        
+        class ChangeHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                paths = [line.decode("utf-8").strip() for line in self.rfile]
+                reply = {"done": threading.Event()}
+                daemon.submit([path for path in paths if path], reply)
+                reply["done"].wait()
+                self.wfile.write(json.dumps(reply.get("metrics"), ensure_ascii=False).encode("utf-8") + b"\n")
+        
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.server = socketserver.ThreadingUnixStreamServer(self.socket_path, ChangeHandler)
+        self.server.daemon_threads = True
+        self.server.serve_forever()
+    
+    def next_batch(self) -> Optional[Tuple[List[str], List[Dict[str, Any]]]]:
+        """Block for the next change and merge everything arriving right after it.
+
+        Returns None once stopped with nothing left to apply; changes queued
+        before the stop are still returned.
+        """
+        item = self.changes.get()
+        paths, replies = [], []
+        while item is not None:
+            paths.extend(item[0])
+            if item[1] is not None:
+                replies.append(item[1])
+            try:
+                item = self.changes.get(timeout=DAEMON_DEBOUNCE_SECONDS)
+            except queue.Empty:
+                break
+        
+        if not paths and not replies:
+            return None
+        return paths, replies
+    
+    def run(self):
+        """Convert once, then apply queued changes until stopped"""
+        if self.socket_path and not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise ValueError("--socket requires Unix domain sockets")
+        
+        self.converter.convert_all()
+        
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        
+        workers = []
+        if self.read_stdin:
+            workers.append(self.read_stdin_paths)
+        if self.watch_interval is not None:
+            workers.append(self.watch_sources)
+        if self.socket_path:
+            workers.append(self.serve_socket)
+        if not workers:
+            return
+        for target in workers:
+            threading.Thread(target=target, daemon=True).start()
+        
+        print(json.dumps({"event": "daemon_ready", "pid": os.getpid(),
+                          "watch_interval": self.watch_interval, "socket": self.socket_path}), flush=True)
+        
+        try:
+            while True:
+                batch = self.next_batch()
+                if batch is None:
+                    break
+                paths, replies = batch
+                try:
+                    metrics = self.converter.apply_source_changes(paths)
+                except Exception as e:
+                    print(f"Error applying changes to {len(paths)} paths: {e}")
+                    metrics = {"error": str(e)}
+                for reply in replies:
+                    reply["metrics"] = metrics
+                    reply["done"].set()
+                if self.stopped.is_set():
+                    break
+        finally:
+            if self.server is not None:
+                self.server.shutdown()
+                self.server.server_close()
+                os.unlink(self.socket_path)
+
+
+class ProductSearchIndex:
+    """Query side of products.search.json.
+
+    Every query token must occur as a substring of some token of the
+    product (AND semantics); results keep the order of all_products.
+    """
+    
+    def __init__(self, index: Dict[str, Any]):
+        self.documents = index["documents"]
+        self.vocabulary = index["vocabulary"]
+        self.postings = index["postings"]
+        self.ngrams = index["ngrams"]
+        self.ngram_size = index["metadata"]["ngram_size"]
+    
+    @classmethod
+    def load(cls, index_path: str) -> "ProductSearchIndex":
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+    
+    def matching_tokens(self, term: str) -> List[int]:
+        """Return ids of vocabulary tokens containing term"""
+        if len(term) < self.ngram_size:
+            return [token_id for token_id, token in enumerate(self.vocabulary) if term in token]
+        
+        candidates = None
+        for gram in token_ngrams(term, self.ngram_size):
+            token_ids = self.ngrams.get(gram)
+            if not token_ids:
+                return []
+            candidates = set(token_ids) if candidates is None else candidates.intersection(token_ids)
+            if not candidates:
+                return []
+        
+        # Shared n-grams do not guarantee a contiguous match
+        return [token_id for token_id in candidates if term in self.vocabulary[token_id]]
+    
+    def search_ids(self, query: str) -> List[int]:
+        """Return the document ids (positions in all_products) matching query"""
+        terms = search_tokens(query)
+        if not terms:
+            return []
+        
+        # Identifier-like queries ("15.05", "4-001") match whole indexed identifiers first
+        whole_term = normalize_search_text(query.strip())
+        if len(terms) > 1 and whole_term and not any(char.isspace() for char in whole_term):
+            matches = set()
+            for token_id in self.matching_tokens(whole_term):
+                matches.update(self.postings[token_id])
+            if matches:
+                return sorted(matches)
+        
+        result = None
+        for term in terms:
+            matches = set()
+            for token_id in self.matching_tokens(term):
+                matches.update(self.postings[token_id])
+            result = matches if result is None else result & matches
+            if not result:
+                return []
+        return sorted(result)
+    
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Return article numbers matching query"""
+        document_ids = self.search_ids(query)
+        if limit is not None:
+            document_ids = document_ids[:limit]
+        return [self.documents[document_id] for document_id in document_ids]
+
+
+class PackedClientStore:
+    """Read-only access to a clients.pack file through mmap.
+
+    Usage:
+        with PackedClientStore("clients.pack") as store:
+            context = store.get_hot("10000")
+    """
+    
+    def __init__(self, pack_path: str):
+        self.pack_path = Path(pack_path)
+        self._file = open(self.pack_path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        
+        footer = self._map[-PACK_FOOTER_SIZE:]
+        if self._map[:len(PACK_MAGIC)] != PACK_MAGIC or footer[12:] != PACK_MAGIC:
+            self.close()
+            raise ValueError(f"Not a packed client store: {self.pack_path}")
+        
+        index_offset, index_length = struct.unpack(">QI", footer[:12])
+        self.index = json.loads(self._map[index_offset:index_offset + index_length].decode("utf-8"))
+        self.clients = self.index["clients"]
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def __contains__(self, client_number: str) -> bool:
+        return client_number in self.clients
+    
+    def __len__(self) -> int:
+        return len(self.clients)
+    
+    def close(self):
+        """Release the memory map and file handle"""
+        self._map.close()
+        self._file.close()
+    
+    def _read(self, offset: int, length: int) -> Dict[str, Any]:
+        return json.loads(self._map[offset:offset + length].decode("utf-8"))
+    
+    def get_hot(self, client_number: str) -> Optional[Dict[str, Any]]:
+        """Return profile, statistics and recent orders of a client"""
+        entry = self.clients.get(client_number)
+        return self._read(entry[0], entry[1]) if entry else None
+    
+    def get_client(self, client_number: str) -> Optional[Dict[str, Any]]:
+        """Return the complete client record, identical to data/{client_number}.json"""
+        entry = self.clients.get(client_number)
+        return self._read(entry[2], entry[3]) if entry else None
+    
+    def get_raw(self, client_number: str) -> Optional[Tuple[bytes, bytes]]:
+        """Return the undecoded (hot, full) payloads of a client"""
+        entry = self.clients.get(client_number)
+        if not entry:
+            return None
+        return self._map[entry[0]:entry[0] + entry[1]], self._map[entry[2]:entry[2] + entry[3]]
+
+
+# Converter instance used by each parse worker process
+_worker_converter = None
+
 
+def _init_parse_worker(base_path: str):
+    """Create the per-process converter used by _parse_file_chunk"""
+    global _worker_converter
+    _worker_converter = DataConverter(base_path)
 
-def main():
+
+def _parse_file_chunk(parser_name: str, file_paths: List[str]) -> List[Any]:
+    """Parse a chunk of XML files inside a worker process"""
+    parse = getattr(_worker_converter, parser_name)
+    return [parse(file_path) for file_path in file_paths]
+
+
+def run_profiled(converter: DataConverter, top: int = 40) -> Dict[str, Any]:
+    """Run convert_all under cProfile and tracemalloc and dump the results.
+
+    Writes conversion_profile.prof (load with pstats or snakeviz),
+    conversion_profile.txt (hottest functions by cumulative and own time)
+    and conversion_tracemalloc.txt (largest allocation sites) to the base path.
+    cProfile only sees the main thread, so run with --write-threads 1 to
+    include client file building and writing.
+    """
+    profile_path = converter.base_path / "conversion_profile.prof"
+    report_path = converter.base_path / "conversion_profile.txt"
+    tracemalloc_path = converter.base_path / "conversion_tracemalloc.txt"
+    
+    tracemalloc.start()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        summary = converter.convert_all()
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    
+    profiler.dump_stats(str(profile_path))
+    with open(report_path, 'w', encoding='utf-8') as f:
+        stats = pstats.Stats(profiler, stream=f)
+        stats.sort_stats("cumulative").print_stats(top)
+        stats.sort_stats("tottime").print_stats(top)
+    
+    with open(tracemalloc_path, 'w', encoding='utf-8') as f:
+        f.write(f"Traced memory: current {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB\n\n")
+        for stat in snapshot.statistics("lineno")[:top]:
+            f.write(f"{stat}\n")
+    
+    print(json.dumps({
+        "event": "profile",
+        "profile": str(profile_path),
+        "report": str(report_path),
+        "tracemalloc": str(tracemalloc_path),
+        "traced_peak_mb": round(peak / 1e6, 1)
+    }), flush=True)
+    return summary
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Convert BotanBot XML exports to JSON")
+    parser.add_argument("--base-path", default=".",
+                        help="Directory containing susko.ai/ and receiving the output files")
+    parser.add_argument("--full", action="store_true",
+                        help="Ignore the manifest and rebuild every client file")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes used to parse address and article files")
+    parser.add_argument("--pretty", action="store_true",
+                        help="Indent the JSON output instead of writing it compactly")
+    parser.add_argument("--write-threads", type=int, default=4,
+                        help="Number of threads writing client files")
+    parser.add_argument("--packed", action="store_true",
+                        help=f"Also write all clients into {PACKED_STORE_FILE} with an offset index")
+    parser.add_argument("--history-layout", choices=HISTORY_LAYOUTS, default="embedded",
+                        help="embedded: article_info in every order row (default); "
+                             "interned: one articles dict per client file; "
+                             "columnar: interned plus one array per order column. "
+                             "The Node API reads only embedded files; the other layouts are for offline consumers")
+    parser.add_argument("--legacy-products", action="store_true",
+                        help="Write products.json in the old shape that repeats products per category")
+    parser.add_argument("--measure-products-savings", action="store_true",
+                        help="Report size and parse time of products.json against the legacy shape in the summary")
+    parser.add_argument("--profile", action="store_true",
+                        help="Run under cProfile and tracemalloc and write conversion_profile.* reports")
+    parser.add_argument("--sqlite", action="store_true",
+                        help=f"Also write clients, products and order history to {SQLITE_DATABASE_FILE}")
+    parser.add_argument("--as-of", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                        help="Reference date of the trailing order windows (default: today)")
+    parser.add_argument("--resumable", action="store_true",
+                        help=f"Checkpoint loaded data and written files in {CHECKPOINT_DIR}/ so an interrupted "
+                             f"run resumes, and publish data/ as a symlink to a complete generation "
+                             f"in {GENERATIONS_DIR}/")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Stay resident after converting and apply changed source paths read from stdin")
+    parser.add_argument("--watch", type=float, metavar="SECONDS",
+                        help="With --daemon, also poll susko.ai/ for changes every SECONDS")
+    parser.add_argument("--socket", metavar="PATH",
+                        help="With --daemon, also accept changed paths on a Unix socket at PATH")
+    parser.add_argument("--history-partitions", type=int, default=0, metavar="N",
+                        help="Spill the order history to N client-partitioned temporary files and "
+                             "convert one partition at a time to bound memory (default: 0, in memory)")
+    parser.add_argument("--serializer", choices=SERIALIZERS, default=os.environ.get(SERIALIZER_ENV, "json"),
+                        help=f"Encoder of the client files and products (default: ${SERIALIZER_ENV} or "
+                             f"json). orjson writes the same JSON faster; msgpack writes .msgpack files, "
+                             f"which the Node API does not read, and removes the .json files they replace. "
+                             f"conversion_summary.json is always JSON")
+    args = parser.parse_args(argv)
+    if args.serializer not in SERIALIZERS:
+        parser.error(f"{SERIALIZER_ENV} must be one of {', '.join(SERIALIZERS)}")
+    if not serializer_available(args.serializer):
+        parser.error(f"--serializer {args.serializer} needs the {args.serializer} package")
+    if (args.watch is not None or args.socket) and not args.daemon:
+        parser.error("--watch and --socket require --daemon")
+    if args.daemon and args.profile:
+        parser.error("--profile cannot be combined with --daemon")
+    if args.measure_products_savings and args.legacy_products:
+        parser.error("--measure-products-savings compares against --legacy-products and cannot be combined with it")
+    if not 0 <= args.history_partitions <= MAX_HISTORY_PARTITIONS:
+        parser.error(f"--history-partitions must be between 0 and {MAX_HISTORY_PARTITIONS}")
+    if args.history_partitions:
+        # These need the whole history in memory at once
+        for option in ("daemon", "resumable", "packed", "sqlite"):
+            if getattr(args, option):
+                parser.error(f"--history-partitions cannot be combined with --{option}")
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
     """Main execution function"""
+    args = parse_args(argv)
     try:
         # Initialize converter
-        converter = DataConverter()
+        converter = DataConverter(
+            args.base_path,
+            incremental=not args.full,
+            workers=args.workers,
+            pretty=args.pretty,
+            write_threads=args.write_threads,
+            packed=args.packed,
+            sqlite=args.sqlite,
+            legacy_products=args.legacy_products,
+            measure_products=args.measure_products_savings,
+            history_layout=args.history_layout,
+            as_of=args.as_of,
+            resumable=args.resumable,
+            history_partitions=args.history_partitions,
+            serializer=args.serializer
+        )
         
         # Run conversion
-        summary = converter.convert_all()
+        if args.daemon:
+            ConversionDaemon(converter, watch_interval=args.watch, socket_path=args.socket).run()
+            return None
+        if args.profile:
+            summary = run_profiled(converter)
+        else:
+            summary = converter.convert_all()
         
         return summary
         
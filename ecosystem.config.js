@@ -18,7 +18,7 @@ module.exports = {
             // Production optimizations
             max_memory_restart: '1G',
             watch: false,
-            ignore_watch: ['node_modules', 'logs', 'data'],
+            ignore_watch: ['node_modules', 'logs', 'data', 'data.generations', '.conversion_checkpoint', '.history-spill-*'],
 
             // Auto-restart configuration
             autorestart: true,
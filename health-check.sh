@@ -89,7 +89,8 @@ fi
 
 # Check data directory
 if [ -d "data" ] && [ "$(ls -A data)" ]; then
-    file_count=$(find data -name "*.json" | wc -l)
+    # data/ is a symlink to the current generation after a --resumable run
+    file_count=$(find -L data -name "*.json" | wc -l)
     echo -e "${GREEN}✅ Data directory contains ${file_count} JSON files${NC}"
 else
     echo -e "${RED}❌ Data directory is empty or missing${NC}"
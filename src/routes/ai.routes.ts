@@ -8,7 +8,9 @@ import {
 import {
     ApiResponse,
     ClientContextForAI,
+    ClientData,
     Product,
+    ProductsData,
     NotFoundError
 } from '../types';
 import path from 'path';
@@ -102,16 +104,27 @@ router.get(
 
 /**
  * Helper functions optimized for AI consumption
+ *
+ * They read the ai_context section convert.py precomputes per client file
+ * (article frequencies, top articles, ranked recommendations) instead of
+ * scanning order_history and products.json on every request.
  */
-async function getClientContextForAI(clientNumber: string): Promise<ClientContextForAI | null> {
+async function readClientFile(clientNumber: string): Promise<ClientData | null> {
     const clientFile = path.join(process.cwd(), config.get('dataOutputPath'), `${clientNumber}.json`);
 
     if (!await fs.pathExists(clientFile)) {
         return null;
     }
 
+    return await fs.readJson(clientFile) as ClientData;
+}
+
+async function getClientContextForAI(clientNumber: string): Promise<ClientContextForAI | null> {
     try {
-        const client = await fs.readJson(clientFile);
+        const client = await readClientFile(clientNumber);
+        if (!client) {
+            return null;
+        }
 
         return {
             client: {
@@ -121,8 +134,10 @@ async function getClientContextForAI(clientNumber: string): Promise<ClientContex
                 priceGroup: client.client_profile.price_group,
                 isBlocked: client.client_profile.is_blocked
             },
-            recentOrders: (client.order_history || []).slice(0, 10),
-            orderStats: client.order_statistics
+            recentOrders: Array.isArray(client.order_history) ? client.order_history.slice(0, 10) : [],
+            orderStats: client.order_statistics,
+            topArticles: client.ai_context?.top_articles || [],
+            recommendations: client.ai_context?.recommendations || []
         };
     } catch (error) {
         logger.error(`Failed to get AI context for client ${clientNumber}`, error);
@@ -130,55 +145,81 @@ async function getClientContextForAI(clientNumber: string): Promise<ClientContex
     }
 }
 
-async function getProductRecommendations(options: {
-    clientNumber?: string;
-    category?: string;
-    limit: number;
-}): Promise<Product[]> {
+// products.json parsed once per version of the file, keyed by article number
+let productsCache: { mtimeMs: number; products: Product[]; byArticleNumber: Map<string, Product> } | null = null;
+
+async function getProductsIndex(): Promise<{ products: Product[]; byArticleNumber: Map<string, Product> } | null> {
     const productsPath = path.join(process.cwd(), config.get('productsOutputPath'));
 
     if (!await fs.pathExists(productsPath)) {
-        return [];
+        return null;
+    }
+
+    const { mtimeMs } = await fs.stat(productsPath);
+    if (!productsCache || productsCache.mtimeMs !== mtimeMs) {
+        const productsData = await fs.readJson(productsPath) as ProductsData;
+        const products = productsData.all_products || [];
+        productsCache = {
+            mtimeMs,
+            products,
+            byArticleNumber: new Map(products.map(product => [product.article_number, product]))
+        };
     }
 
+    return productsCache;
+}
+
+async function getProductRecommendations(options: {
+    clientNumber?: string;
+    category?: string;
+    limit: number;
+}): Promise<Product[]> {
     try {
-        const products = await fs.readJson(productsPath);
-        let recommendations = products.all_products || [];
-
-        // Filter by category if specified
-        if (options.category) {
-            recommendations = recommendations.filter((product: Product) =>
-                product.product_group?.description?.toLowerCase() === options.category!.toLowerCase()
-            );
+        const productsIndex = await getProductsIndex();
+        if (!productsIndex) {
+            return [];
         }
 
-        // If client specified, personalize recommendations
+        const category = options.category?.toLowerCase();
+        const matchesCategory = (product: Product): boolean =>
+            !category || product.product_group?.description?.toLowerCase() === category;
+
+        let ranked: Product[] = [];
+        let ordered = new Set<string>();
+
+        // If client specified, start from its precomputed recommendations
         if (options.clientNumber) {
-            const clientFile = path.join(process.cwd(), config.get('dataOutputPath'), `${options.clientNumber}.json`);
-
-            if (await fs.pathExists(clientFile)) {
-                try {
-                    const client = await fs.readJson(clientFile);
-
-                    if (client.order_history) {
-                        // Get recently ordered articles
-                        const recentArticles = client.order_history
-                            .slice(0, 20)
-                            .map((order: any) => order.article_number);
-
-                        // Filter out recently ordered items
-                        recommendations = recommendations.filter((product: Product) =>
-                            !recentArticles.includes(product.article_number)
-                        );
-                    }
-                } catch (error) {
-                    logger.warn(`Failed to personalize recommendations for client ${options.clientNumber}`, error);
+            try {
+                const client = await readClientFile(options.clientNumber);
+                if (client?.ai_context) {
+                    ranked = client.ai_context.recommendations
+                        .map(entry => productsIndex.byArticleNumber.get(entry.article_number))
+                        .filter((product): product is Product => product !== undefined);
+                    ordered = new Set(Object.keys(client.ai_context.article_frequency));
+                }
+            } catch (error) {
+                logger.warn(`Failed to personalize recommendations for client ${options.clientNumber}`, error);
+            }
+        }
+
+        // Fill up with products the client has never ordered
+        const recommendations: Product[] = [];
+        const seen = new Set<string>();
+        for (const source of [ranked, productsIndex.products]) {
+            for (const candidate of source) {
+                if (recommendations.length >= options.limit) {
+                    return recommendations;
+                }
+                if (seen.has(candidate.article_number) || ordered.has(candidate.article_number)
+                    || !matchesCategory(candidate)) {
+                    continue;
                 }
+                seen.add(candidate.article_number);
+                recommendations.push(candidate);
             }
         }
 
-        // Return top recommendations
-        return recommendations.slice(0, options.limit);
+        return recommendations;
     } catch (error) {
         logger.error('Failed to get product recommendations', error);
         return [];
@@ -198,11 +239,11 @@ async function getClientSummary(clientNumber: string): Promise<any | null> {
         isBlocked: context.client.isBlocked,
         totalOrders: context.orderStats?.total_orders || 0,
         lastOrderDate: context.orderStats?.last_order_date,
-        topProducts: context.recentOrders
+        topProducts: context.topArticles
             .slice(0, 5)
-            .map(order => ({
-                article: order.article_number,
-                description: order.article_info?.short_description || 'Unknown'
+            .map(article => ({
+                article: article.article_number,
+                description: article.short_description || 'Unknown'
             }))
     };
 }
@@ -11,6 +11,9 @@ import {
 import {
     ApiResponse,
     ProductsData,
+    ArticleClientsIndex,
+    ProductAggregatesIndex,
+    ProductSearchIndex,
     Product,
     NotFoundError,
     AppError
@@ -33,15 +36,9 @@ router.get(
             const products = await getProducts();
             let filteredProducts = products.all_products || [];
 
-            // Apply search filter
+            // Apply search filter through the precomputed search index
             if (q) {
-                const searchTerm = q.toLowerCase();
-                filteredProducts = filteredProducts.filter((product: Product) =>
-                    product.short_description?.toLowerCase().includes(searchTerm) ||
-                    product.long_description?.toLowerCase().includes(searchTerm) ||
-                    product.article_number?.toLowerCase().includes(searchTerm) ||
-                    product.product_group?.description?.toLowerCase().includes(searchTerm)
-                );
+                filteredProducts = await searchProducts(products, q);
             }
 
             // Apply category filter
@@ -96,15 +93,15 @@ router.get(
             const { category } = req.params;
 
             const products = await getProducts();
-            const categoryProducts = products.product_categories?.[category];
+            const categoryEntries = products.product_categories?.[category];
 
-            if (!categoryProducts) {
+            if (!categoryEntries) {
                 throw new NotFoundError(`Category '${category}' not found`);
             }
 
             const response: ApiResponse<Product[]> = {
                 success: true,
-                data: categoryProducts,
+                data: resolveProducts(products, categoryEntries),
                 timestamp: new Date().toISOString()
             };
 
@@ -162,9 +159,11 @@ router.get(
                 throw new NotFoundError(`Product with article number '${articleNumber}' not found`);
             }
 
+            const aggregates = await getProductAggregates();
+
             const response: ApiResponse<Product> = {
                 success: true,
-                data: product,
+                data: { ...product, order_aggregates: aggregates?.articles[articleNumber] ?? null },
                 timestamp: new Date().toISOString()
             };
 
@@ -192,15 +191,7 @@ router.get(
             const { limit } = req.query as any;
 
             const products = await getProducts();
-            const allProducts = products.all_products || [];
-
-            const searchTermLower = searchTerm.toLowerCase();
-            const filteredProducts = allProducts.filter((product: Product) =>
-                product.short_description?.toLowerCase().includes(searchTermLower) ||
-                product.long_description?.toLowerCase().includes(searchTermLower) ||
-                product.article_number?.toLowerCase().includes(searchTermLower) ||
-                product.barcode?.toLowerCase().includes(searchTermLower)
-            );
+            const filteredProducts = await searchProducts(products, searchTerm);
 
             const response: ApiResponse<Product[]> = {
                 success: true,
@@ -215,6 +206,61 @@ router.get(
     }
 );
 
+// Get the clients who ever ordered a product
+// Registered after /search/:searchTerm so that GET /search/clients stays a search
+router.get(
+    '/:articleNumber/clients',
+    validateRequest({
+        params: Joi.object({
+            articleNumber: Joi.string().required()
+        })
+    }),
+    async (req: Request, res: Response, next: NextFunction): Promise<void> => {
+        try {
+            const { articleNumber } = req.params;
+
+            const index = await getArticleClientsIndex();
+            const clientNumbers = index.articles[articleNumber];
+
+            if (!clientNumbers) {
+                throw new NotFoundError(`No orders found for article number '${articleNumber}'`);
+            }
+
+            const response: ApiResponse<{ article_number: string; client_count: number; clients: string[] }> = {
+                success: true,
+                data: {
+                    article_number: articleNumber,
+                    client_count: clientNumbers.length,
+                    clients: clientNumbers
+                },
+                timestamp: new Date().toISOString()
+            };
+
+            res.json(response);
+        } catch (error) {
+            next(error);
+        }
+    }
+);
+
+/**
+ * Resolve category entries to products; the deduplicated products.json
+ * lists article numbers, the legacy format embeds the products
+ */
+function resolveProducts(products: ProductsData, entries: Array<Product | string>): Product[] {
+    if (entries.every(entry => typeof entry !== 'string')) {
+        return entries as Product[];
+    }
+
+    const byArticleNumber = new Map<string, Product>(
+        (products.all_products || []).map((product: Product) => [product.article_number, product])
+    );
+
+    return entries
+        .map(entry => typeof entry === 'string' ? byArticleNumber.get(entry) : entry)
+        .filter((product): product is Product => product !== undefined);
+}
+
 /**
  * Helper function to load products data
  */
@@ -233,4 +279,175 @@ async function getProducts(): Promise<ProductsData> {
     }
 }
 
+/**
+ * Search normalization of convert.py (normalize_search_text, search_tokens,
+ * token_ngrams): lowercase, umlauts and sharp s folded, accents removed
+ */
+const GERMAN_FOLDING: Record<string, string> = { 'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss', 'ẞ': 'ss' };
+
+function normalizeSearchText(text: string): string {
+    return text
+        .toLowerCase()
+        .replace(/[äöüßẞ]/g, char => GERMAN_FOLDING[char])
+        .normalize('NFKD')
+        .replace(/\p{M}/gu, '');
+}
+
+function searchTokens(text: string): string[] {
+    return normalizeSearchText(text).match(/[a-z0-9]+/g) || [];
+}
+
+function tokenNgrams(token: string, size: number): string[] {
+    const grams = new Set<string>();
+    for (let i = 0; i + size <= token.length; i++) {
+        grams.add(token.slice(i, i + size));
+    }
+    return [...grams];
+}
+
+/**
+ * Ids of the vocabulary tokens containing term, resolved through the n-gram index
+ */
+function matchingTokens(index: ProductSearchIndex, term: string): number[] {
+    const size = index.metadata.ngram_size;
+    if (term.length < size) {
+        return index.vocabulary.flatMap((token, tokenId) => token.includes(term) ? [tokenId] : []);
+    }
+
+    let candidates: Set<number> | null = null;
+    for (const gram of tokenNgrams(term, size)) {
+        const tokenIds: number[] = index.ngrams[gram] || [];
+        const previous: Set<number> | null = candidates;
+        candidates = new Set(previous ? tokenIds.filter(tokenId => previous.has(tokenId)) : tokenIds);
+        if (candidates.size === 0) {
+            return [];
+        }
+    }
+
+    // Shared n-grams do not guarantee a contiguous match
+    return [...(candidates || [])].filter(tokenId => index.vocabulary[tokenId].includes(term));
+}
+
+function matchingDocuments(index: ProductSearchIndex, term: string): Set<number> {
+    const documents = new Set<number>();
+    for (const tokenId of matchingTokens(index, term)) {
+        for (const documentId of index.postings[tokenId]) {
+            documents.add(documentId);
+        }
+    }
+    return documents;
+}
+
+/**
+ * Port of ProductSearchIndex.search_ids in convert.py: every query token must
+ * occur in some token of the product; results keep the order of all_products
+ */
+function searchDocumentIds(index: ProductSearchIndex, query: string): number[] {
+    const terms = searchTokens(query);
+    if (terms.length === 0) {
+        return [];
+    }
+
+    // Identifier-like queries ("15.05", "4-001") match whole indexed identifiers first
+    const wholeTerm = normalizeSearchText(query.trim());
+    if (terms.length > 1 && wholeTerm && !/\s/.test(wholeTerm)) {
+        const matches = matchingDocuments(index, wholeTerm);
+        if (matches.size > 0) {
+            return [...matches].sort((a, b) => a - b);
+        }
+    }
+
+    let result: Set<number> | null = null;
+    for (const term of terms) {
+        const matches = matchingDocuments(index, term);
+        const previous: Set<number> | null = result;
+        result = previous ? new Set([...previous].filter(documentId => matches.has(documentId))) : matches;
+        if (result.size === 0) {
+            return [];
+        }
+    }
+
+    return [...(result || [])].sort((a, b) => a - b);
+}
+
+/**
+ * Products matching query, looked up in products.search.json instead of scanning all_products
+ */
+async function searchProducts(products: ProductsData, query: string): Promise<Product[]> {
+    const index = await getProductSearchIndex();
+    const allProducts = products.all_products || [];
+    const documentIds = searchDocumentIds(index, query);
+
+    // Both files are written by the same conversion; resolve by article number if they disagree
+    if (documentIds.every(documentId => allProducts[documentId]?.article_number === index.documents[documentId])) {
+        return documentIds.map(documentId => allProducts[documentId]);
+    }
+    return resolveProducts(products, documentIds.map(documentId => index.documents[documentId]));
+}
+
+// products.search.json parsed once per version of the file
+let searchIndexCache: { mtimeMs: number; index: ProductSearchIndex } | null = null;
+
+/**
+ * Helper function to load the search index written next to products.json
+ */
+async function getProductSearchIndex(): Promise<ProductSearchIndex> {
+    const productsPath = path.join(process.cwd(), config.get('productsOutputPath'));
+    const indexPath = path.join(path.dirname(productsPath), 'products.search.json');
+
+    if (!await fs.pathExists(indexPath)) {
+        throw new AppError('Product search index not found. Run data conversion first.', 404);
+    }
+
+    try {
+        const { mtimeMs } = await fs.stat(indexPath);
+        if (!searchIndexCache || searchIndexCache.mtimeMs !== mtimeMs) {
+            searchIndexCache = { mtimeMs, index: await fs.readJson(indexPath) as ProductSearchIndex };
+        }
+        return searchIndexCache.index;
+    } catch (error) {
+        logger.error('Failed to read product search index', error);
+        throw new AppError('Failed to load product search index', 500);
+    }
+}
+
+/**
+ * Helper function to load the per-article order rollups written next to products.json;
+ * null when the conversion predates the file
+ */
+async function getProductAggregates(): Promise<ProductAggregatesIndex | null> {
+    const productsPath = path.join(process.cwd(), config.get('productsOutputPath'));
+    const aggregatesPath = path.join(path.dirname(productsPath), 'product_aggregates.json');
+
+    if (!await fs.pathExists(aggregatesPath)) {
+        return null;
+    }
+
+    try {
+        return await fs.readJson(aggregatesPath) as ProductAggregatesIndex;
+    } catch (error) {
+        logger.error('Failed to read product aggregates', error);
+        throw new AppError('Failed to load product aggregates', 500);
+    }
+}
+
+/**
+ * Helper function to load the article -> clients index written next to products.json
+ */
+async function getArticleClientsIndex(): Promise<ArticleClientsIndex> {
+    const productsPath = path.join(process.cwd(), config.get('productsOutputPath'));
+    const indexPath = path.join(path.dirname(productsPath), 'article_clients.json');
+
+    if (!await fs.pathExists(indexPath)) {
+        throw new AppError('Article index not found. Run data conversion first.', 404);
+    }
+
+    try {
+        return await fs.readJson(indexPath) as ArticleClientsIndex;
+    } catch (error) {
+        logger.error('Failed to read article index', error);
+        throw new AppError('Failed to load article index', 500);
+    }
+}
+
 export default router;
\ No newline at end of file
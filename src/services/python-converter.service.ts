@@ -7,6 +7,7 @@ import {
     ConversionResult,
     ConversionStatus,
     ConversionSummary,
+    ConversionPhaseMetrics,
     AppError
 } from '../types';
 
@@ -18,11 +19,15 @@ export class PythonConverterService {
     private readonly pythonPath: string;
     private readonly scriptPath: string;
     private readonly workingDir: string;
+    private readonly args: string[];
 
     constructor(options: PythonConverterConfig = {}) {
         this.pythonPath = options.pythonPath || this.getDefaultPythonPath();
         this.scriptPath = options.scriptPath || path.join(process.cwd(), 'convert.py');
         this.workingDir = options.workingDir || process.cwd();
+        // Opt-in: a run cut short by the timeout resumes from its checkpoint next
+        // time, and data/ only switches to a new generation once it is complete
+        this.args = options.args || (config.get('converterResumable') ? ['--resumable'] : []);
     }
 
     /**
@@ -41,22 +46,30 @@ export class PythonConverterService {
      * Execute the Python conversion script
      */
     public async runConversion(): Promise<ConversionResult> {
+        const unreadableOption = this.findUnreadableOutputOption();
+        if (unreadableOption) {
+            throw new AppError(`convert.py ${unreadableOption} writes output the API routes cannot read`, 500);
+        }
+
         logger.info('Starting Python XML-to-JSON conversion...', {
             pythonPath: this.pythonPath,
             scriptPath: this.scriptPath,
-            workingDir: this.workingDir
+            workingDir: this.workingDir,
+            args: this.args
         });
 
         return new Promise((resolve, reject) => {
             const startTime = Date.now();
 
-            const pythonProcess: ChildProcess = spawn(this.pythonPath, [this.scriptPath], {
+            const pythonProcess: ChildProcess = spawn(this.pythonPath, [this.scriptPath, ...this.args], {
                 cwd: this.workingDir,
                 stdio: ['pipe', 'pipe', 'pipe']
             });
 
             let stdout = '';
             let stderr = '';
+            let pendingLine = '';
+            const phases: ConversionPhaseMetrics[] = [];
 
             // Handle stdout
             if (pythonProcess.stdout) {
@@ -64,6 +77,13 @@ export class PythonConverterService {
                     const output = data.toString();
                     stdout += output;
                     logger.debug('Python stdout', { output: output.trim() });
+
+                    // Surface the JSON metric lines; chunks may end mid-line
+                    const lines = (pendingLine + output).split('\n');
+                    pendingLine = lines.pop() || '';
+                    for (const line of lines) {
+                        this.handleMetricLine(line, phases);
+                    }
                 });
             }
 
@@ -79,6 +99,7 @@ export class PythonConverterService {
             // Handle process completion
             pythonProcess.on('close', async (code: number | null) => {
                 const duration = Date.now() - startTime;
+                this.handleMetricLine(pendingLine, phases);
 
                 if (code === 0) {
                     try {
@@ -95,6 +116,7 @@ export class PythonConverterService {
                             stdout,
                             stderr,
                             summary,
+                            phases,
                             timestamp: new Date().toISOString()
                         });
                     } catch (error) {
@@ -105,6 +127,7 @@ export class PythonConverterService {
                             stdout,
                             stderr,
                             summary: null,
+                            phases,
                             timestamp: new Date().toISOString()
                         });
                     }
@@ -138,6 +161,37 @@ export class PythonConverterService {
         });
     }
 
+    /**
+     * Value of a convert.py option in the configured args ("--name value" or "--name=value")
+     */
+    private getArgValue(name: string): string | undefined {
+        const index = this.args.indexOf(name);
+        if (index >= 0) {
+            return this.args[index + 1];
+        }
+        const inline = this.args.find(arg => arg.startsWith(`${name}=`));
+        return inline ? inline.slice(name.length + 1) : undefined;
+    }
+
+    /**
+     * The routes read data/*.json with embedded article_info, products.json and
+     * conversion_summary.json; return the option that would produce anything else
+     */
+    private findUnreadableOutputOption(): string | null {
+        // convert.py inherits the environment, including its serializer default
+        const serializer = this.getArgValue('--serializer') || process.env.BOTAN_SERIALIZER || 'json';
+        if (serializer === 'msgpack') {
+            return '--serializer msgpack';
+        }
+
+        const historyLayout = this.getArgValue('--history-layout') || 'embedded';
+        if (historyLayout !== 'embedded') {
+            return `--history-layout ${historyLayout}`;
+        }
+
+        return null;
+    }
+
     /**
      * Validate that Python and the script are available
      */
@@ -283,6 +337,29 @@ export class PythonConverterService {
         });
     }
 
+    private handleMetricLine(line: string, phases: ConversionPhaseMetrics[]): void {
+        const trimmed = line.trim();
+        if (!trimmed.startsWith('{')) {
+            return;
+        }
+
+        try {
+            const { event, ...metrics } = JSON.parse(trimmed);
+            if (event === 'phase') {
+                phases.push(metrics as ConversionPhaseMetrics);
+                if (metrics.failed) {
+                    logger.error('Conversion phase failed', metrics);
+                } else {
+                    logger.info('Conversion phase completed', metrics);
+                }
+            } else if (event === 'profile') {
+                logger.info('Conversion profile written', metrics);
+            }
+        } catch {
+            // Not a metrics line
+        }
+    }
+
     private async readConversionSummary(): Promise<ConversionSummary | null> {
         const summaryPath = path.join(this.workingDir, 'conversion_summary.json');
 
@@ -2,6 +2,8 @@
  * API and service related types
  */
 
+import { AIRecommendation, AITopArticle } from './data.types';
+
 // API Response types
 export interface ApiResponse<T = any> {
     success: boolean;
@@ -86,6 +88,8 @@ export interface PythonConverterConfig {
     pythonPath?: string;
     scriptPath?: string;
     workingDir?: string;
+    // Extra convert.py options, defaults to ['--resumable'] when CONVERTER_RESUMABLE=true
+    args?: string[];
 }
 
 export interface ConversionResult {
@@ -94,9 +98,25 @@ export interface ConversionResult {
     stdout: string;
     stderr: string;
     summary: any;
+    phases?: ConversionPhaseMetrics[];
     timestamp: string;
 }
 
+// Per-phase metrics printed by convert.py as JSON lines ({"event": "phase", ...})
+export interface ConversionPhaseMetrics {
+    phase: string;
+    wall_seconds: number;
+    cpu_seconds: number;
+    peak_rss_mb: number | null;
+    bytes_written: number;
+    items?: number;
+    unit?: string;
+    items_per_second?: number | null;
+    // Set when the phase raised; the run aborts after this line
+    failed?: boolean;
+    [key: string]: unknown;
+}
+
 export interface ConversionStatus {
     dataDirectory: {
         exists: boolean;
@@ -166,6 +186,8 @@ export interface ClientContextForAI {
     };
     recentOrders: any[];
     orderStats: any;
+    topArticles: AITopArticle[];
+    recommendations: AIRecommendation[];
 }
 
 // Environment configuration types
@@ -181,6 +203,9 @@ export interface AppConfig {
     dataOutputPath: string;
     productsOutputPath: string;
 
+    // Python converter: run convert.py with --resumable (checkpoints, data/ generation swaps)
+    converterResumable: boolean;
+
     // Sync Schedule
     syncSchedule: string;
 
@@ -2,6 +2,8 @@
  * Core data types based on the XML structure from convert.py
  */
 
+import { ConversionPhaseMetrics } from './api.types';
+
 // Client/Address related types
 export interface BillingAddress {
     salutation: string;
@@ -129,6 +131,8 @@ export interface Product {
     restaurant_categories: RestaurantCategories;
     images: string[];
     packaging: ProductPackaging;
+    // Not stored in products.json; GET /products/:articleNumber adds it from product_aggregates.json
+    order_aggregates?: OrderAggregates | null;
 }
 
 // Order history types
@@ -155,31 +159,151 @@ export interface OrderStatistics {
     last_order_date: string | null;
 }
 
+// Order rollups relative to conversion_summary.aggregates_as_of
+export interface OrderWindow {
+    orders: number;
+    quantity: number;
+}
+
+export interface OrderAggregates {
+    orders: number;
+    quantity: number;
+    first_order_date: string;
+    last_order_date: string;
+    order_days: number;
+    average_interval_days: number | null;
+    next_order_expected: string | null;
+    trailing: {
+        '30d': OrderWindow;
+        '90d': OrderWindow;
+        '365d': OrderWindow;
+    };
+    // ISO week ("2025-W41") / month ("2025-10") -> quantity, newest first, empty buckets omitted
+    weekly_quantity: Record<string, number>;
+    monthly_quantity: Record<string, number>;
+}
+
+// Per-client context precomputed by convert.py for the AI routes
+export interface AIArticleFrequency {
+    orders: number;
+    quantity: number;
+    last_ordered: string | null;
+}
+
+export interface AITopArticle {
+    article_number: string;
+    short_description: string;
+    product_group: string;
+    orders: number;
+    last_ordered: string | null;
+}
+
+export interface AIRecommendation {
+    article_number: string;
+    short_description: string;
+    product_group: string;
+    score: number;
+}
+
+export interface AIContext {
+    article_frequency: Record<string, AIArticleFrequency>;
+    top_articles: AITopArticle[];
+    recommendations: AIRecommendation[];
+}
+
+// Shape of order_history, see convert.py --history-layout.
+// The API routes read only "embedded" files, where every row has article_info.
+export type HistoryLayout = 'embedded' | 'interned' | 'columnar';
+
+// Columnar order_history: one array per order column, rows share an index
+export interface ColumnarOrderHistory {
+    article_number: string[];
+    date: Array<string | null>;
+    booking_quantity: Array<number | null>;
+    quantity: Array<number | null>;
+    unit: string[];
+}
+
 // Complete client data structure
 export interface ClientData {
     metadata: {
         generated_at: string;
         client_number: string;
         data_source: string;
+        history_layout?: HistoryLayout;
     };
     client_profile: ClientProfile;
     order_statistics: OrderStatistics;
+    order_aggregates?: OrderAggregates | null;
+    ai_context?: AIContext;
+    // Interned layout: product information once per article, rows without article_info
+    articles?: Record<string, ArticleInfo>;
     order_history: OrderItem[];
 }
 
+// Client file written with --history-layout columnar
+export interface ColumnarClientData extends Omit<ClientData, 'order_history'> {
+    articles: Record<string, ArticleInfo>;
+    order_history: ColumnarOrderHistory;
+}
+
 // Products file structure
+// The deduplicated format lists article numbers in the categories,
+// the legacy format (convert.py --legacy-products) repeats full products
 export interface ProductsData {
     metadata: {
         generated_at: string;
         total_products: number;
         categories_count: number;
         data_source: string;
+        format?: 'deduplicated' | 'legacy';
     };
-    product_categories: Record<string, Product[]>;
-    uncategorized_products: Product[];
+    product_categories: Record<string, Array<Product | string>>;
+    uncategorized_products: Array<Product | string>;
     all_products: Product[];
 }
 
+// Reverse index written next to products.json as article_clients.json:
+// article number -> client numbers that ever ordered it
+export interface ArticleClientsIndex {
+    metadata: {
+        generated_at: string;
+        total_articles: number;
+        total_clients: number;
+        data_source: string;
+    };
+    articles: Record<string, string[]>;
+}
+
+// Per-article order rollups written next to products.json as product_aggregates.json
+export interface ProductAggregatesIndex {
+    metadata: {
+        generated_at: string;
+        total_articles: number;
+        aggregates_as_of: string;
+        data_source: string;
+    };
+    articles: Record<string, OrderAggregates>;
+}
+
+// Inverted index written next to products.json as products.search.json.
+// Document ids are positions in all_products; ngrams map to vocabulary ids.
+export interface ProductSearchIndex {
+    metadata: {
+        generated_at: string;
+        version: number;
+        fields: string[];
+        normalization: string;
+        ngram_size: number;
+        documents: number;
+        tokens: number;
+    };
+    documents: string[];
+    vocabulary: string[];
+    postings: number[][];
+    ngrams: Record<string, number[]>;
+}
+
 // Conversion summary structure
 export interface ConversionSummary {
     conversion_summary: {
@@ -190,7 +314,25 @@ export interface ConversionSummary {
         files_created: {
             client_files: number;
             products_file: number;
+            article_index_file?: number;
+            product_aggregates_file?: number;
+        };
+        // Sizes of products.json and product_aggregates.json; the legacy_* and
+        // *_saved comparison only with convert.py --measure-products-savings
+        products_file?: {
+            format: 'deduplicated' | 'legacy';
+            bytes?: number;
+            aggregates_file?: string;
+            aggregates_bytes?: number;
+            legacy_bytes?: number;
+            bytes_saved?: number;
+            load_seconds?: number;
+            legacy_load_seconds?: number;
+            load_seconds_saved?: number;
         };
+        aggregates_as_of?: string;
+        total_seconds?: number;
+        phases?: ConversionPhaseMetrics[];
     };
     data_quality_notes: string[];
 }
\ No newline at end of file
@@ -46,6 +46,8 @@ class ConfigManager {
             dataOutputPath: process.env.DATA_OUTPUT_PATH || './data',
             productsOutputPath: process.env.PRODUCTS_OUTPUT_PATH || './products.json',
 
+            converterResumable: process.env.CONVERTER_RESUMABLE === 'true',
+
             syncSchedule: process.env.SYNC_SCHEDULE || '0 2 * * *',
 
             apiPrefix: process.env.API_PREFIX || '/api/v1',
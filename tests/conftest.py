@@ -0,0 +1,19 @@
+"""Fixtures shared by the converter tests: small synthetic susko.ai trees"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / "benchmarks"))
+
+from synthetic import generate_tree  # noqa: E402
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """A 30 client, 200 article, 600 row export below tmp_path/susko.ai"""
+    generate_tree(tmp_path, clients=30, articles=200, history_rows=600, deviations=1)
+    return tmp_path
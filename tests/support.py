@@ -0,0 +1,69 @@
+"""Helpers for converting and editing the synthetic trees of the tests"""
+
+import os
+import re
+from datetime import date
+from pathlib import Path
+
+from convert import DataConverter
+
+AS_OF = date(2025, 6, 16)
+
+
+def convert(tree, **options):
+    """Run a complete conversion of tree and return the converter"""
+    options.setdefault("as_of", AS_OF)
+    options.setdefault("write_threads", 2)
+    converter = DataConverter(str(tree), **options)
+    converter.convert_all()
+    return converter
+
+
+def client_file_ids(tree):
+    """Map every client file name to its inode; atomic rewrites change it"""
+    data_path = Path(tree) / "data"
+    return {name: os.stat(data_path / name).st_ino for name in os.listdir(data_path)
+            if not name.startswith(".")}
+
+
+def rewritten(before, after):
+    """Client numbers whose file was written between two client_file_ids calls"""
+    return set(name.rsplit(".", 1)[0] for name, inode in after.items() if before.get(name) != inode)
+
+
+def set_field(file_path, tag, value):
+    """Replace the CDATA value of the first <tag> in a source XML file"""
+    file_path = Path(file_path)
+    content = file_path.read_text(encoding="utf-8")
+    content, count = re.subn(rf"(<{tag} [^>]*><!\[CDATA\[)[^\]]*(\]\]>)", rf"\g<1>{value}\g<2>", content, count=1)
+    assert count == 1, f"<{tag}> not found in {file_path}"
+    file_path.write_text(content, encoding="utf-8")
+
+
+def address_file(tree, client_number):
+    return Path(tree) / "susko.ai" / "Adressen" / f"Adresse-{client_number}.XML"
+
+
+def article_file(tree, article_number):
+    return Path(tree) / "susko.ai" / "Artikel" / f"Artikel-{article_number}.xml"
+
+
+def history_file(tree):
+    return Path(tree) / "susko.ai" / "History" / "AdresseHistory-Komplett.xml"
+
+
+def append_history_row(tree, client_number, article_number, day="10.06.2025", quantity="3"):
+    """Add one <History> row to the export"""
+    file_path = history_file(tree)
+    row = (
+        "<History>\n"
+        f'    <AdrNr info="Adressnummer" type="WideString"><![CDATA[{client_number}]]></AdrNr>\n'
+        f'    <ArtNr info="Artikelnummer" type="WideString"><![CDATA[{article_number}]]></ArtNr>\n'
+        f'    <Dat info="Datum" type="Date"><![CDATA[{day}]]></Dat>\n'
+        f'    <BuchMge info="Buchungsmenge" type="Float"><![CDATA[{quantity},0]]></BuchMge>\n'
+        f'    <Mge info="Menge" type="Float"><![CDATA[{quantity}]]></Mge>\n'
+        '    <Einh info="Einheit" type="WideString"><![CDATA[KI]]></Einh>\n'
+        "</History>\n"
+    )
+    content = file_path.read_text(encoding="utf-8")
+    file_path.write_text(content.replace("</HistoryListe>", row + "</HistoryListe>"), encoding="utf-8")
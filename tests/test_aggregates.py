@@ -0,0 +1,53 @@
+"""Order aggregates: the NumPy and pure Python paths serialize identically"""
+
+import json
+from array import array
+from datetime import date
+
+import pytest
+
+import convert
+from convert import aggregate_orders
+
+AS_OF = date(2025, 6, 16)
+
+
+def order_columns(rows):
+    """keys, days, months and quantities columns for (key, date, quantity) rows"""
+    keys, days, months, quantities = array('i'), array('i'), array('i'), array('d')
+    for key, day, quantity in rows:
+        keys.append(key)
+        days.append(day.toordinal())
+        months.append(day.year * 12 + day.month - 1)
+        quantities.append(quantity)
+    return keys, days, months, quantities
+
+
+def aggregate_both_ways(monkeypatch, key_count, rows):
+    """json.dumps of aggregate_orders with NumPy and with the Python fallback"""
+    keys, days, months, quantities = order_columns(rows)
+    with_numpy = aggregate_orders(keys, key_count, days, months, quantities, AS_OF)
+    monkeypatch.setattr(convert, "np", None)
+    without_numpy = aggregate_orders(keys, key_count, days, months, quantities, AS_OF)
+    return json.dumps(with_numpy, sort_keys=True), json.dumps(without_numpy, sort_keys=True)
+
+
+@pytest.mark.skipif(convert.np is None, reason="NumPy is not installed")
+def test_empty_windows_serialize_like_the_python_path(monkeypatch):
+    # Nothing in the last 30 days and nothing within the weekly or monthly buckets
+    rows = [(0, date(2021, 3, 1), 2.0), (1, date(2021, 4, 2), 1.5), (1, date(2021, 4, 9), 4.0)]
+
+    with_numpy, without_numpy = aggregate_both_ways(monkeypatch, 3, rows)
+
+    assert with_numpy == without_numpy
+    assert '"quantity": 0.0' in with_numpy
+
+
+@pytest.mark.skipif(convert.np is None, reason="NumPy is not installed")
+def test_recent_orders_serialize_like_the_python_path(monkeypatch):
+    rows = [(0, date(2025, 6, 10), 3.0), (0, date(2025, 5, 2), 1.25), (2, date(2024, 12, 24), 7.0),
+            (2, date(2025, 6, 20), 1.0)]
+
+    with_numpy, without_numpy = aggregate_both_ways(monkeypatch, 3, rows)
+
+    assert with_numpy == without_numpy
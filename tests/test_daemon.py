@@ -0,0 +1,51 @@
+"""Daemon deltas: apply_source_changes leaves a manifest a normal run agrees with"""
+
+from support import (address_file, append_history_row, article_file, client_file_ids, convert,
+                     history_file, rewritten, set_field)
+
+
+def assert_normal_run_finds_no_changes(tree):
+    before = client_file_ids(tree)
+
+    converter = convert(tree)
+
+    assert converter.files_written == 0
+    assert rewritten(before, client_file_ids(tree)) == set()
+
+
+def test_address_change_delta(tree):
+    daemon = convert(tree)
+    before = client_file_ids(tree)
+
+    set_field(address_file(tree, "10003"), "Na2", "Neuer Name")
+    metrics = daemon.apply_source_changes([str(address_file(tree, "10003"))])
+
+    assert metrics["clients_written"] == 1
+    assert rewritten(before, client_file_ids(tree)) == {"10003"}
+    assert_normal_run_finds_no_changes(tree)
+
+
+def test_article_group_change_delta(tree):
+    daemon = convert(tree)
+    article_number = max(daemon.article_clients, key=lambda number: len(daemon.article_clients[number]))
+    before = client_file_ids(tree)
+
+    set_field(article_file(tree, article_number), "WgrNr", "999")
+    daemon.apply_source_changes([str(article_file(tree, article_number))])
+
+    assert set(daemon.article_clients[article_number]) <= rewritten(before, client_file_ids(tree))
+    assert daemon.client_fingerprints == convert(tree, incremental=False).client_fingerprints
+    assert_normal_run_finds_no_changes(tree)
+
+
+def test_history_change_delta(tree):
+    daemon = convert(tree)
+    before = client_file_ids(tree)
+
+    append_history_row(tree, "10029", "1000")
+    metrics = daemon.apply_source_changes([str(history_file(tree))])
+
+    assert metrics["history_reloaded"]
+    assert "10029" in rewritten(before, client_file_ids(tree))
+    assert daemon.client_fingerprints == convert(tree, incremental=False).client_fingerprints
+    assert_normal_run_finds_no_changes(tree)
@@ -0,0 +1,58 @@
+"""The same sources give the same output in every process, whatever PYTHONHASHSEED is"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from synthetic import generate_tree
+
+from support import AS_OF
+
+CONVERT_SCRIPT = Path(__file__).resolve().parent.parent / "convert.py"
+
+
+def convert_with_seed(tree, seed, *options):
+    """Run convert.py in a fresh interpreter with the given hash seed"""
+    env = dict(os.environ, PYTHONHASHSEED=str(seed))
+    subprocess.run([sys.executable, str(CONVERT_SCRIPT), "--base-path", str(tree),
+                    "--as-of", AS_OF.isoformat(), *options],
+                   env=env, check=True, stdout=subprocess.DEVNULL)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Short histories: many clients in one or two groups, so group scores tie"""
+    generate_tree(tmp_path, clients=60, articles=200, history_rows=150, deviations=1)
+    return tmp_path
+
+
+def snapshot(tree):
+    """Client files without their timestamps, and the manifest's fingerprints"""
+    files = {}
+    for path in (tree / "data").iterdir():
+        if not path.name.startswith("."):
+            files[path.name] = json.loads(path.read_bytes())
+            del files[path.name]["metadata"]["generated_at"]
+    with open(tree / "conversion_manifest.json", 'r', encoding='utf-8') as f:
+        return files, json.load(f)["clients"]
+
+
+def test_output_and_manifest_do_not_depend_on_the_hash_seed(tree):
+    convert_with_seed(tree, 1, "--full")
+    first = snapshot(tree)
+
+    convert_with_seed(tree, 2, "--full")
+
+    assert snapshot(tree) == first
+
+
+def test_unchanged_rerun_under_another_hash_seed_rewrites_nothing(tree):
+    convert_with_seed(tree, 1)
+    inodes = {path.name: path.stat().st_ino for path in (tree / "data").iterdir()}
+
+    convert_with_seed(tree, 3)
+
+    assert {path.name: path.stat().st_ino for path in (tree / "data").iterdir()} == inodes
@@ -0,0 +1,47 @@
+"""Partitioned order history: same client files as the in-memory path"""
+
+import errno
+import json
+from pathlib import Path
+
+import pytest
+
+import convert as convert_module
+from support import convert
+
+
+def client_files(tree):
+    """Parsed client files by name, without their generation timestamp"""
+    files = {}
+    for path in (tree / "data").iterdir():
+        if not path.name.startswith("."):
+            files[path.name] = json.loads(path.read_bytes())
+            del files[path.name]["metadata"]["generated_at"]
+    return files
+
+
+def test_partitioned_run_writes_the_same_client_files(tree):
+    convert(tree, incremental=False)
+    in_memory = client_files(tree)
+
+    convert(tree, incremental=False, history_partitions=4)
+
+    assert client_files(tree) == in_memory
+
+
+def test_failed_spill_write_aborts_the_conversion(tree, monkeypatch):
+    dump = convert_module.pickle.dump
+    failures = [OSError(errno.EIO, "Input/output error")]
+
+    def failing_dump(obj, file, *args, **kwargs):
+        # A single failed spill write; the spill files are still writable afterwards
+        if failures and Path(str(file.name)).name.startswith(("clients-", "articles-")):
+            raise failures.pop()
+        dump(obj, file, *args, **kwargs)
+
+    monkeypatch.setattr(convert_module, "SPILL_BATCH_ROWS", 10)
+    monkeypatch.setattr(convert_module.pickle, "dump", failing_dump)
+
+    with pytest.raises(OSError):
+        convert(tree, history_partitions=4)
+    assert not (tree / "data").exists() or client_files(tree) == {}
@@ -0,0 +1,139 @@
+"""Incremental conversion: fingerprints, manifest and which client files get rewritten"""
+
+import json
+
+from convert import DataConverter
+from support import (address_file, append_history_row, article_file, client_file_ids, convert,
+                     rewritten, set_field)
+
+
+def full_fingerprints(tree):
+    """Fingerprints of a conversion that ignores the manifest"""
+    return convert(tree, incremental=False).client_fingerprints
+
+
+def test_unchanged_tree_rewrites_nothing(tree):
+    convert(tree)
+    before = client_file_ids(tree)
+
+    converter = convert(tree)
+
+    assert converter.files_written == 0
+    assert converter.files_skipped == len(converter.clients)
+    assert rewritten(before, client_file_ids(tree)) == set()
+
+
+def test_address_change_rewrites_only_that_client(tree):
+    convert(tree)
+    before = client_file_ids(tree)
+
+    set_field(address_file(tree, "10003"), "Na2", "Neuer Name")
+    convert(tree)
+
+    assert rewritten(before, client_file_ids(tree)) == {"10003"}
+    with open(tree / "data" / "10003.json", 'r', encoding='utf-8') as f:
+        assert "Neuer Name" in f.read()
+
+
+def test_article_change_rewrites_exactly_its_buyers(tree):
+    first = convert(tree)
+    article_number = min(first.article_clients, key=lambda number: len(first.article_clients[number]))
+    expected = set(first.article_clients[article_number])
+    expected.update(
+        client_number for client_number, recommendations in first.client_recommendations.items()
+        if any(entry["article_number"] == article_number for entry in recommendations)
+    )
+    assert expected < set(first.clients)
+    before = client_file_ids(tree)
+
+    set_field(article_file(tree, article_number), "KuBez1", "Geänderte Bezeichnung")
+    converter = convert(tree)
+
+    assert rewritten(before, client_file_ids(tree)) == expected & set(converter.clients)
+    assert converter.fingerprints_reused == len(converter.clients)
+
+
+def test_reused_fingerprint_components_match_full_hashes(tree):
+    first = convert(tree)
+    article_number = next(iter(first.article_clients))
+    set_field(article_file(tree, article_number), "KuBez1", "Geänderte Bezeichnung")
+
+    incremental = convert(tree)
+
+    assert incremental.fingerprints_reused > 0
+    assert incremental.client_fingerprints == full_fingerprints(tree)
+
+
+def test_manifest_records_the_fingerprints_of_the_files_on_disk(tree):
+    convert(tree)
+    set_field(article_file(tree, "1004"), "KuBez1", "Geänderte Bezeichnung")
+    converter = convert(tree)
+
+    with open(tree / "conversion_manifest.json", 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    assert manifest["clients"] == converter.client_fingerprints
+    assert manifest["article_sources"]["Artikel/Artikel-1004.xml"] == "1004"
+    assert "Artikel/Artikel-1004.xml" in manifest["sources"]
+
+
+def test_history_change_rehashes_every_client(tree):
+    convert(tree)
+    before = client_file_ids(tree)
+
+    append_history_row(tree, "10029", "1000")
+    converter = convert(tree)
+
+    assert "10029" in rewritten(before, client_file_ids(tree))
+    assert converter.fingerprints_reused == 0
+    assert converter.client_fingerprints == full_fingerprints(tree)
+
+
+def test_missing_client_file_is_rewritten(tree):
+    convert(tree)
+    (tree / "data" / "10007.json").unlink()
+    before = client_file_ids(tree)
+
+    convert(tree)
+
+    assert rewritten(before, client_file_ids(tree)) == {"10007"}
+
+
+
+def count_parses(monkeypatch):
+    """Record every path handed to the address and article parsers"""
+    parsed = []
+    for parser_name in ("parse_client_file", "parse_product_file"):
+        parse = getattr(DataConverter, parser_name)
+        monkeypatch.setattr(DataConverter, parser_name,
+                            lambda self, path, parse=parse: parsed.append(path) or parse(self, path))
+    return parsed
+
+
+def test_unchanged_sources_are_not_parsed_again(tree, monkeypatch):
+    convert(tree)
+    parsed = count_parses(monkeypatch)
+    monkeypatch.setattr(DataConverter, "load_order_history",
+                        lambda self, sort=True: parsed.append("Auftragshistorie"))
+
+    converter = convert(tree)
+
+    assert parsed == []
+    assert converter.parse_cache_hits == {"clients": len(converter.clients),
+                                          "products": len(converter.products)}
+    assert converter.files_written == 0
+    monkeypatch.undo()
+    assert converter.client_fingerprints == full_fingerprints(tree)
+
+
+def test_changed_sources_are_parsed_again(tree, monkeypatch):
+    convert(tree)
+    set_field(address_file(tree, "10003"), "Na2", "Neuer Name")
+    append_history_row(tree, "10029", "1000")
+    parsed = count_parses(monkeypatch)
+
+    converter = convert(tree)
+
+    assert parsed == [str(address_file(tree, "10003"))]
+    assert converter.parse_cache_hits["clients"] == len(converter.clients) - 1
+    monkeypatch.undo()
+    assert converter.client_fingerprints == full_fingerprints(tree)
@@ -0,0 +1,58 @@
+"""clients.pack: records come from the write phase or the previous pack, not a rebuild"""
+
+import json
+
+from convert import PACKED_STORE_FILE, DataConverter, PackedClientStore
+from support import address_file, convert, set_field
+
+
+def packed_counts(converter):
+    return next(metrics for metrics in converter.phase_metrics if metrics["phase"] == "write_packed_store")
+
+
+def assert_pack_matches_client_files(tree):
+    with PackedClientStore(str(tree / PACKED_STORE_FILE)) as store:
+        assert len(store) == 30
+        for client_number in store.clients:
+            with open(tree / "data" / f"{client_number}.json", 'r', encoding='utf-8') as f:
+                assert store.get_client(client_number) == json.load(f)
+            hot = store.get_hot(client_number)
+            assert hot["client_profile"] == store.get_client(client_number)["client_profile"]
+
+
+def test_full_run_packs_the_records_of_the_write_phase(tree, monkeypatch):
+    built = []
+    build_client_file_data = DataConverter.build_client_file_data
+    monkeypatch.setattr(DataConverter, "build_client_file_data",
+                        lambda self, number: built.append(number) or build_client_file_data(self, number))
+
+    converter = convert(tree, packed=True)
+
+    assert len(built) == 30
+    assert packed_counts(converter)["spooled"] == 30
+    assert packed_counts(converter)["built"] == 0
+    assert_pack_matches_client_files(tree)
+
+
+def test_incremental_run_carries_unchanged_records_over(tree):
+    convert(tree, packed=True)
+    set_field(address_file(tree, "10003"), "Na2", "Neuer Name")
+
+    converter = convert(tree, packed=True)
+
+    counts = packed_counts(converter)
+    assert (counts["spooled"], counts["carried"], counts["built"]) == (1, 29, 0)
+    assert_pack_matches_client_files(tree)
+
+
+def test_changed_output_options_rebuild_carried_records(tree):
+    convert(tree, packed=True)
+
+    converter = convert(tree, packed=True, pretty=True)
+
+    counts = packed_counts(converter)
+    assert counts["carried"] == 0
+    assert counts["spooled"] == 30
+    with PackedClientStore(str(tree / PACKED_STORE_FILE)) as store:
+        with open(tree / "data" / "10000.json", 'r', encoding='utf-8') as f:
+            assert store.get_client("10000") == json.load(f)
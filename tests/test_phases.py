@@ -0,0 +1,37 @@
+"""Phase metrics: recorded and printed for every phase, including one that raises"""
+
+import json
+
+import pytest
+
+from convert import DataConverter
+from support import convert
+
+
+def phase_lines(output):
+    return [json.loads(line) for line in output.splitlines() if line.startswith('{"event": "phase"')]
+
+
+def test_every_phase_prints_its_metrics(tree, capsys):
+    converter = convert(tree)
+
+    printed = phase_lines(capsys.readouterr().out)
+    assert [line["phase"] for line in printed] == [metrics["phase"] for metrics in converter.phase_metrics]
+    assert not any("failed" in metrics for metrics in converter.phase_metrics)
+
+
+def test_failed_phase_is_recorded_before_the_error_propagates(tree, capsys, monkeypatch):
+    def load_products(self):
+        raise OSError("export unreadable")
+
+    monkeypatch.setattr(DataConverter, "load_products", load_products)
+    converter = DataConverter(str(tree))
+
+    with pytest.raises(OSError):
+        converter.convert_all()
+
+    assert converter.phase_metrics[-1]["phase"] == "load_products"
+    assert converter.phase_metrics[-1]["failed"] is True
+    printed = phase_lines(capsys.readouterr().out)
+    assert printed[-1]["phase"] == "load_products" and printed[-1]["failed"] is True
+    assert printed[-1]["wall_seconds"] >= 0
@@ -0,0 +1,45 @@
+"""products.json stays a catalogue; order rollups go to product_aggregates.json"""
+
+import json
+
+from convert import PRODUCT_AGGREGATES_FILE
+from support import append_history_row, article_file, convert, history_file, set_field
+
+
+def load(tree, name):
+    with open(tree / name, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_aggregates_are_written_apart_from_products(tree):
+    converter = convert(tree, measure_products=True)
+
+    products = load(tree, "products.json")
+    aggregates = load(tree, PRODUCT_AGGREGATES_FILE)
+    assert not any("order_aggregates" in product for product in products["all_products"])
+    assert aggregates["articles"] == converter.article_aggregates
+    assert aggregates["metadata"]["aggregates_as_of"] == "2025-06-16"
+
+    products_file = load(tree, "conversion_summary.json")["conversion_summary"]["products_file"]
+    assert products_file["bytes"] == (tree / "products.json").stat().st_size
+    assert products_file["aggregates_bytes"] == (tree / PRODUCT_AGGREGATES_FILE).stat().st_size
+    assert products_file["legacy_bytes"] > products_file["bytes"]
+
+
+def test_daemon_rewrites_only_the_file_a_change_affects(tree):
+    daemon = convert(tree)
+    products_inode = (tree / "products.json").stat().st_ino
+    aggregates_inode = (tree / PRODUCT_AGGREGATES_FILE).stat().st_ino
+
+    set_field(article_file(tree, "1004"), "KuBez1", "Geänderte Bezeichnung")
+    daemon.apply_source_changes([str(article_file(tree, "1004"))])
+
+    assert (tree / "products.json").stat().st_ino != products_inode
+    assert (tree / PRODUCT_AGGREGATES_FILE).stat().st_ino == aggregates_inode
+
+    products_inode = (tree / "products.json").stat().st_ino
+    append_history_row(tree, "10029", "1004")
+    daemon.apply_source_changes([str(history_file(tree))])
+
+    assert (tree / "products.json").stat().st_ino == products_inode
+    assert load(tree, PRODUCT_AGGREGATES_FILE)["articles"] == daemon.article_aggregates
@@ -0,0 +1,89 @@
+"""Resumable conversion: checkpoints of interrupted runs and generation swaps of data/"""
+
+import json
+import os
+
+import pytest
+
+import convert as convert_module
+from convert import CHECKPOINT_DIR, GENERATIONS_DIR, DataConverter
+from support import address_file, convert, set_field
+
+
+class Interrupted(BaseException):
+    """Stands in for a SIGTERM/KeyboardInterrupt that cuts a run short"""
+
+
+def client_files(data_path):
+    """Parsed client files by name, without their generation timestamp"""
+    files = {}
+    for path in data_path.iterdir():
+        if not path.name.startswith("."):
+            files[path.name] = json.loads(path.read_bytes())
+            del files[path.name]["metadata"]["generated_at"]
+    return files
+
+
+def generations(tree):
+    return set(os.listdir(tree / GENERATIONS_DIR))
+
+
+def test_interrupted_run_resumes_from_its_checkpoint(tree, monkeypatch):
+    record_written_clients = DataConverter.record_written_clients
+    batches = []
+
+    def interrupt_after_two_batches(self, client_numbers):
+        record_written_clients(self, client_numbers)
+        batches.append(client_numbers)
+        if len(batches) == 2:
+            raise Interrupted()
+
+    monkeypatch.setattr(convert_module, "CHECKPOINT_BATCH", 10)
+    monkeypatch.setattr(DataConverter, "record_written_clients", interrupt_after_two_batches)
+    with pytest.raises(Interrupted):
+        convert(tree, resumable=True, write_threads=1)
+    monkeypatch.undo()
+
+    assert not (tree / "data").is_symlink()
+    assert (tree / CHECKPOINT_DIR / "written_clients.txt").read_text().count("\n") == 20
+
+    built = []
+    build_client_file_data = DataConverter.build_client_file_data
+    monkeypatch.setattr(DataConverter, "build_client_file_data",
+                        lambda self, number: built.append(number) or build_client_file_data(self, number))
+    resumed = convert(tree, resumable=True)
+
+    assert resumed.resumed_stages == ["clients", "products", "order_history"]
+    assert len(resumed.resumed_clients) == 20
+    assert len(built) == 10
+    assert not (tree / CHECKPOINT_DIR).exists()
+    assert (tree / "data").is_symlink()
+
+    monkeypatch.undo()
+    resumed_files = client_files(tree / "data")
+    convert(tree, incremental=False)
+    assert resumed_files == client_files(tree / "data")
+
+
+def test_generation_swap_keeps_the_current_and_the_replaced_generation(tree):
+    convert(tree)
+    plain_inode = os.stat(tree / "data" / "10000.json").st_ino
+
+    first = convert(tree, resumable=True)
+    first_generation = first.published_generation()
+
+    assert (tree / "data").is_symlink()
+    assert generations(tree) == {first_generation, f"{first_generation}-previous"}
+    assert os.stat(tree / "data" / "10000.json").st_ino == plain_inode
+
+    set_field(address_file(tree, "10003"), "Na2", "Neuer Name")
+    second = convert(tree, resumable=True)
+    second_generation = second.published_generation()
+
+    assert second_generation != first_generation
+    assert generations(tree) == {first_generation, second_generation}
+    replaced = tree / GENERATIONS_DIR / first_generation
+    assert "Neuer Name" not in (replaced / "10003.json").read_text(encoding="utf-8")
+    assert "Neuer Name" in (tree / "data" / "10003.json").read_text(encoding="utf-8")
+    # Unchanged files are shared between the generations, not rewritten
+    assert os.stat(tree / "data" / "10000.json").st_ino == os.stat(replaced / "10000.json").st_ino
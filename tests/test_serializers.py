@@ -0,0 +1,31 @@
+"""Serializers: the summary stays JSON and stale outputs of another format are removed"""
+
+import json
+
+import pytest
+
+from convert import serializer_available
+from support import convert
+
+
+@pytest.mark.skipif(not serializer_available("orjson"), reason="orjson is not installed")
+def test_summary_is_json_whatever_the_serializer(tree):
+    convert(tree, serializer="orjson")
+
+    with open(tree / "conversion_summary.json", 'r', encoding='utf-8') as f:
+        summary = json.load(f)
+    assert summary["conversion_summary"]["output"]["serializer"] == "orjson"
+    assert [path.name for path in tree.glob("conversion_summary.*")] == ["conversion_summary.json"]
+
+
+def test_files_of_a_previous_serializer_are_removed(tree):
+    convert(tree)
+    (tree / "data").joinpath("10000.msgpack").write_bytes(b"\x80")
+    (tree / "products.msgpack").write_bytes(b"\x80")
+
+    convert(tree)
+
+    assert not (tree / "data" / "10000.msgpack").exists()
+    assert not (tree / "products.msgpack").exists()
+    assert (tree / "data" / "10000.json").exists()
+    assert (tree / "products.json").exists()